@@ -0,0 +1,164 @@
+"""
+Compares DispatchReader against hand-written struct.unpack_from decoding of the same buffer,
+dispatching on the message type with an if/elif chain.
+
+    python -m benchmarks.bench_dispatch
+"""
+
+from random import Random
+from struct import Struct
+from timeit import repeat
+
+from bytechomp import DispatchReader, ByteOrder, dataclass, Annotated, serialize
+from bytechomp.datatypes import U8, U32, F64
+
+MESSAGE_COUNT = 20_000
+MESSAGE_TYPES = 24
+
+
+@dataclass
+class Header:
+    kind: U8
+    sequence: U32
+
+
+@dataclass
+class Trade:
+    price: F64
+    quantity: U32
+
+
+@dataclass
+class Quote:
+    bid: F64
+    ask: F64
+    venue: Annotated[bytes, 4]
+
+
+# dozens of message types sharing two body layouts
+BODIES: dict[int, type] = {kind: Trade if kind % 2 else Quote for kind in range(MESSAGE_TYPES)}
+
+
+def build_stream() -> bytes:
+    rng = Random(0)
+    chunks = []
+    for sequence in range(MESSAGE_COUNT):
+        kind = rng.randrange(MESSAGE_TYPES)
+        body = Trade(1.5, sequence) if kind % 2 else Quote(1.0, 2.0, b"XNAS")
+        chunks.append(serialize(Header(kind, sequence), ByteOrder.LITTLE))
+        chunks.append(serialize(body, ByteOrder.LITTLE))
+    return b"".join(chunks)
+
+
+def run_dispatch_reader(data: bytes) -> int:
+    reader = DispatchReader(Header, "kind", BODIES, ByteOrder.LITTLE)
+    reader << data
+    return len(reader.build_many())
+
+
+# precompiled structs of the hand-written decoder
+HEADER = Struct("<BI")
+TRADE = Struct("<dI")
+QUOTE = Struct("<dd4s")
+
+
+def run_if_elif(data: bytes) -> int:
+    # hand-written decoding of the same buffer, dispatching on the header with an if/elif chain
+    count = 0
+    offset = 0
+    while offset < len(data):
+        kind, sequence = HEADER.unpack_from(data, offset)
+        Header(kind, sequence)
+        offset += HEADER.size
+        if kind == 0:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 1:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 2:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 3:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 4:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 5:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 6:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 7:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 8:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 9:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 10:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 11:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 12:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 13:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 14:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 15:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 16:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 17:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 18:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 19:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 20:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 21:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        elif kind == 22:
+            Quote(*QUOTE.unpack_from(data, offset))
+            offset += QUOTE.size
+        elif kind == 23:
+            Trade(*TRADE.unpack_from(data, offset))
+            offset += TRADE.size
+        else:
+            raise LookupError(f"unknown message type: {kind}")
+        count += 1
+    return count
+
+
+def main() -> None:
+    data = build_stream()
+    assert run_dispatch_reader(data) == run_if_elif(data) == MESSAGE_COUNT
+
+    for name, function in (
+        ("DispatchReader", run_dispatch_reader),
+        ("if/elif", run_if_elif),
+    ):
+        best = min(repeat(lambda: function(data), number=1, repeat=5))
+        print(f"{name:>16}: {MESSAGE_COUNT / best:>12,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.1
+
+Exits with status 1 when a benchmark is slower than the baseline by more than the threshold, or
+when its peak allocation grew by more than the threshold (and MEMORY_SLACK bytes).
+"""
+
+from __future__ import annotations
+from typing import Any
+import argparse
+import json
+import sys
+
+from benchmarks.harness import RESULTS_VERSION, format_rate
+
+# peak allocation differences below this many bytes are allocator noise
+MEMORY_SLACK = 16 * 1024
+
+
+def load(path: str) -> dict[str, Any]:
+    """Loads a results file written by benchmarks.run."""
+
+    with open(path, encoding="utf-8") as file:
+        results: dict[str, Any] = json.load(file)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"unsupported results version in {path}: {results.get('version')}")
+    return results
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> tuple[list[str], list[str]]:
+    """Compares the median time per message and the peak allocation of the benchmarks present in
+        both results.
+
+    Args:
+        baseline (dict[str, Any]): Baseline results document.
+        current (dict[str, Any]): Current results document.
+        threshold (float): Relative slowdown tolerated before flagging a regression.
+
+    Returns:
+        tuple[list[str], list[str]]: (report lines, names of the regressed benchmarks)
+    """
+
+    lines: list[str] = []
+    regressions: list[str] = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            lines.append(f"{name:<32}{'(new)':>17}{format_rate(result['ops_per_sec'])}")
+            continue
+
+        change = result["median"] / reference["median"] - 1.0
+        growth = result["peak_bytes"] - reference["peak_bytes"]
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+        elif change < -threshold:
+            flag = "  faster"
+        if growth > max(MEMORY_SLACK, threshold * reference["peak_bytes"]):
+            flag += f"  MEMORY +{growth:,} B"
+        if "REGRESSION" in flag or "MEMORY" in flag:
+            regressions.append(name)
+        lines.append(
+            f"{name:<32}{format_rate(reference['ops_per_sec'])}{format_rate(result['ops_per_sec'])}"
+            f"  {change:>+7.1%} time{flag}"
+        )
+
+    for name in sorted(baseline["benchmarks"].keys() - current["benchmarks"].keys()):
+        lines.append(f"{name:<32}(missing from the current results)")
+
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0].strip())
+    parser.add_argument("baseline", help="baseline results file")
+    parser.add_argument("current", help="current results file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="tolerated relative slowdown (default 0.1)"
+    )
+    args = parser.parse_args(argv)
+
+    lines, regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    print(f"{'benchmark':<32}{'baseline':>17}{'current':>17}")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        print("\n".join(f"  {name}" for name in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
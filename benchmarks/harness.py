@@ -0,0 +1,170 @@
+"""
+Dependency-free benchmark harness: a registry of benchmarks, timing in the style of timeit and
+pyperf (calibrated loops, repeated samples), peak allocations through tracemalloc, and a JSON
+results format shared by benchmarks.run and benchmarks.compare.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable
+from dataclasses import dataclass, field
+from statistics import mean, median, stdev
+from time import perf_counter
+import gc
+import platform
+import sys
+import tracemalloc
+
+import bytechomp
+
+RESULTS_VERSION = 1
+
+Setup = Callable[[], Callable[[], Any]]
+
+
+@dataclass(slots=True)
+class Benchmark:
+    """A named benchmark. setup() prepares the inputs outside of the timing and returns the
+    timed function, which processes ops messages per call."""
+
+    name: str
+    setup: Setup
+    ops: int
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Timing samples (seconds per message) and peak allocation of a benchmark."""
+
+    name: str
+    ops: int
+    loops: int
+    samples: list[float] = field(default_factory=list)
+    peak_bytes: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the JSON representation of the result."""
+
+        return {
+            "ops": self.ops,
+            "loops": self.loops,
+            "samples": self.samples,
+            "min": min(self.samples),
+            "median": median(self.samples),
+            "mean": mean(self.samples),
+            "stdev": stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            "ops_per_sec": 1.0 / median(self.samples),
+            "peak_bytes": self.peak_bytes,
+            "peak_bytes_per_op": self.peak_bytes / self.ops,
+        }
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, ops: int = 1) -> Callable[[Setup], Setup]:
+    """Registers a benchmark setup function under name."""
+
+    def register(setup: Setup) -> Setup:
+        if name in REGISTRY:
+            raise ValueError(f"duplicate benchmark name: {name}")
+        REGISTRY[name] = Benchmark(name, setup, ops)
+        return setup
+
+    return register
+
+
+def _time(function: Callable[[], Any], loops: int) -> float:
+    """Returns the duration of loops calls of function, with the garbage collector disabled."""
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = perf_counter()
+        for _ in range(loops):
+            function()
+        return perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure(bench: Benchmark, min_time: float = 0.1, repeat: int = 5) -> BenchmarkResult:
+    """Runs a benchmark: calibrates the loop count so one sample lasts at least min_time, takes
+    repeat samples, then measures the peak allocation of a single call.
+
+    Args:
+        bench (Benchmark): Benchmark to run.
+        min_time (float): Minimum duration of a sample in seconds.
+        repeat (int): Number of samples.
+
+    Returns:
+        BenchmarkResult: Samples in seconds per message.
+    """
+
+    function = bench.setup()
+    function()  # warm up (schema compilation, caches)
+
+    loops = 1
+    while (duration := _time(function, loops)) < min_time and loops < 1 << 20:
+        loops *= 2 if duration <= 0 else max(2, min(10, int(min_time / duration) + 1))
+
+    result = BenchmarkResult(bench.name, bench.ops, loops)
+    for _ in range(repeat):
+        result.samples.append(_time(function, loops) / loops / bench.ops)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        result.peak_bytes = max(peak - baseline, 0)
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+def run(
+    benchmarks: list[Benchmark],
+    min_time: float = 0.1,
+    repeat: int = 5,
+    report: Callable[[BenchmarkResult], None] | None = None,
+) -> dict[str, Any]:
+    """Runs the benchmarks and returns the JSON results document.
+
+    Args:
+        benchmarks (list[Benchmark]): Benchmarks to run, in order.
+        min_time (float): Minimum duration of a sample in seconds.
+        repeat (int): Number of samples per benchmark.
+        report (Callable[[BenchmarkResult], None] | None): Called after every benchmark.
+
+    Returns:
+        dict[str, Any]: Results document.
+    """
+
+    results: dict[str, Any] = {}
+    for bench in benchmarks:
+        result = measure(bench, min_time, repeat)
+        results[bench.name] = result.to_dict()
+        if report is not None:
+            report(result)
+
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "bytechomp": bytechomp.__version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "benchmarks": results,
+    }
+
+
+def format_rate(ops_per_sec: float) -> str:
+    """Formats a throughput in messages per second."""
+
+    return f"{ops_per_sec:>14,.0f} /s"
@@ -0,0 +1,54 @@
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run --filter build/ --quick
+"""
+
+from __future__ import annotations
+import argparse
+import json
+
+from benchmarks import suite  # noqa: F401  pylint: disable=unused-import
+from benchmarks.harness import REGISTRY, BenchmarkResult, format_rate, run
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0].strip())
+    parser.add_argument("-o", "--output", help="path of the JSON results file")
+    parser.add_argument(
+        "-f", "--filter", action="append", default=[], help="run benchmarks containing this text"
+    )
+    parser.add_argument("--quick", action="store_true", help="short samples for a smoke run")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        bench
+        for name, bench in REGISTRY.items()
+        if not args.filter or any(text in name for text in args.filter)
+    ]
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return
+
+    def report(result: BenchmarkResult) -> None:
+        summary = result.to_dict()
+        print(
+            f"{result.name:<32}{format_rate(summary['ops_per_sec'])}"
+            f"  ±{summary['stdev'] / summary['median']:>6.1%}"
+            f"  {summary['peak_bytes_per_op']:>12,.0f} B/op peak"
+        )
+
+    min_time, repeat = (0.01, 3) if args.quick else (0.1, 5)
+    results = run(benchmarks, min_time=min_time, repeat=repeat, report=report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
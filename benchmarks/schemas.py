@@ -0,0 +1,101 @@
+"""
+Schemas exercised by the benchmark suite, with a representative instance of each (dataclasses
+are declared without postponed annotations, as bytechomp resolves field types at runtime).
+"""
+
+from dataclasses import make_dataclass
+
+from bytechomp import dataclass, Annotated
+from bytechomp.datatypes import U8, U16, U32, U64, I32, F32, F64
+
+LARGE_LIST_LENGTH = 4096
+BLOB_LENGTH = 1024
+SCALING_LENGTHS = (1024, 4096, 16384, 65536)
+WIDE_FIELDS = 512
+
+
+@dataclass
+class Flat:
+    timestamp: F64
+    sequence: U64
+    identity: U32
+    flags: U16
+    kind: U8
+    value: F32
+    delta: I32
+
+
+@dataclass
+class Level5:
+    value: F64
+    count: U32
+
+
+@dataclass
+class Level4:
+    inner: Level5
+    tag: U16
+
+
+@dataclass
+class Level3:
+    inner: Level4
+    others: Annotated[list[Level5], 2]
+
+
+@dataclass
+class Level2:
+    inner: Level3
+    tag: U8
+
+
+@dataclass
+class Nested:
+    inner: Level2
+    siblings: Annotated[list[Level3], 4]
+    checksum: U32
+
+
+@dataclass
+class LargeList:
+    length: U32
+    samples: Annotated[list[F32], LARGE_LIST_LENGTH]
+
+
+@dataclass
+class BytesHeavy:
+    identity: U32
+    name: Annotated[bytes, 64]
+    payload: Annotated[bytes, BLOB_LENGTH]
+    trailer: Annotated[bytes, BLOB_LENGTH]
+
+
+@dataclass
+class Telemetry:
+    timestamp: F64
+    sensor: U16
+    status: U8
+    readings: Annotated[list[F32], 8]
+
+
+# a telemetry record of many scalar fields
+Wide = make_dataclass("Wide", [(f"channel_{i}", U32) for i in range(WIDE_FIELDS)])
+
+
+def _level3(seed: int) -> Level3:
+    return Level3(Level4(Level5(seed * 0.5, seed), seed % 100), [Level5(1.0, 1), Level5(2.0, 2)])
+
+
+SAMPLES: dict[str, object] = {
+    "flat": Flat(1.5, 2, 3, 4, 5, 6.5, -7),
+    "nested": Nested(Level2(_level3(1), 7), [_level3(seed) for seed in range(4)], 99),
+    "large_list": LargeList(LARGE_LIST_LENGTH, [float(i) for i in range(LARGE_LIST_LENGTH)]),
+    "bytes_heavy": BytesHeavy(1, b"n" * 64, b"p" * BLOB_LENGTH, b"t" * BLOB_LENGTH),
+    "wide": Wide(*range(WIDE_FIELDS)),
+}
+
+
+def list_schema(length: int) -> type:
+    """Creates a dataclass with a single list field of length 32-bit floats."""
+
+    return make_dataclass(f"List{length}", [("samples", Annotated[list[F32], length])])
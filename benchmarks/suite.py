@@ -0,0 +1,292 @@
+"""
+The benchmark suite: decoding and serialization throughput per schema, buffer feed patterns,
+allocate() cost and the dispatch reader. Importing this module registers every benchmark.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable
+from collections import deque
+import atexit
+import os
+import tempfile
+
+from bytechomp import (
+    Reader,
+    Schema,
+    ByteOrder,
+    Representation,
+    ListRepresentation,
+    serialize,
+    serialize_many,
+    schema_cache_clear,
+)
+from bytechomp.parallel import decode_file, decode_file_columns
+
+from benchmarks.harness import benchmark
+from benchmarks.schemas import SAMPLES, SCALING_LENGTHS, Flat, Telemetry, list_schema
+from benchmarks import bench_dispatch
+
+# messages processed per timed call, the interpreted decoder is much slower on large lists
+COUNTS: dict[str, int] = {
+    "flat": 1000,
+    "nested": 200,
+    "large_list": 20,
+    "bytes_heavy": 200,
+    "wide": 50,
+}
+
+STREAM_MESSAGES = 10_000
+# Reader.iter() must drain every chunk: the peak allocation stays around one chunk
+BOUNDED_MESSAGES = 100_000
+BOUNDED_CHUNK = 4 * 1024
+FILE_RECORDS = 200_000
+MEMORY_RECORDS = 10_000
+
+# decoded message representations compared by the memory benchmarks
+REPRESENTATIONS: dict[str, tuple[Representation, ListRepresentation]] = {
+    "dataclass_list": (Representation.DATACLASS, ListRepresentation.LIST),
+    "slots_tuple": (Representation.SLOTS, ListRepresentation.TUPLE),
+    "slots_array": (Representation.SLOTS, ListRepresentation.ARRAY),
+    "namedtuple_tuple": (Representation.NAMEDTUPLE, ListRepresentation.TUPLE),
+    "tuple_tuple": (Representation.TUPLE, ListRepresentation.TUPLE),
+}
+PARALLEL_WORKERS = 4
+SMALL_CHUNK = 7
+LARGE_CHUNK = 64 * 1024
+
+
+def _stream(name: str) -> bytes:
+    return serialize(SAMPLES[name], ByteOrder.LITTLE) * COUNTS[name]
+
+
+def _register_schema(name: str) -> None:
+    """Registers the decoding and serialization benchmarks of one schema."""
+
+    datatype = type(SAMPLES[name])
+    count = COUNTS[name]
+
+    def reader_setup(compiled: bool, strict: bool = False) -> Callable[[], Any]:
+        data = _stream(name)
+        reader = Reader[datatype](  # type: ignore
+            ByteOrder.LITTLE, compiled=compiled, strict=strict
+        ).allocate()
+
+        def build() -> None:
+            reader.feed(data)
+            for _ in range(count):
+                reader.build()
+
+        return build
+
+    @benchmark(f"build/{name}", ops=count)
+    def build_compiled() -> Callable[[], Any]:
+        return reader_setup(True)
+
+    @benchmark(f"build_interpreted/{name}", ops=count)
+    def build_interpreted() -> Callable[[], Any]:
+        return reader_setup(False)
+
+    @benchmark(f"build_strict/{name}", ops=count)
+    def build_strict() -> Callable[[], Any]:
+        return reader_setup(True, strict=True)
+
+    @benchmark(f"build_interpreted_strict/{name}", ops=count)
+    def build_interpreted_strict() -> Callable[[], Any]:
+        return reader_setup(False, strict=True)
+
+    @benchmark(f"build_many/{name}", ops=count)
+    def build_many() -> Callable[[], Any]:
+        data = _stream(name)
+        reader = Reader[datatype](ByteOrder.LITTLE).allocate()  # type: ignore
+
+        def run() -> None:
+            reader.feed(data)
+            reader.build_many()
+
+        return run
+
+    @benchmark(f"serialize/{name}", ops=count)
+    def serialize_each() -> Callable[[], Any]:
+        objects = [SAMPLES[name]] * count
+        return lambda: [serialize(obj, ByteOrder.LITTLE) for obj in objects]
+
+    @benchmark(f"serialize_many/{name}", ops=count)
+    def serialize_all() -> Callable[[], Any]:
+        objects = [SAMPLES[name]] * count
+        return lambda: serialize_many(objects, ByteOrder.LITTLE)
+
+    @benchmark(f"allocate_cold/{name}")
+    def allocate_cold() -> Callable[[], Any]:
+        def run() -> None:
+            schema_cache_clear(datatype)
+            Reader[datatype](ByteOrder.LITTLE).allocate()  # type: ignore
+
+        return run
+
+
+for _name in SAMPLES:
+    _register_schema(_name)
+
+
+@benchmark("allocate_warm/flat")
+def allocate_warm() -> Callable[[], Any]:
+    return lambda: Reader[Flat](ByteOrder.LITTLE).allocate()
+
+
+@benchmark("allocate_shared/flat")
+def allocate_shared() -> Callable[[], Any]:
+    schema = Schema[Flat](ByteOrder.LITTLE).allocate()
+    return lambda: Reader.of(schema)
+
+
+def _feed_setup(chunk_size: int, messages: int = STREAM_MESSAGES) -> Callable[[], Any]:
+    data = serialize(SAMPLES["flat"], ByteOrder.LITTLE) * messages
+    chunks = [data[start : start + chunk_size] for start in range(0, len(data), chunk_size)]
+    reader = Reader[Flat](ByteOrder.LITTLE).allocate()
+    return lambda: sum(1 for _ in reader.iter(chunks))
+
+
+@benchmark("feed/small_chunks", ops=STREAM_MESSAGES)
+def feed_small_chunks() -> Callable[[], Any]:
+    return _feed_setup(SMALL_CHUNK)
+
+
+@benchmark("feed/large_chunks", ops=STREAM_MESSAGES)
+def feed_large_chunks() -> Callable[[], Any]:
+    return _feed_setup(LARGE_CHUNK)
+
+
+@benchmark("feed/bounded_4k_chunks", ops=BOUNDED_MESSAGES)
+def feed_bounded() -> Callable[[], Any]:
+    """A long stream in 4 KiB chunks of many messages: a peak allocation growing with the stream
+    (flagged by benchmarks.compare) means iter() no longer drains the buffer."""
+
+    return _feed_setup(BOUNDED_CHUNK, BOUNDED_MESSAGES)
+
+
+def _register_scaling(length: int) -> None:
+    """Registers decoding benchmarks of a single list field, timed per list element: the time
+    per element stays flat as the list grows when decoding scales linearly."""
+
+    datatype = list_schema(length)
+    data = serialize(datatype([0.5] * length), ByteOrder.LITTLE)
+
+    def setup(compiled: bool) -> Callable[[], Any]:
+        reader = Reader[datatype](ByteOrder.LITTLE, compiled=compiled).allocate()  # type: ignore
+
+        def build() -> None:
+            reader.feed(data)
+            reader.build()
+
+        return build
+
+    benchmark(f"scaling/compiled_list_{length}", ops=length)(lambda: setup(True))
+    benchmark(f"scaling/interpreted_list_{length}", ops=length)(lambda: setup(False))
+
+
+for _length in SCALING_LENGTHS:
+    _register_scaling(_length)
+
+
+def _records_file() -> str:
+    """Writes a temporary file of flat records, removed when the interpreter exits."""
+
+    descriptor, path = tempfile.mkstemp(suffix=".bin")
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(serialize(SAMPLES["flat"], ByteOrder.LITTLE) * FILE_RECORDS)
+    atexit.register(os.remove, path)
+    return path
+
+
+def _decode_file_setup(workers: int) -> Callable[[], Any]:
+    path = _records_file()
+    return lambda: deque(
+        decode_file(
+            path, Flat, workers=workers, byte_order=ByteOrder.LITTLE, min_parallel_bytes=0
+        ),
+        maxlen=0,
+    )
+
+
+@benchmark("parallel/decode_file_1_worker", ops=FILE_RECORDS)
+def decode_file_in_process() -> Callable[[], Any]:
+    return _decode_file_setup(1)
+
+
+@benchmark(f"parallel/decode_file_{PARALLEL_WORKERS}_workers", ops=FILE_RECORDS)
+def decode_file_workers() -> Callable[[], Any]:
+    return _decode_file_setup(PARALLEL_WORKERS)
+
+
+def _decode_columns_setup(workers: int) -> Callable[[], Any]:
+    path = _records_file()
+    return lambda: deque(
+        decode_file_columns(
+            path, Flat, workers=workers, byte_order=ByteOrder.LITTLE, min_parallel_bytes=0
+        ),
+        maxlen=0,
+    )
+
+
+@benchmark("parallel/decode_columns_1_worker", ops=FILE_RECORDS)
+def decode_columns_in_process() -> Callable[[], Any]:
+    return _decode_columns_setup(1)
+
+
+@benchmark(f"parallel/decode_columns_{PARALLEL_WORKERS}_workers", ops=FILE_RECORDS)
+def decode_columns_workers() -> Callable[[], Any]:
+    return _decode_columns_setup(PARALLEL_WORKERS)
+
+
+def _serialize_file_setup(workers: int) -> Callable[[], Any]:
+    path = _records_file()
+    objects = [SAMPLES["flat"]] * FILE_RECORDS
+    return lambda: serialize_many(
+        objects, ByteOrder.LITTLE, workers=workers, out=path, min_parallel_bytes=0
+    )
+
+
+@benchmark("parallel/serialize_file_1_worker", ops=FILE_RECORDS)
+def serialize_file_in_process() -> Callable[[], Any]:
+    return _serialize_file_setup(1)
+
+
+@benchmark(f"parallel/serialize_file_{PARALLEL_WORKERS}_workers", ops=FILE_RECORDS)
+def serialize_file_workers() -> Callable[[], Any]:
+    return _serialize_file_setup(PARALLEL_WORKERS)
+
+
+def _register_memory(name: str, representation: Representation, lists: ListRepresentation) -> None:
+    """Registers decoding of a batch of messages kept alive until the end of the call, so the
+    peak allocation per operation is the memory taken by one decoded message (plus its bytes in
+    the reader buffer)."""
+
+    @benchmark(f"memory/{name}", ops=MEMORY_RECORDS)
+    def build_many() -> Callable[[], Any]:
+        sample = Telemetry(1.5, 2, 3, [float(i) for i in range(8)])
+        data = serialize(sample, ByteOrder.LITTLE) * MEMORY_RECORDS
+        reader = Reader[Telemetry](
+            ByteOrder.LITTLE, representation=representation, lists=lists
+        ).allocate()
+
+        def run() -> None:
+            reader.feed(data)
+            reader.build_many()
+
+        return run
+
+
+for _name, (_representation, _lists) in REPRESENTATIONS.items():
+    _register_memory(_name, _representation, _lists)
+
+
+@benchmark("dispatch/dispatch_reader", ops=bench_dispatch.MESSAGE_COUNT)
+def dispatch_reader() -> Callable[[], Any]:
+    data = bench_dispatch.build_stream()
+    return lambda: bench_dispatch.run_dispatch_reader(data)
+
+
+@benchmark("dispatch/if_elif", ops=bench_dispatch.MESSAGE_COUNT)
+def dispatch_if_elif() -> Callable[[], Any]:
+    data = bench_dispatch.build_stream()
+    return lambda: bench_dispatch.run_if_elif(data)
@@ -8,7 +8,22 @@ from typing import Annotated
 
 # module exports
 from bytechomp.reader import Reader
+from bytechomp.async_reader import AsyncReader
+from bytechomp.dispatch_reader import DispatchReader
+from bytechomp.mapped_array import MappedArray
+from bytechomp.lazy_view import LazyView
 from bytechomp.byte_order import ByteOrder
-from bytechomp.serialization import serialize
+from bytechomp.representation import Representation, ListRepresentation
+from bytechomp.checksum import ChecksumError
+from bytechomp.framing import Framing, LengthPrefixed, SyncWord, Delimiter
+from bytechomp.serialization import (
+    serialize,
+    serialize_into,
+    serialize_many,
+    serialize_many_into,
+    serialize_chunks,
+    Serializer,
+)
+from bytechomp.schema import Schema, schema_cache_info, schema_cache_clear
 
 __version__ = "0.2.0"
@@ -0,0 +1,193 @@
+"""
+bytechomp.async_reader
+"""
+
+from __future__ import annotations
+from typing import Generic, TypeVar, AsyncIterable, AsyncIterator
+from dataclasses import is_dataclass
+import asyncio
+import inspect
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.framing import Framing
+from bytechomp.reader import Reader
+from bytechomp.representation import Representation, ListRepresentation
+from bytechomp.schema import Schema
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+DEFAULT_READ_SIZE = 64 * 1024
+
+
+class AsyncReader(Generic[T]):  # pylint: disable=too-many-instance-attributes
+    """A binary protocol reader for asyncio streams. Decoding is delegated to a Reader[T], so the
+        compiled decoder is shared with synchronous readers of the same type.
+
+    Args:
+        Generic (T): The dataclass type that defines the binary protocol.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        compiled (bool): Use a generated decoder specialized for T.
+        framing (Framing | None): Framing strategy of the byte stream (e.g. LengthPrefixed(U32)).
+        skip_invalid (bool): Skip messages whose checksum fields do not match.
+        strict (bool): Check the type of every decoded value (a debugging aid, see Reader).
+        representation (Representation): Type of the decoded messages.
+        lists (ListRepresentation): Type of the decoded list fields.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        byte_order: ByteOrder = ByteOrder.NATIVE,
+        compiled: bool = True,
+        *,
+        framing: Framing | None = None,
+        skip_invalid: bool = False,
+        strict: bool = False,
+        representation: Representation = Representation.DATACLASS,
+        lists: ListRepresentation = ListRepresentation.LIST,
+    ) -> None:
+        self.__byte_order = byte_order
+        self.__compiled = compiled
+        self.__framing = framing
+        self.__skip_invalid = skip_invalid
+        self.__strict = strict
+        self.__representation = representation
+        self.__lists = lists
+        self.__reader: Reader[T] | None = None
+
+    def allocate(self) -> AsyncReader[T]:
+        """Allocates the reader with a tokenized description of the protocol defined by the type T.
+
+        Returns:
+            AsyncReader: The allocated binary protocol reader.
+        """
+        # pylint: disable=no-member
+
+        datatype = self.__orig_class__.__args__[0]  # type: ignore
+
+        if not inspect.isclass(datatype) or not is_dataclass(datatype):
+            raise ValueError("generic datatype must be a dataclass")
+
+        return self.__attach(
+            Reader[datatype](  # type: ignore[valid-type]
+                self.__byte_order,
+                self.__compiled,
+                framing=self.__framing,
+                skip_invalid=self.__skip_invalid,
+                strict=self.__strict,
+                representation=self.__representation,
+                lists=self.__lists,
+            ).allocate()
+        )
+
+    @classmethod
+    def of(  # pylint: disable=too-many-arguments
+        cls,
+        schema: Schema[T],
+        compiled: bool = True,
+        *,
+        framing: Framing | None = None,
+        skip_invalid: bool = False,
+        strict: bool = False,
+        representation: Representation = Representation.DATACLASS,
+        lists: ListRepresentation = ListRepresentation.LIST,
+    ) -> AsyncReader[T]:
+        """Creates an allocated reader over a shared schema (see Reader.of).
+
+        Args:
+            schema (Schema[T]): Allocated schema of the dataclass T.
+            compiled (bool): Use a generated decoder specialized for T.
+            framing (Framing | None): Framing strategy of the byte stream.
+            skip_invalid (bool): Skip messages whose checksum fields do not match.
+            strict (bool): Check the type of every decoded value.
+            representation (Representation): Type of the decoded messages.
+            lists (ListRepresentation): Type of the decoded list fields.
+
+        Returns:
+            AsyncReader[T]: The allocated binary protocol reader.
+        """
+
+        reader = Reader.of(
+            schema,
+            compiled,
+            framing=framing,
+            skip_invalid=skip_invalid,
+            strict=strict,
+            representation=representation,
+            lists=lists,
+        )
+        return cls(
+            schema.byte_order,
+            compiled,
+            framing=framing,
+            skip_invalid=skip_invalid,
+            strict=strict,
+            representation=representation,
+            lists=lists,
+        ).__attach(reader)
+
+    def __attach(self, reader: Reader[T]) -> AsyncReader[T]:
+        """Points the reader at the allocated reader that decodes its messages."""
+
+        self.__reader = reader
+        return self
+
+    @property
+    def reader(self) -> Reader[T]:
+        """Returns the underlying reader holding the internal buffer.
+
+        Returns:
+            Reader[T]: Synchronous binary protocol reader.
+        """
+
+        if self.__reader is None:
+            raise RuntimeError("reader must be allocated before use")
+        return self.__reader
+
+    async def iter_stream(
+        self,
+        stream: asyncio.StreamReader | AsyncIterable[bytes],
+        exact: bool = False,
+        read_size: int = DEFAULT_READ_SIZE,
+    ) -> AsyncIterator[T]:
+        """Yields the constructed dataclasses from an asyncio stream or async byte iterator. Data
+            is only read from the stream once every buffered message has been consumed.
+
+        Args:
+            stream (asyncio.StreamReader | AsyncIterable[bytes]): Byte stream.
+            exact (bool): Read exactly one message worth of bytes at a time (StreamReader only,
+                unframed fixed-size messages) instead of batched reads of up to read_size bytes.
+            read_size (int): Maximum number of bytes requested per batched read.
+
+        Yields:
+            AsyncIterator[T]: Yielded dataclass iterator.
+        """
+
+        reader = self.reader
+        if exact and self.__framing is not None:
+            raise ValueError("exact reads are not supported on framed streams")
+
+        # drain anything buffered before the stream is touched
+        for message in reader.build_many():
+            yield message
+
+        if isinstance(stream, asyncio.StreamReader):
+            while True:
+                if exact:
+                    try:
+                        reader.feed(await stream.readexactly(reader.size - len(reader)))
+                    except asyncio.IncompleteReadError as error:
+                        reader.feed(error.partial)
+                        return
+                else:
+                    data = await stream.read(read_size)
+                    if not data:
+                        return
+                    reader.feed(data)
+
+                for message in reader.build_many():
+                    yield message
+        else:
+            async for chunk in stream:
+                reader.feed(chunk)
+                for message in reader.build_many():
+                    yield message
@@ -3,8 +3,11 @@ bytechomp.basic_parsing_element
 """
 
 from __future__ import annotations
+from typing import Any
+from collections import OrderedDict
 from dataclasses import dataclass
 
+from bytechomp.datatypes.declarations import Checksum
 from bytechomp.datatypes.lookups import ELEMENTARY_TYPE
 
 
@@ -12,6 +15,8 @@ from bytechomp.datatypes.lookups import ELEMENTARY_TYPE
 class BasicParsingElement:
     """Describes a node in the type tree."""
 
+    # pylint: disable=too-many-instance-attributes
+
     parsing_type: ELEMENTARY_TYPE | bytes
     python_type: type | None
     parser_tag: str
@@ -19,3 +24,13 @@ class BasicParsingElement:
     default_value: int | float | bytes | None = None
     raw_data: bytes = b""
     parsed_value: int | float | bytes | None = None
+    checksum: Checksum | None = None
+
+
+@dataclass(slots=True)
+class VariableParsingElement:
+    """Describes a bytes or list node in the type tree whose number of elements is read from a
+    previously decoded integer field."""
+
+    length_field: str
+    element: BasicParsingElement | OrderedDict[str, Any]
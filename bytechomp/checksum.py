@@ -0,0 +1,196 @@
+"""
+bytechomp.checksum
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, NamedTuple, Sequence
+from collections import OrderedDict
+from dataclasses import dataclass
+from struct import Struct
+
+from bytechomp.basic_parsing_element import BasicParsingElement, VariableParsingElement
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import TypeTree, count_values
+from bytechomp.layout import build_data_layout
+
+
+class ChecksumError(ValueError):
+    """Raised when the checksum field of a message does not match the bytes it covers."""
+
+
+class Mark(NamedTuple):
+    """Position in a message relative to the start of one of its segments (see
+    bytechomp.segments), or the end of the segment when offset is None. Dataclasses without
+    variable length fields are a single segment."""
+
+    segment: int
+    offset: int | None
+
+    def resolve(self, starts: Sequence[int]) -> int:
+        """Returns the position in the message given the start of every segment, followed by
+        the size of the message."""
+
+        if self.offset is None:
+            return starts[self.segment + 1]
+        return starts[self.segment] + self.offset
+
+
+@dataclass(frozen=True, slots=True)
+class ChecksumField:
+    """A checksum field of a dataclass and the range of bytes it covers."""
+
+    name: str
+    function: Callable[[Any], int]
+    index: int
+    struct: Struct
+    position: Mark
+    begin: Mark
+    end: Mark
+
+    def compute(self, view: memoryview, base: int, starts: Sequence[int]) -> int:
+        """Computes the checksum of the message starting at base without copying it.
+
+        Args:
+            view (memoryview): View over the buffer holding the message.
+            base (int): Position of the message in the buffer.
+            starts (Sequence[int]): Segment starts of the message, followed by its size.
+
+        Returns:
+            int: Checksum of the covered bytes.
+        """
+
+        begin = base + self.begin.resolve(starts)
+        end = base + self.end.resolve(starts)
+        with view[begin:end] as covered:
+            return self.function(covered)
+
+    def verify(
+        self, view: memoryview, base: int, starts: Sequence[int], values: Sequence[Any]
+    ) -> bool:
+        """Tests the decoded checksum value of the message starting at base.
+
+        Args:
+            view (memoryview): View over the buffer holding the message.
+            base (int): Position of the message in the buffer.
+            starts (Sequence[int]): Segment starts of the message, followed by its size.
+            values (Sequence[Any]): Flat values decoded from the message.
+
+        Returns:
+            bool: True if the checksum matches.
+        """
+
+        return bool(self.compute(view, base, starts) == values[self.index])
+
+    def fill(self, buffer: Any, base: int, starts: Sequence[int]) -> None:
+        """Writes the checksum of the serialized message starting at base into the message.
+
+        Args:
+            buffer (Any): Writable buffer holding the message.
+            base (int): Position of the message in the buffer.
+            starts (Sequence[int]): Segment starts of the message, followed by its size.
+        """
+
+        with memoryview(buffer) as view:
+            value = self.compute(view, base, starts)
+        self.struct.pack_into(buffer, base + self.position.resolve(starts), value)
+
+
+def build_checksums(description: TypeTree, byte_order: ByteOrder) -> tuple[ChecksumField, ...]:
+    """Locates the checksum fields of the described dataclass and the bytes they cover.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        tuple[ChecksumField, ...]: Checksum fields in declaration order.
+    """
+
+    # pylint: disable=too-many-locals
+
+    names = [name for name in description if name != "__struct_type__"]
+    spans: dict[str, tuple[Mark, Mark]] = {}
+    indices: dict[str, int] = {}
+    segment = 0
+    run: TypeTree = OrderedDict([("__struct_type__", description["__struct_type__"])])
+
+    def close_run() -> None:
+        nonlocal segment
+        if len(run) == 1:
+            return
+        layout = build_data_layout(run, byte_order)
+        for name in [name for name in run if name != "__struct_type__"]:
+            fields = [
+                field
+                for path, field in layout.items()
+                if path == name or path.startswith((f"{name}.", f"{name}["))
+            ]
+            if fields:
+                start = min(field.offset for field in fields)
+                stop = max(field.offset + field.size for field in fields)
+                spans[name] = (Mark(segment, start), Mark(segment, stop))
+            del run[name]
+        segment += 1
+
+    index = 0
+    for name in names:
+        root_element = description[name]
+        indices[name] = index
+        index += count_values(OrderedDict([(name, root_element)]))
+        if isinstance(root_element, VariableParsingElement):
+            close_run()
+            spans[name] = (Mark(segment, 0), Mark(segment, None))
+            segment += 1
+        else:
+            run[name] = root_element
+    close_run()
+
+    order = byte_order.to_pattern()
+    checksums: list[ChecksumField] = []
+    for name in names:
+        element = description[name]
+        if not isinstance(element, BasicParsingElement) or element.checksum is None:
+            continue
+
+        checksum = element.checksum
+        if checksum.over is None:
+            begin, end = Mark(0, 0), spans[name][0]
+        else:
+            for covered in checksum.over:
+                if covered not in spans:
+                    raise LookupError(f"unable to find checksum field {covered} (field: {name})")
+            covered_names = sorted(checksum.over, key=names.index)
+            first, last = names.index(covered_names[0]), names.index(covered_names[-1])
+            if first <= names.index(name) <= last:
+                raise TypeError(f"checksum field cannot cover itself (field: {name})")
+            begin, end = spans[covered_names[0]][0], spans[covered_names[-1]][1]
+
+        checksums.append(
+            ChecksumField(
+                name=name,
+                function=checksum.function,
+                index=indices[name],
+                struct=Struct(order + element.parser_tag),
+                position=spans[name][0],
+                begin=begin,
+                end=end,
+            )
+        )
+
+    return tuple(checksums)
+
+
+def fill_checksums(
+    checksums: Sequence[ChecksumField], buffer: Any, base: int, starts: Sequence[int]
+) -> None:
+    """Writes every checksum of a serialized message into it, in declaration order.
+
+    Args:
+        checksums (Sequence[ChecksumField]): Checksum fields of the dataclass.
+        buffer (Any): Writable buffer holding the message.
+        base (int): Position of the message in the buffer.
+        starts (Sequence[int]): Segment starts of the message, followed by its size.
+    """
+
+    for checksum in checksums:
+        checksum.fill(buffer, base, starts)
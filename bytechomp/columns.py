@@ -0,0 +1,55 @@
+"""
+bytechomp.columns
+"""
+
+from __future__ import annotations
+from typing import Any, Sequence
+from array import array
+
+from bytechomp.datatypes.lookups import TAG_TO_TYPECODE
+from bytechomp.layout import build_value_paths
+from bytechomp.schema import CompiledSchema
+
+Columns = dict[str, "array[Any] | list[Any]"]
+
+
+def value_paths(schema: CompiledSchema) -> list[tuple[str, str | None]]:
+    """Returns the field path and array type code (None for bytes) of every unpacked value,
+        deriving them on first use.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+
+    Returns:
+        list[tuple[str, str | None]]: (field path, type code) pairs in unpacking order.
+    """
+
+    if "value_paths" not in schema.derived:
+        schema.derived["value_paths"] = [
+            (path, TAG_TO_TYPECODE.get(element.parser_tag))
+            for path, element in build_value_paths(schema.description)
+        ]
+    paths: list[tuple[str, str | None]] = schema.derived["value_paths"]
+    return paths
+
+
+def build_columns(schema: CompiledSchema, values: Sequence[Any]) -> Columns:
+    """Splits the concatenated unpacked values of several records into one column per field.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+        values (Sequence[Any]): Flat values of back to back records.
+
+    Returns:
+        Columns: Field path to array.array (or list for bytes fields).
+    """
+
+    paths = value_paths(schema)
+    stride = len(paths)
+    columns: Columns = {}
+
+    for index, (path, typecode) in enumerate(paths):
+        column = values[index::stride]
+        columns[path] = list(column) if typecode is None else array(typecode, column)
+
+    return columns
@@ -3,22 +3,31 @@ bytechomp.data_descriptor
 """
 
 from __future__ import annotations
-from typing import Annotated, Union, Any, get_origin, get_args
+from typing import Annotated, Union, Any, Sequence, get_origin, get_args
 from dataclasses import is_dataclass, fields, MISSING
 from collections import OrderedDict
 import inspect
 
+from bytechomp.datatypes.declarations import PAD, LengthFrom, Checksum
 from bytechomp.datatypes.lookups import (
     ELEMENTARY_TYPE_LIST,
     TYPE_TO_PYTYPE,
     TYPE_TO_TAG,
     TYPE_TO_LENGTH,
+    CODE_TO_PYTYPE,
 )
-from bytechomp.basic_parsing_element import BasicParsingElement
+from bytechomp.basic_parsing_element import BasicParsingElement, VariableParsingElement
 
 TypeTree = OrderedDict[
     str,
-    Union[type, BasicParsingElement, list[BasicParsingElement], list["TypeTree"], "TypeTree"],
+    Union[
+        type,
+        BasicParsingElement,
+        VariableParsingElement,
+        list[BasicParsingElement],
+        list["TypeTree"],
+        "TypeTree",
+    ],
 ]
 
 
@@ -49,7 +58,7 @@ def build_data_description(datatype: type) -> TypeTree:
         elif inspect.isclass(field.type) and is_dataclass(field.type):
             if field.default != MISSING:
                 raise TypeError(f"cannot have default value on nested types (field: {field.name})")
-            object_description[field.name] = build_data_description(field.type)
+            object_description[field.name] = _build_nested_description(field.type, field.name)
         elif get_origin(field.type) == Annotated:
             args = get_args(field.type)
 
@@ -61,6 +70,28 @@ def build_data_description(datatype: type) -> TypeTree:
             arg_type = args[0]
             length = args[1]
 
+            if isinstance(length, Checksum):
+                if (
+                    arg_type not in ELEMENTARY_TYPE_LIST
+                    or arg_type is PAD
+                    or TYPE_TO_PYTYPE[arg_type] is not int
+                ):
+                    raise TypeError(f"checksum field must be an integer (field: {field.name})")
+                object_description[field.name] = BasicParsingElement(
+                    parsing_type=arg_type,
+                    python_type=int,
+                    parser_tag=TYPE_TO_TAG[arg_type],
+                    length=TYPE_TO_LENGTH[arg_type],
+                    checksum=length,
+                )
+                continue
+
+            if isinstance(length, LengthFrom):
+                object_description[field.name] = _build_variable_element(
+                    object_description, field.name, arg_type, length
+                )
+                continue
+
             if not isinstance(length, int):
                 raise TypeError("second annotated argument must be an integer to denote length")
 
@@ -106,7 +137,9 @@ def build_data_description(datatype: type) -> TypeTree:
                         )
                     ] * length
                 elif inspect.isclass(list_type) and is_dataclass(list_type):
-                    object_description[field.name] = [build_data_description(list_type)] * length
+                    object_description[field.name] = [
+                        _build_nested_description(list_type, field.name)
+                    ] * length
                 else:
                     raise TypeError(f"unsupported list type: {list_type} (field: {field.name})")
 
@@ -122,6 +155,124 @@ def build_data_description(datatype: type) -> TypeTree:
     return object_description
 
 
+def _build_nested_description(datatype: type, name: str) -> TypeTree:
+    """Describes a dataclass nested in another one, which must have a fixed size."""
+
+    description = build_data_description(datatype)
+    if has_variable_length(description):
+        raise TypeError(
+            f"variable length fields are only supported in the top-level dataclass (field: {name})"
+        )
+    if any(
+        isinstance(element, BasicParsingElement) and element.checksum is not None
+        for element in description.values()
+    ):
+        raise TypeError(
+            f"checksum fields are only supported in the top-level dataclass (field: {name})"
+        )
+    return description
+
+
+def _build_variable_element(
+    description: TypeTree, name: str, arg_type: Any, length: LengthFrom
+) -> VariableParsingElement:
+    """Describes a bytes or list field whose length is read from a preceding integer field.
+
+    Args:
+        description (TypeTree): Type tree of the fields declared before this field.
+        name (str): Name of the field.
+        arg_type (Any): Annotated type of the field.
+        length (LengthFrom): Path of the field holding the length.
+
+    Returns:
+        VariableParsingElement: Type tree node of the field.
+    """
+
+    length_element: Any = description
+    for part in length.field.split("."):
+        if not isinstance(length_element, OrderedDict) or part not in length_element:
+            length_element = None
+            break
+        length_element = length_element[part]
+
+    if (
+        not isinstance(length_element, BasicParsingElement)
+        or length_element.python_type is not int
+        or length_element.parser_tag == "x"
+    ):
+        raise TypeError(
+            f"length field {length.field} must be a preceding integer field (field: {name})"
+        )
+
+    if arg_type == bytes:
+        element: BasicParsingElement | TypeTree = BasicParsingElement(
+            parsing_type=bytes, python_type=bytes, parser_tag="s", length=1
+        )
+    elif get_origin(arg_type) == list and len(get_args(arg_type)) == 1:
+        list_type = get_args(arg_type)[0]
+        if list_type in ELEMENTARY_TYPE_LIST and list_type is not PAD:
+            element = BasicParsingElement(
+                parsing_type=list_type,
+                python_type=TYPE_TO_PYTYPE[list_type],
+                parser_tag=TYPE_TO_TAG[list_type],
+                length=TYPE_TO_LENGTH[list_type],
+            )
+        elif inspect.isclass(list_type) and is_dataclass(list_type):
+            element = _build_nested_description(list_type, name)
+        else:
+            raise TypeError(f"unsupported list type: {list_type} (field: {name})")
+    else:
+        raise TypeError(f"unsupported annotated type: {arg_type} (field: {name})")
+
+    return VariableParsingElement(length_field=length.field, element=element)
+
+
+def has_variable_length(description: TypeTree) -> bool:
+    """Tests if the described dataclass has fields whose length is only known at runtime.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+
+    Returns:
+        bool: True if the size of the dataclass depends on its values.
+    """
+
+    return any(isinstance(element, VariableParsingElement) for element in description.values())
+
+
+def count_values(description: TypeTree) -> int:
+    """Counts the values the struct module produces for the described dataclass. Pad bytes
+        produce no value, while a variable length field is a single value (the bytes or list).
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+
+    Returns:
+        int: Number of flat values.
+    """
+
+    count = 0
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        if isinstance(root_element, BasicParsingElement):
+            count += root_element.parser_tag != "x"
+        elif isinstance(root_element, VariableParsingElement):
+            count += 1
+        elif isinstance(root_element, list):
+            for sub_element in root_element:
+                if isinstance(sub_element, BasicParsingElement):
+                    count += sub_element.parser_tag != "x"
+                else:
+                    count += count_values(sub_element)
+        elif isinstance(root_element, OrderedDict):
+            count += count_values(root_element)
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+    return count
+
+
 def build_data_pattern(description: TypeTree) -> str:
     """Determines a packed data representation using the struct module binary pattern characters.
 
@@ -150,6 +301,8 @@ def build_data_pattern(description: TypeTree) -> str:
                     raise TypeError(f"invalid list type found ({name})")
         elif isinstance(root_element, OrderedDict):
             pattern += build_data_pattern(root_element)
+        elif isinstance(root_element, VariableParsingElement):
+            raise TypeError(f"variable length field has no fixed pattern ({name})")
         else:
             raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
     return pattern
@@ -171,49 +324,161 @@ def resolve_basic_type(
     raise TypeError(f"invalid match between types: {type(arg)} != {element.python_type}")
 
 
+def resolve_basic_list(
+    args: Sequence[int | float | bytes], element: BasicParsingElement
+) -> list[int | float | bytes]:
+    """Returns the values of an elementary list while checking the intended type of the node.
+
+    Returns:
+        list[int | float | bytes]: Pythonic parsed values.
+    """
+
+    values = list(args)
+    python_type = element.python_type
+    if python_type is None or not all(isinstance(value, python_type) for value in values):
+        for value in values:
+            resolve_basic_type(value, element)
+    return values
+
+
+def prove_basic_types(description: TypeTree) -> None:
+    """Makes sure the struct module can only return values of the intended type of every node,
+        so that decoding needs no type checks.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+    """
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        if isinstance(root_element, VariableParsingElement):
+            root_element = root_element.element
+        elements = root_element[:1] if isinstance(root_element, list) else [root_element]
+
+        for element in elements:
+            if isinstance(element, OrderedDict):
+                prove_basic_types(element)
+            elif isinstance(element, BasicParsingElement) and element.parser_tag != "x":
+                produced = CODE_TO_PYTYPE.get(element.parser_tag[-1])
+                if (
+                    produced is None
+                    or element.python_type is None
+                    or not issubclass(produced, element.python_type)
+                ):
+                    raise TypeError(
+                        f"struct code {element.parser_tag} of field {name} does not produce "
+                        f"{element.python_type}"
+                    )
+
+
+def pad_value(element: BasicParsingElement) -> int | float | bytes:
+    """Returns the value of a pad element. Pad bytes do not produce a value in the struct module,
+        so their default (or zero) is used instead.
+
+    Returns:
+        int | float | bytes: Pythonic value.
+    """
+
+    return element.default_value if element.default_value is not None else 0
+
+
 def build_structure(
-    args: list[int | float | bytes],
+    args: Sequence[int | float | bytes],
     description: TypeTree,
+    strict: bool = False,
 ) -> Any:
     """Constructs an instantiation of the data type described by the description argument.
 
     Args:
-        args (list[int): Flat list of values returned from the struct module.
+        args (Sequence[int | float | bytes]): Flat values returned from the struct module.
         description (TypeTree): Type tree of BasicParsingElement nodes.
+        strict (bool): Check the type of every value. Values returned by the struct module for
+            a proven description (see prove_basic_types) always have the intended types, so this
+            only catches hand-built values (a debugging aid).
 
     Returns:
         Any: Instantiated dataclass
     """
 
-    # print(f"dat_args: {args}")
+    structure, _ = _build_structure(args, 0, description, strict)
+    return structure
+
+
+def _build_structure(
+    args: Sequence[int | float | bytes], index: int, description: TypeTree, strict: bool
+) -> tuple[Any, int]:
+    """Constructs the described dataclass from the flat values starting at index.
+
+    Returns:
+        tuple[Any, int]: (instantiated dataclass, index of the first value after it)
+    """
+
     cls_type = description.get("__struct_type__")
     if cls_type is not None and not isinstance(cls_type, type):
         raise TypeError("lost struct type information in description")
     if cls_type is None:
         raise LookupError("unable to find type information in description")
     cls_args: dict[str, Any] = {}
-    # print(f"constructing type {cls_type}")
 
-    for name, root_element in filter(
-        lambda item: item[0] != "__struct_type__", description.items()
-    ):
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
         if isinstance(root_element, BasicParsingElement):
-            cls_args[name] = resolve_basic_type(args.pop(0), root_element)
+            if root_element.parser_tag == "x":
+                cls_args[name] = pad_value(root_element)
+            else:
+                value = args[index]
+                cls_args[name] = resolve_basic_type(value, root_element) if strict else value
+                index += 1
         elif isinstance(root_element, list):
-            list_element: list[Any] = []
-            for sub_element in root_element:
-                # sub elements can only be a elementary data types or other dataclasses
-                if isinstance(sub_element, BasicParsingElement):
-                    list_element.append(resolve_basic_type(args.pop(0), sub_element))
-                elif isinstance(sub_element, OrderedDict):
-                    list_element.append(build_structure(args, sub_element))
-                else:
-                    raise TypeError(f"invalid list type found ({name})")
-            cls_args[name] = list_element
+            cls_args[name], index = _build_list(name, root_element, args, index, strict)
+        elif isinstance(root_element, VariableParsingElement):
+            # variable length fields are decoded as a whole into a single value
+            cls_args[name] = args[index]
+            index += 1
         elif isinstance(root_element, OrderedDict):
-            cls_args[name] = build_structure(args, root_element)
+            cls_args[name], index = _build_structure(args, index, root_element, strict)
         else:
             raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
 
-    # print(f"cls_args: {cls_args}")
-    return cls_type(**cls_args)
+    return cls_type(**cls_args), index
+
+
+def _build_list(
+    name: str,
+    elements: list[BasicParsingElement] | list[TypeTree],
+    args: Sequence[int | float | bytes],
+    index: int,
+    strict: bool,
+) -> tuple[list[Any], int]:
+    """Constructs a fixed-length list field from the flat values starting at index. Elementary
+        lists are sliced out of the values in bulk.
+
+    Returns:
+        tuple[list[Any], int]: (list value, index of the first value after it)
+    """
+
+    if not elements:
+        return [], index
+    sub_element = elements[0]
+
+    # sub elements can only be a elementary data types or other dataclasses
+    if isinstance(sub_element, BasicParsingElement):
+        if sub_element.parser_tag == "x":
+            return [pad_value(sub_element)] * len(elements), index
+        values = args[index : index + len(elements)]
+        if strict:
+            return resolve_basic_list(values, sub_element), index + len(elements)
+        return list(values), index + len(elements)
+
+    if isinstance(sub_element, OrderedDict):
+        structures: list[Any] = []
+        for _ in elements:
+            structure, index = _build_structure(args, index, sub_element, strict)
+            structures.append(structure)
+        return structures, index
+
+    raise TypeError(f"invalid list type found ({name})")
@@ -2,7 +2,8 @@
 bytechomp.datatypes.declarations
 """
 
-from typing import NewType
+from typing import Any, Callable, NewType
+from dataclasses import dataclass
 
 PAD = NewType("PAD", int)
 U8 = NewType("U8", int)
@@ -16,3 +17,23 @@ I64 = NewType("I64", int)
 F16 = NewType("F16", float)
 F32 = NewType("F32", float)
 F64 = NewType("F64", float)
+
+
+@dataclass(frozen=True)
+class LengthFrom:
+    """Annotated length of a bytes or list field that is read from a previously declared integer
+    field of the same dataclass (e.g. Annotated[bytes, LengthFrom("length")]). Nested fields are
+    referenced by their dotted path (e.g. "header.length")."""
+
+    field: str
+
+
+@dataclass(frozen=True)
+class Checksum:
+    """Annotated checksum of an integer field (e.g. Annotated[U32, Checksum(zlib.crc32)]). The
+    function receives a memoryview of the covered bytes of the message and returns the integer
+    checksum. The covered bytes are those preceding the checksum field, or, when over names
+    fields of the same dataclass, the bytes from the first to the last of those fields."""
+
+    function: Callable[[Any], int]
+    over: tuple[str, ...] | None = None
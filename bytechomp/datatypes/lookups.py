@@ -87,3 +87,34 @@ TYPE_TO_LENGTH: Final[dict[ELEMENTARY_TYPE, int]] = {
     int: 8,
     float: 8,
 }
+
+# python type of the values returned by the struct module for each pattern code (without count)
+CODE_TO_PYTYPE: Final[dict[str, type]] = {
+    "B": int,
+    "H": int,
+    "I": int,
+    "Q": int,
+    "b": int,
+    "h": int,
+    "i": int,
+    "q": int,
+    "e": float,
+    "f": float,
+    "d": float,
+    "s": bytes,
+}
+
+# array module type codes for the struct module pattern elements (half floats are widened)
+TAG_TO_TYPECODE: Final[dict[str, str]] = {
+    "B": "B",
+    "H": "H",
+    "I": "I",
+    "Q": "Q",
+    "b": "b",
+    "h": "h",
+    "i": "i",
+    "q": "q",
+    "e": "f",
+    "f": "f",
+    "d": "d",
+}
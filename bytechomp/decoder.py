@@ -0,0 +1,306 @@
+"""
+bytechomp.decoder
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Sequence
+from collections import OrderedDict
+from dataclasses import fields
+from array import array
+
+from bytechomp.basic_parsing_element import BasicParsingElement, VariableParsingElement
+from bytechomp.data_descriptor import (
+    TypeTree,
+    pad_value,
+    resolve_basic_type,
+    resolve_basic_list,
+)
+from bytechomp.datatypes.lookups import TAG_TO_TYPECODE
+from bytechomp.representation import ListRepresentation, Representation, compact_type
+
+Decoder = Callable[[Sequence[Any]], Any]
+
+
+class _DecoderContext:
+    """Accumulates the generated helper functions and the namespace they are executed in."""
+
+    def __init__(
+        self,
+        strict: bool = False,
+        representation: Representation = Representation.DATACLASS,
+        lists: ListRepresentation = ListRepresentation.LIST,
+    ) -> None:
+        self.namespace: dict[str, Any] = {}
+        self.helpers: list[str] = []
+        self.helper_names: dict[int, tuple[str, int]] = {}
+        self.strict = strict
+        self.representation = representation
+        self.lists = lists
+
+    def sequence(self, expression: str, tag: str | None = None) -> str:
+        """Converts a list expression to the list representation (tag is the struct code of the
+        elements of an elementary list)."""
+
+        if self.lists is ListRepresentation.LIST:
+            return expression
+        if self.lists is ListRepresentation.ARRAY and tag in TAG_TO_TYPECODE:
+            return f"{self.reference(array)}({TAG_TO_TYPECODE[tag]!r}, {expression})"
+        return f"tuple({expression})"
+
+    def reference(self, value: Any) -> str:
+        """Stores a value in the namespace of the generated code and returns its name."""
+
+        name = f"_r{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+
+def _index(base: str, offset: int) -> str:
+    """Builds an index expression into the flat value sequence."""
+
+    if not base:
+        return str(offset)
+    if offset == 0:
+        return base
+    return f"{base} + {offset}"
+
+
+def _pad_value(element: BasicParsingElement) -> str:
+    """Pad bytes produce no value from the struct module, so fall back to the field default."""
+
+    return repr(pad_value(element))
+
+
+def _emit_structure(
+    description: TypeTree, base: str, offset: int, context: _DecoderContext
+) -> tuple[str, int]:
+    """Generates the constructor expression for the dataclass described by the description.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        base (str): Name of the runtime offset variable (empty when the offset is static).
+        offset (int): Static offset of the first value of this structure.
+        context (_DecoderContext): Code generation context.
+
+    Returns:
+        tuple[str, int]: (constructor expression, number of values consumed)
+    """
+
+    cls_type = description.get("__struct_type__")
+    if cls_type is not None and not isinstance(cls_type, type):
+        raise TypeError("lost struct type information in description")
+    if cls_type is None:
+        raise LookupError("unable to find type information in description")
+
+    start = offset
+    cls_args: dict[str, str] = {}
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        if isinstance(root_element, BasicParsingElement):
+            if root_element.parser_tag == "x":
+                cls_args[name] = _pad_value(root_element)
+            elif context.strict:
+                check = context.reference(resolve_basic_type)
+                element = context.reference(root_element)
+                cls_args[name] = f"{check}(v[{_index(base, offset)}], {element})"
+                offset += 1
+            else:
+                cls_args[name] = f"v[{_index(base, offset)}]"
+                offset += 1
+        elif isinstance(root_element, VariableParsingElement):
+            # variable length fields are decoded as a whole into a single value
+            value = f"v[{_index(base, offset)}]"
+            cls_args[name] = _emit_variable(name, root_element, value, context)
+            offset += 1
+        elif isinstance(root_element, list):
+            cls_args[name], offset = _emit_list(name, root_element, base, offset, context)
+        elif isinstance(root_element, OrderedDict):
+            cls_args[name], count = _emit_structure(root_element, base, offset, context)
+            offset += count
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+
+    return _emit_constructor(cls_type, cls_args, context), offset - start
+
+
+def _emit_constructor(cls_type: type, cls_args: dict[str, str], context: _DecoderContext) -> str:
+    """Generates the construction of a dataclass (or of its representation) from the expressions
+        of its fields.
+
+    Args:
+        cls_type (type): Dataclass type.
+        cls_args (dict[str, str]): Field name to value expression, in field order.
+        context (_DecoderContext): Generated code accumulator.
+
+    Returns:
+        str: Constructor expression.
+    """
+
+    if context.representation is Representation.TUPLE:
+        return f"({''.join(f'{value}, ' for value in cls_args.values())})"
+
+    # positional arguments are bound much faster than keywords, which are matched by name
+    positional = [field.name for field in fields(cls_type) if field.init and not field.kw_only]
+    if positional == list(cls_args) or context.representation is Representation.NAMEDTUPLE:
+        arguments = ", ".join(cls_args.values())
+    else:
+        arguments = ", ".join(f"{name}={value}" for name, value in cls_args.items())
+    return f"{context.reference(compact_type(cls_type, context.representation))}({arguments})"
+
+
+def _emit_variable(
+    name: str, element: VariableParsingElement, expression: str, context: _DecoderContext
+) -> str:
+    """Generates the expression of a variable length field, decoded as a whole into a bytes or
+        list value by its segment.
+
+    Returns:
+        str: Field expression.
+    """
+
+    if isinstance(element.element, BasicParsingElement):
+        if element.element.parser_tag == "s":
+            return expression
+        return context.sequence(expression, element.element.parser_tag)
+
+    if context.representation is not Representation.DATACLASS:
+        raise TypeError(
+            f"variable length lists of dataclasses are always decoded as dataclasses ({name})"
+        )
+    return context.sequence(expression)
+
+
+def _emit_list(
+    name: str,
+    elements: list[BasicParsingElement] | list[TypeTree],
+    base: str,
+    offset: int,
+    context: _DecoderContext,
+) -> tuple[str, int]:
+    """Generates the expression for a fixed-length list field.
+
+    Returns:
+        tuple[str, int]: (list expression, offset after the list)
+    """
+
+    length = len(elements)
+    if length == 0:
+        return context.sequence("[]"), offset
+
+    sub_element = elements[0]
+
+    # sub elements can only be a elementary data types or other dataclasses
+    if isinstance(sub_element, BasicParsingElement):
+        if sub_element.parser_tag == "x":
+            return context.sequence(f"[{_pad_value(sub_element)}] * {length}"), offset
+        return _emit_basic_list(sub_element, length, base, offset, context), offset + length
+
+    if isinstance(sub_element, OrderedDict):
+        helper, step = _emit_helper(sub_element, context)
+        start = _index(base, offset)
+        if step == 0:
+            return context.sequence(f"[{helper}(v, {start}) for _ in range({length})]"), offset
+        stop = _index(base, offset + length * step)
+        return (
+            context.sequence(f"[{helper}(v, o) for o in range({start}, {stop}, {step})]"),
+            offset + length * step,
+        )
+
+    raise TypeError(f"invalid list type found ({name})")
+
+
+def _emit_basic_list(
+    sub_element: BasicParsingElement,
+    length: int,
+    base: str,
+    offset: int,
+    context: _DecoderContext,
+) -> str:
+    """Generates the expression for a fixed-length list of elementary values.
+
+    Returns:
+        str: List expression.
+    """
+
+    start = _index(base, offset)
+    stop = _index(base, offset + length)
+    tag = sub_element.parser_tag
+    if context.strict:
+        check = context.reference(resolve_basic_list)
+        element = context.reference(sub_element)
+        return context.sequence(f"{check}(v[{start}:{stop}], {element})", tag)
+    if context.lists is ListRepresentation.LIST:
+        return f"list(v[{start}:{stop}])"
+    return context.sequence(f"v[{start}:{stop}]", tag)
+
+
+def _emit_helper(description: TypeTree, context: _DecoderContext) -> tuple[str, int]:
+    """Generates a helper function building a structure at a runtime offset (used for lists).
+
+    Returns:
+        tuple[str, int]: (helper function name, number of values consumed per structure)
+    """
+
+    key = id(description)
+    if key not in context.helper_names:
+        expression, count = _emit_structure(description, "o", 0, context)
+        helper = f"_build{len(context.helper_names)}"
+        context.helper_names[key] = (helper, count)
+        context.helpers.append(f"def {helper}(v, o):\n    return {expression}\n")
+    return context.helper_names[key]
+
+
+def generate_decoder_source(
+    description: TypeTree,
+    strict: bool = False,
+    representation: Representation = Representation.DATACLASS,
+    lists: ListRepresentation = ListRepresentation.LIST,
+) -> tuple[str, dict[str, Any]]:
+    """Generates the python source of a specialized decoder for the described dataclass.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        strict (bool): Check the type of every value (see build_structure).
+        representation (Representation): Type of the decoded messages.
+        lists (ListRepresentation): Type of the decoded list fields.
+
+    Returns:
+        tuple[str, dict[str, Any]]: (source code, namespace the source must be executed in)
+    """
+
+    context = _DecoderContext(strict, representation, lists)
+    expression, _ = _emit_structure(description, "", 0, context)
+    source = "".join(context.helpers) + f"def decode(v):\n    return {expression}\n"
+    return source, context.namespace
+
+
+def compile_decoder(
+    description: TypeTree,
+    strict: bool = False,
+    representation: Representation = Representation.DATACLASS,
+    lists: ListRepresentation = ListRepresentation.LIST,
+) -> Decoder:
+    """Compiles the type tree into a straight-line function that builds the dataclass from the
+        flat tuple of values returned by the struct module. The types of the values are proven
+        when the schema is compiled, so they are only checked in strict mode.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        strict (bool): Check the type of every value (see build_structure).
+        representation (Representation): Type of the decoded messages.
+        lists (ListRepresentation): Type of the decoded list fields.
+
+    Returns:
+        Decoder: Function mapping the unpacked values to an instantiated dataclass.
+    """
+
+    source, namespace = generate_decoder_source(description, strict, representation, lists)
+    cls_type = description.get("__struct_type__")
+    name = getattr(cls_type, "__qualname__", "structure")
+    code = compile(source, f"<bytechomp decoder {name}>", "exec")
+    exec(code, namespace)  # nosec B102 pylint: disable=exec-used
+    decoder: Decoder = namespace["decode"]
+    return decoder
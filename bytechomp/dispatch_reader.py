@@ -0,0 +1,197 @@
+"""
+bytechomp.dispatch_reader
+"""
+
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
+from dataclasses import is_dataclass
+from struct import Struct
+import inspect
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.checksum import ChecksumError, ChecksumField
+from bytechomp.decoder import Decoder
+from bytechomp.layout import data_layout
+from bytechomp.schema import get_schema, require_fixed_size
+from bytechomp.stream_buffer import StreamBuffer
+
+
+class _Body(NamedTuple):
+    """Struct, decoder and checksum fields of a body dataclass."""
+
+    struct: Struct
+    decoder: Decoder
+    checksums: tuple[ChecksumField, ...]
+
+
+class DispatchReader(StreamBuffer):
+    """A binary protocol reader for streams of several message types. Every message starts with
+        a common header dataclass, and a discriminator field of the header selects the dataclass
+        of the body that directly follows it.
+
+    Args:
+        header (type): Dataclass of the common message header.
+        discriminator (str): Path of the header field selecting the body type (e.g. "kind").
+        bodies (Mapping[Any, type]): Discriminator value to body dataclass.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+    """
+
+    def __init__(
+        self,
+        header: type,
+        discriminator: str,
+        bodies: Mapping[Any, type],
+        byte_order: ByteOrder = ByteOrder.NATIVE,
+    ) -> None:
+        for datatype in (header, *bodies.values()):
+            if not inspect.isclass(datatype) or not is_dataclass(datatype):
+                raise ValueError("header and body datatypes must be dataclasses")
+
+        header_schema = require_fixed_size(get_schema(header, byte_order))
+        layout = data_layout(header_schema)
+        if discriminator not in layout:
+            raise LookupError(f"unable to find discriminator field {discriminator} in header")
+
+        super().__init__()
+        self.__header_struct = header_schema.struct
+        self.__header_decoder = header_schema.decoder
+        self.__header_checksums = header_schema.checksums
+        self.__discriminator = layout[discriminator]
+
+        # discriminator value -> body, resolved with one dict lookup
+        self.__bodies: dict[Any, _Body] = {}
+        for tag, body in bodies.items():
+            body_schema = require_fixed_size(get_schema(body, byte_order))
+            self.__bodies[tag] = _Body(
+                body_schema.struct, body_schema.decoder, body_schema.checksums
+            )
+
+    def __body(self) -> _Body | None:
+        """Returns the body of the next message, None if its header has not been received yet. The
+            header of a message of an unknown type is consumed and reported with a LookupError,
+            so decoding resumes at the bytes following it.
+
+        Returns:
+            Optional[_Body]: Struct, decoder and checksum fields of the body dataclass.
+        """
+
+        header_size = self.__header_struct.size
+        if len(self._data) - self._offset < header_size:
+            return None
+
+        tag = self.__discriminator.read(self._data, self._offset)
+        body = self.__bodies.get(tag)
+        if body is None:
+            self._consume(header_size)
+            raise LookupError(f"unknown message type: {tag!r}")
+        return body
+
+    def is_complete(self) -> bool:
+        """Tests if the internal buffer contains enough data to construct the next message (a
+            message of an unknown type is complete once its header is received, as building it
+            reports the unknown type).
+
+        Returns:
+            bool: True if the internal buffer is sufficiently large.
+        """
+
+        header_size = self.__header_struct.size
+        if len(self._data) - self._offset < header_size:
+            return False
+        body = self.__bodies.get(self.__discriminator.read(self._data, self._offset))
+        if body is None:
+            return True
+        return len(self._data) - self._offset >= header_size + body.struct.size
+
+    def __bool__(self) -> bool:
+        """Alternative to the is_complete method.
+
+        Returns:
+            bool: True if the internal buffer is sufficiently large.
+        """
+
+        return self.is_complete()
+
+    def build(self) -> tuple[Any, Any] | None:
+        """Constructs the header and body of the next message in the internal buffer.
+
+        Returns:
+            Optional[tuple[Any, Any]]: (header, body) if the internal buffer is sufficiently
+                large, otherwise None.
+        """
+
+        body = self.__body()
+        if body is None:
+            return None
+
+        header_size = self.__header_struct.size
+        size = header_size + body.struct.size
+        if len(self._data) - self._offset < size:
+            return None
+
+        header_values = self.__header_struct.unpack_from(self._data, self._offset)
+        body_values = body.struct.unpack_from(self._data, self._offset + header_size)
+        if self.__header_checksums or body.checksums:
+            self.__verify(header_values, body, body_values)
+        self._consume(size)
+        return self.__header_decoder(header_values), body.decoder(body_values)
+
+    def __verify(self, header_values: Any, body: _Body, body_values: Any) -> None:
+        """Verifies the checksum fields of the header and body of the next message. An invalid
+            message is consumed and reported with a ChecksumError.
+
+        Args:
+            header_values (Any): Flat values decoded from the header.
+            body (_Body): Body of the message.
+            body_values (Any): Flat values decoded from the body.
+        """
+
+        header_size = self.__header_struct.size
+        body_start = self._offset + header_size
+        with memoryview(self._data) as view:
+            invalid = [
+                checksum.name
+                for checksum in self.__header_checksums
+                if not checksum.verify(view, self._offset, (0, header_size), header_values)
+            ] + [
+                checksum.name
+                for checksum in body.checksums
+                if not checksum.verify(view, body_start, (0, body.struct.size), body_values)
+            ]
+        if invalid:
+            self._consume(header_size + body.struct.size)
+            raise ChecksumError(f"invalid checksum in field {invalid[0]}")
+
+    def build_many(self, max_count: int | None = None) -> list[tuple[Any, Any]]:
+        """Constructs every complete message available in the internal buffer.
+
+        Args:
+            max_count (int | None): Maximum number of messages to build (all when None).
+
+        Returns:
+            list[tuple[Any, Any]]: (header, body) pairs in the order they were received.
+        """
+
+        messages: list[tuple[Any, Any]] = []
+        while max_count is None or len(messages) < max_count:
+            message = self.build()
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    def iter(self, byte_iterator: Iterable[bytes]) -> Iterator[tuple[Any, Any]]:
+        """Allows the reader to use a stream of bytes to yield the constructed messages as an
+            iterator.
+
+        Args:
+            byte_iterator (Iterable[bytes]): Byte stream.
+
+        Yields:
+            Iterator[tuple[Any, Any]]: Yielded (header, body) iterator.
+        """
+
+        for chunk in byte_iterator:
+            self.feed(chunk)
+            while (message := self.build()) is not None:
+                yield message
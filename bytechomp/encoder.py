@@ -0,0 +1,268 @@
+"""
+bytechomp.encoder
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Sized, cast
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from itertools import chain
+
+from bytechomp.basic_parsing_element import BasicParsingElement, VariableParsingElement
+from bytechomp.data_descriptor import TypeTree
+
+Encoder = Callable[[Any], tuple[Any, ...]]
+
+
+def length_error(name: str, kind: str, value: Sized, length: int) -> TypeError:
+    """Builds the error raised when a bytes or list field does not have its declared length."""
+
+    return TypeError(
+        f"{name} {kind} field has a length of {len(value)} but requires a length of {length}"
+    )
+
+
+def type_error(name: str, value: Any, required: type) -> TypeError:
+    """Builds the error raised when a field, or an element of a list field, does not hold a value
+    of its declared type."""
+
+    return TypeError(f"{name} field contains {type(value)} type but requires {required}")
+
+
+class _EncoderContext:  # pylint: disable=too-few-public-methods
+    """Accumulates the generated helper functions and the namespace they are executed in."""
+
+    def __init__(self, validate: bool = False) -> None:
+        self.namespace: dict[str, Any] = {
+            "_chain": chain.from_iterable,
+            "_error": length_error,
+            "_type_error": type_error,
+        }
+        self.helpers: list[str] = []
+        self.helper_names: dict[int, str] = {}
+        self.validate = validate
+
+    def reference(self, value: Any) -> str:
+        """Stores a value in the namespace of the generated code and returns its name."""
+
+        name = f"_r{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+
+def _required_type(element: BasicParsingElement | TypeTree) -> type:
+    """Returns the type the values of an element must have (the dataclass of a structure)."""
+
+    if isinstance(element, BasicParsingElement):
+        return element.python_type or object
+    return cast(type, element["__struct_type__"])
+
+
+def _type_check(name: str, value: str, required: type, context: _EncoderContext) -> str:
+    """Generates the condition and raise statement of a type check (exact for dataclasses, as
+    the value is gathered with the fields of the declared dataclass)."""
+
+    reference = context.reference(required)
+    if is_dataclass(required):
+        condition = f"type({value}) is not {reference}"
+    else:
+        condition = f"not isinstance({value}, {reference})"
+    return f"if {condition}:\n        raise _type_error({name!r}, {value}, {reference})"
+
+
+def _element_check(
+    name: str,
+    attribute: str,
+    element: BasicParsingElement | TypeTree,
+    context: _EncoderContext,
+    validator: str | None = None,
+) -> str:
+    """Generates the loop checking the type of every element of a list field, and validating
+    the fields of every element with a helper when given."""
+
+    check = _type_check(name, "e", _required_type(element), context).replace("\n", "\n    ")
+    validation = f"\n        {validator}(e)" if validator is not None else ""
+    return f"for e in {attribute}:\n        {check}{validation}"
+
+
+def _emit_structure(
+    description: TypeTree, target: str, checks: list[str], context: _EncoderContext
+) -> list[str]:
+    """Generates the value expressions gathering the fields of the described dataclass.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        target (str): Expression evaluating to the dataclass object.
+        checks (list[str]): Statements validating the object, extended in place.
+        context (_EncoderContext): Code generation context.
+
+    Returns:
+        list[str]: Expressions of the flattened values, in struct pattern order.
+    """
+
+    values: list[str] = []
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        attribute = f"{target}.{name}"
+
+        if isinstance(root_element, BasicParsingElement):
+            if context.validate:
+                checks.append(_type_check(name, attribute, _required_type(root_element), context))
+            # pad bytes do not consume a value in the struct module
+            if root_element.parser_tag == "x":
+                continue
+            if root_element.parsing_type is bytes:
+                checks.append(
+                    f"if len({attribute}) != {root_element.length}:\n"
+                    f"        raise _error({name!r}, 'bytes', {attribute}, {root_element.length})"
+                )
+            values.append(attribute)
+        elif isinstance(root_element, VariableParsingElement):
+            # the whole bytes or list value is gathered, it is packed on its own
+            values.append(_emit_variable(name, root_element, target, checks, context))
+        elif isinstance(root_element, list):
+            values.extend(_emit_list(name, root_element, attribute, checks, context))
+        elif isinstance(root_element, OrderedDict):
+            if context.validate:
+                checks.append(_type_check(name, attribute, _required_type(root_element), context))
+            values.extend(_emit_structure(root_element, attribute, checks, context))
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+
+    return values
+
+
+def _emit_variable(
+    name: str,
+    root_element: VariableParsingElement,
+    target: str,
+    checks: list[str],
+    context: _EncoderContext,
+) -> str:
+    """Generates the checks of a variable length bytes or list field.
+
+    Returns:
+        str: Expression of the field value, gathered as a single value.
+    """
+
+    attribute = f"{target}.{name}"
+    element = root_element.element
+    is_bytes = isinstance(element, BasicParsingElement) and element.parsing_type is bytes
+    kind = "bytes" if is_bytes else "list"
+    if context.validate:
+        checks.append(_type_check(name, attribute, bytes if is_bytes else list, context))
+        if not is_bytes:
+            # the segments gather the elements without checks, the helper validates them
+            validator = _emit_helper(element, context) if isinstance(element, OrderedDict) else None
+            checks.append(_element_check(name, attribute, element, context, validator))
+
+    length_attribute = f"{target}.{root_element.length_field}"
+    checks.append(
+        f"if len({attribute}) != {length_attribute}:\n"
+        f"        raise _error({name!r}, {kind!r}, {attribute}, {length_attribute})"
+    )
+    return attribute
+
+
+def _emit_list(
+    name: str,
+    elements: list[BasicParsingElement] | list[TypeTree],
+    attribute: str,
+    checks: list[str],
+    context: _EncoderContext,
+) -> list[str]:
+    """Generates the value expressions gathering a fixed-length list field.
+
+    Returns:
+        list[str]: Expressions of the flattened values (none for empty and pad lists).
+    """
+
+    length = len(elements)
+    if context.validate:
+        checks.append(_type_check(name, attribute, list, context))
+    checks.append(
+        f"if len({attribute}) != {length}:\n"
+        f"        raise _error({name!r}, 'list', {attribute}, {length})"
+    )
+    if length == 0:
+        return []
+
+    # sub elements can only be a elementary data types or other dataclasses
+    sub_element = elements[0]
+    if context.validate:
+        checks.append(_element_check(name, attribute, sub_element, context))
+    if isinstance(sub_element, BasicParsingElement):
+        return [] if sub_element.parser_tag == "x" else [f"*{attribute}"]
+    if isinstance(sub_element, OrderedDict):
+        helper = _emit_helper(sub_element, context)
+        return [f"*_chain(map({helper}, {attribute}))"]
+    raise TypeError(f"invalid list type found ({name})")
+
+
+def _emit_function(name: str, description: TypeTree, context: _EncoderContext) -> str:
+    """Generates the source of a function flattening the described dataclass into a tuple."""
+
+    checks: list[str] = []
+    values = _emit_structure(description, "d", checks, context)
+    body = "".join(f"    {check}\n" for check in checks)
+    gathered = "".join(f"{value}, " for value in values)
+    return f"def {name}(d):\n{body}    return ({gathered})\n"
+
+
+def _emit_helper(description: TypeTree, context: _EncoderContext) -> str:
+    """Generates a helper function flattening one element of a list of dataclasses.
+
+    Returns:
+        str: Name of the helper function.
+    """
+
+    key = id(description)
+    if key not in context.helper_names:
+        helper = f"_flatten{len(context.helper_names)}"
+        context.helper_names[key] = helper
+        context.helpers.append(_emit_function(helper, description, context))
+    return context.helper_names[key]
+
+
+def generate_encoder_source(
+    description: TypeTree, validate: bool = False
+) -> tuple[str, dict[str, Any]]:
+    """Generates the python source of a specialized flattening function for the dataclass.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        validate (bool): Check the type of every field and element of the object.
+
+    Returns:
+        tuple[str, dict[str, Any]]: (source code, namespace the source must be executed in)
+    """
+
+    context = _EncoderContext(validate)
+    source = _emit_function("encode", description, context)
+    return "".join(context.helpers) + source, context.namespace
+
+
+def compile_encoder(description: TypeTree, validate: bool = False) -> Encoder:
+    """Compiles the type tree into a straight-line function that gathers the values of a
+        dataclass object in the order of its struct pattern. The lengths of the bytes and list
+        fields are always checked, the types of the values only when validating.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        validate (bool): Check the type of every field and element of the object, as the
+            struct module accepts values of other types (e.g. an int for a float field).
+
+    Returns:
+        Encoder: Function mapping a dataclass object to the values to pack.
+    """
+
+    source, namespace = generate_encoder_source(description, validate)
+    cls_type = description.get("__struct_type__")
+    name = getattr(cls_type, "__qualname__", "structure")
+    code = compile(source, f"<bytechomp encoder {name}>", "exec")
+    exec(code, namespace)  # nosec B102 pylint: disable=exec-used
+    encoder: Encoder = namespace["encode"]
+    return encoder
@@ -0,0 +1,204 @@
+"""
+bytechomp.framing
+
+Framing strategies delimiting the messages of a byte stream (e.g. over TCP). The strategies
+locate frames directly in the internal buffer of a Reader with bytearray.find, so frames are
+never copied out before being decoded.
+"""
+
+from __future__ import annotations
+from typing import Any, NamedTuple
+from abc import ABC, abstractmethod
+from struct import Struct
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.datatypes.declarations import PAD
+from bytechomp.datatypes.lookups import ELEMENTARY_TYPE_LIST, TYPE_TO_PYTYPE, TYPE_TO_TAG
+
+
+class Frame(NamedTuple):
+    """Position of a frame found in a buffer.
+
+    Attributes:
+        start (int): Position of the first byte of the message.
+        stop (int | None): Position directly after the message, None when the message is only
+            delimited by its own size (e.g. after a sync word).
+        end (int | None): Position directly after the frame (the message and any trailer), None
+            when it ends with the message.
+        limit (int | None): Position the message must end before when it is only delimited by
+            its own size (e.g. the start of a partially received marker), None when the message
+            may extend to the end of the buffer.
+    """
+
+    start: int
+    stop: int | None
+    end: int | None
+    limit: int | None = None
+
+    def bound(self, buffered: int) -> int:
+        """Returns the position the message must end at or before.
+
+        Args:
+            buffered (int): Size of the buffer holding the frame.
+
+        Returns:
+            int: The end of the message, of the available bytes or of the buffer.
+        """
+
+        if self.stop is not None:
+            return self.stop
+        return buffered if self.limit is None else self.limit
+
+
+class Framing(ABC):
+    """Base class of the framing strategies a Reader can split its byte stream with."""
+
+    @abstractmethod
+    def find(
+        self, buffer: bytearray, offset: int, byte_order: ByteOrder
+    ) -> tuple[int, Frame | None]:
+        """Locates the next frame in the buffer.
+
+        Args:
+            buffer (bytearray): Internal buffer of the reader.
+            offset (int): Position of the first unconsumed byte of the buffer.
+            byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+        Returns:
+            tuple[int, Frame | None]: (position before which every byte can be discarded, next
+                frame or None if the buffer does not hold one yet)
+        """
+
+    @abstractmethod
+    def wrap(self, message: bytes, byte_order: ByteOrder = ByteOrder.NATIVE) -> bytes:
+        """Frames a serialized message.
+
+        Args:
+            message (bytes): Serialized message.
+            byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+        Returns:
+            bytes: Framed message.
+        """
+
+
+class LengthPrefixed(Framing):
+    """Frames that start with an unsigned integer holding the size of the message that follows.
+        The prefix is decoded with the byte order of the reader.
+
+    Args:
+        prefix_type (Any): Integer datatype of the prefix (e.g. U16 or U32).
+        includes_prefix (bool): The prefix counts its own size as well as the message size.
+        max_length (int | None): Largest valid message size. A prefix announcing a larger
+            message is treated as garbage: a single byte is discarded and the stream is scanned
+            again from the next byte, instead of waiting for the announced number of bytes.
+    """
+
+    def __init__(
+        self, prefix_type: Any, includes_prefix: bool = False, max_length: int | None = None
+    ) -> None:
+        if max_length is not None and max_length < 0:
+            raise ValueError(f"maximum frame length must not be negative ({max_length})")
+        if (
+            prefix_type not in ELEMENTARY_TYPE_LIST
+            or prefix_type is PAD
+            or TYPE_TO_PYTYPE[prefix_type] is not int
+        ):
+            raise TypeError(f"length prefix must be an integer datatype ({prefix_type})")
+
+        self.__includes_prefix = includes_prefix
+        self.__max_length = max_length
+        self.__prefixes = {
+            byte_order: Struct(byte_order.to_pattern() + TYPE_TO_TAG[prefix_type])
+            for byte_order in ByteOrder
+        }
+
+    def find(
+        self, buffer: bytearray, offset: int, byte_order: ByteOrder
+    ) -> tuple[int, Frame | None]:
+        prefix = self.__prefixes[byte_order]
+        if len(buffer) - offset < prefix.size:
+            return offset, None
+
+        start = offset + prefix.size
+        (length,) = prefix.unpack_from(buffer, offset)
+        end = offset + length if self.__includes_prefix else start + length
+        if end < start:
+            # a prefix smaller than itself is corrupt, skip it
+            return start, None
+        if self.__max_length is not None and end - start > self.__max_length:
+            # a garbage prefix, resynchronize on the following bytes
+            return offset + 1, None
+        if len(buffer) < end:
+            return offset, None
+        return offset, Frame(start, end, end)
+
+    def wrap(self, message: bytes, byte_order: ByteOrder = ByteOrder.NATIVE) -> bytes:
+        prefix = self.__prefixes[byte_order]
+        length = len(message) + prefix.size if self.__includes_prefix else len(message)
+        return prefix.pack(length) + message
+
+
+class SyncWord(Framing):
+    """Frames that start with a fixed marker. Bytes preceding a marker are discarded, so the
+        reader resynchronizes on the next marker after corrupt or partial data. A frame followed
+        by the next marker must hold exactly one message, so a truncated frame is dropped
+        rather than decoded with the bytes of the next frame. The marker must not appear within
+        the serialized messages.
+
+    Args:
+        sync (bytes): Marker preceding every message.
+    """
+
+    def __init__(self, sync: bytes) -> None:
+        if not sync:
+            raise ValueError("sync word must not be empty")
+        self.__sync = bytes(sync)
+
+    def find(
+        self, buffer: bytearray, offset: int, byte_order: ByteOrder
+    ) -> tuple[int, Frame | None]:
+        sync = self.__sync
+        position = buffer.find(sync, offset)
+        if position < 0:
+            # the tail of the buffer may hold the beginning of the next marker
+            return max(offset, len(buffer) - len(sync) + 1), None
+
+        start = position + len(sync)
+        following = buffer.find(sync, start)
+        if following >= 0:
+            return position, Frame(start, following, following)
+
+        # the message must not run into the beginning of a marker received at the tail
+        for length in range(min(len(sync) - 1, len(buffer) - start), 0, -1):
+            if buffer.endswith(sync[:length]):
+                return position, Frame(start, None, None, len(buffer) - length)
+        return position, Frame(start, None, None)
+
+    def wrap(self, message: bytes, byte_order: ByteOrder = ByteOrder.NATIVE) -> bytes:
+        return self.__sync + message
+
+
+class Delimiter(Framing):
+    """Frames that end with a fixed delimiter (e.g. b"\\r\\n"). The delimiter must not appear
+        within the serialized messages.
+
+    Args:
+        delimiter (bytes): Marker following every message.
+    """
+
+    def __init__(self, delimiter: bytes) -> None:
+        if not delimiter:
+            raise ValueError("delimiter must not be empty")
+        self.__delimiter = bytes(delimiter)
+
+    def find(
+        self, buffer: bytearray, offset: int, byte_order: ByteOrder
+    ) -> tuple[int, Frame | None]:
+        position = buffer.find(self.__delimiter, offset)
+        if position < 0:
+            return offset, None
+        return offset, Frame(offset, position, position + len(self.__delimiter))
+
+    def wrap(self, message: bytes, byte_order: ByteOrder = ByteOrder.NATIVE) -> bytes:
+        return message + self.__delimiter
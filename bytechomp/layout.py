@@ -0,0 +1,203 @@
+"""
+bytechomp.layout
+"""
+
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+from collections import OrderedDict
+from dataclasses import dataclass
+from struct import Struct, calcsize
+
+from bytechomp.basic_parsing_element import BasicParsingElement
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import TypeTree, pad_value
+
+if TYPE_CHECKING:
+    from bytechomp.schema import CompiledSchema
+
+
+@dataclass(frozen=True, slots=True)
+class FieldLayout:
+    """Position of a single elementary, bytes or pad field within a binary record."""
+
+    path: str
+    offset: int
+    size: int
+    tag: str
+    element: BasicParsingElement
+    struct: Struct
+
+    def read(self, buffer: Any, base: int = 0) -> int | float | bytes:
+        """Decodes the field from the record starting at base in the buffer.
+
+        Args:
+            buffer (Any): Bytes-like object containing the record.
+            base (int): Position of the record in the buffer.
+
+        Returns:
+            int | float | bytes: Decoded value (the default, or zero, for pad bytes).
+        """
+
+        if self.tag == "x":
+            return pad_value(self.element)
+        value: int | float | bytes = self.struct.unpack_from(buffer, base + self.offset)[0]
+        return value
+
+
+def tag_size(tag: str) -> int:
+    """Returns the number of bytes of a single struct pattern element.
+
+    Args:
+        tag (str): Struct module pattern element (e.g. "I" or "8s").
+
+    Returns:
+        int: Size in bytes.
+    """
+
+    return calcsize(f"={tag}")
+
+
+def align_offset(offset: int, tag: str, byte_order: ByteOrder) -> int:
+    """Returns the offset at which the struct module places the element following offset bytes.
+        Only the native byte order aligns elements, to the native size of the element type.
+
+    Args:
+        offset (int): Offset directly after the previous element.
+        tag (str): Struct module pattern element of the next element.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        int: Aligned offset of the element.
+    """
+
+    if byte_order != ByteOrder.NATIVE or tag.endswith(("s", "x")):
+        return offset
+    alignment = calcsize(f"@{tag}")
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def build_value_paths(
+    description: TypeTree, prefix: str = ""
+) -> list[tuple[str, BasicParsingElement]]:
+    """Lists the field path of every value produced by the struct module, in unpacking order.
+        Nested fields are joined with dots and list elements are indexed (e.g. "header.length"
+        or "points[2].x"). Pad bytes produce no value and are left out.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        prefix (str): Path of the structure described by the description.
+
+    Returns:
+        list[tuple[str, BasicParsingElement]]: (field path, element) pairs.
+    """
+
+    paths: list[tuple[str, BasicParsingElement]] = []
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        path = f"{prefix}{name}"
+
+        if isinstance(root_element, BasicParsingElement):
+            if root_element.parser_tag != "x":
+                paths.append((path, root_element))
+        elif isinstance(root_element, list):
+            for index, sub_element in enumerate(root_element):
+                # sub elements can only be a elementary data types or other dataclasses
+                if isinstance(sub_element, BasicParsingElement):
+                    if sub_element.parser_tag != "x":
+                        paths.append((f"{path}[{index}]", sub_element))
+                elif isinstance(sub_element, OrderedDict):
+                    paths.extend(build_value_paths(sub_element, f"{path}[{index}]."))
+                else:
+                    raise TypeError(f"invalid list type found ({name})")
+        elif isinstance(root_element, OrderedDict):
+            paths.extend(build_value_paths(root_element, f"{path}."))
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+
+    return paths
+
+
+def build_data_layout(description: TypeTree, byte_order: ByteOrder) -> dict[str, FieldLayout]:
+    """Computes the offset, size and struct code of every field of the described dataclass,
+        following the alignment rules of the byte order. Field paths are those of
+        build_value_paths(), with pad fields included.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        dict[str, FieldLayout]: Field path to layout, in pattern order.
+    """
+
+    layout: dict[str, FieldLayout] = {}
+    _layout_structure(description, byte_order, "", 0, layout)
+    return layout
+
+
+def data_layout(schema: CompiledSchema) -> dict[str, FieldLayout]:
+    """Returns the field layout of a compiled schema, deriving it on first use.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+
+    Returns:
+        dict[str, FieldLayout]: Field path to layout, in pattern order.
+    """
+
+    if "layout" not in schema.derived:
+        schema.derived["layout"] = build_data_layout(schema.description, schema.byte_order)
+    layout: dict[str, FieldLayout] = schema.derived["layout"]
+    return layout
+
+
+def _layout_structure(
+    description: TypeTree,
+    byte_order: ByteOrder,
+    prefix: str,
+    offset: int,
+    layout: dict[str, FieldLayout],
+) -> int:
+    """Adds the fields of a structure whose first element follows offset bytes to the layout.
+
+    Returns:
+        int: Offset directly after the structure.
+    """
+
+    order = byte_order.to_pattern()
+
+    def add(path: str, element: BasicParsingElement, offset: int) -> int:
+        tag = element.parser_tag
+        offset = align_offset(offset, tag, byte_order)
+        size = tag_size(tag)
+        layout[path] = FieldLayout(path, offset, size, tag, element, Struct(order + tag))
+        return offset + size
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        path = f"{prefix}{name}"
+
+        if isinstance(root_element, BasicParsingElement):
+            offset = add(path, root_element, offset)
+        elif isinstance(root_element, list):
+            for index, sub_element in enumerate(root_element):
+                # sub elements can only be a elementary data types or other dataclasses
+                if isinstance(sub_element, BasicParsingElement):
+                    offset = add(f"{path}[{index}]", sub_element, offset)
+                elif isinstance(sub_element, OrderedDict):
+                    offset = _layout_structure(
+                        sub_element, byte_order, f"{path}[{index}].", offset, layout
+                    )
+                else:
+                    raise TypeError(f"invalid list type found ({name})")
+        elif isinstance(root_element, OrderedDict):
+            offset = _layout_structure(root_element, byte_order, f"{path}.", offset, layout)
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+
+    return offset
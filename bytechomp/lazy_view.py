@@ -0,0 +1,228 @@
+"""
+bytechomp.lazy_view
+"""
+
+from __future__ import annotations
+from typing import Any, Generic, Iterator, TypeVar, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from struct import Struct
+
+from bytechomp.basic_parsing_element import BasicParsingElement
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import TypeTree, pad_value
+from bytechomp.layout import FieldLayout, data_layout
+from bytechomp.schema import CompiledSchema, get_schema
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+
+@dataclass(frozen=True, slots=True)
+class ValueAccessor:
+    """Decodes an elementary, bytes or elementary list field at a fixed offset of a record."""
+
+    struct: Struct | None
+    offset: int
+    is_list: bool
+    default: Any
+
+    def decode(self, buffer: Any, base: int) -> Any:
+        """Decodes the field of the record starting at base."""
+
+        if self.struct is None:
+            return list(self.default) if self.is_list else self.default
+        values = self.struct.unpack_from(buffer, base + self.offset)
+        return list(values) if self.is_list else values[0]
+
+
+@dataclass(frozen=True, slots=True)
+class ViewLayout:
+    """Precomputed field accessors of a dataclass at a fixed position in a record."""
+
+    datatype: type
+    fields: dict[str, Union[ValueAccessor, "ViewLayout", list["ViewLayout"]]]
+
+
+def _value_accessor(
+    fields: list[FieldLayout], is_list: bool, byte_order: ByteOrder
+) -> ValueAccessor:
+    """Builds the accessor of an elementary or bytes field, or of an elementary list."""
+
+    first = fields[0]
+    if first.tag == "x":
+        defaults = [pad_value(field.element) for field in fields]
+        return ValueAccessor(None, first.offset, is_list, defaults if is_list else defaults[0])
+    if not is_list:
+        return ValueAccessor(first.struct, first.offset, False, None)
+    pattern = byte_order.to_pattern() + first.tag * len(fields)
+    return ValueAccessor(Struct(pattern), first.offset, True, None)
+
+
+def _build_view_layout(
+    description: TypeTree, fields: Iterator[FieldLayout], byte_order: ByteOrder
+) -> ViewLayout:
+    """Builds the accessors of a structure, taking the layout of its fields from the field
+        layouts of the record in pattern order.
+
+    Returns:
+        ViewLayout: View layout with absolute offsets.
+    """
+
+    datatype = description["__struct_type__"]
+    if not isinstance(datatype, type):
+        raise TypeError("lost struct type information in description")
+    accessors: dict[str, ValueAccessor | ViewLayout | list[ViewLayout]] = {}
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        if isinstance(root_element, BasicParsingElement):
+            accessors[name] = _value_accessor([next(fields)], False, byte_order)
+        elif isinstance(root_element, list):
+            if not root_element:
+                accessors[name] = ValueAccessor(None, 0, True, [])
+                continue
+            sub_element = root_element[0]
+            # sub elements can only be a elementary data types or other dataclasses
+            if isinstance(sub_element, BasicParsingElement):
+                items = list(islice(fields, len(root_element)))
+                accessors[name] = _value_accessor(items, True, byte_order)
+            elif isinstance(sub_element, OrderedDict):
+                accessors[name] = [
+                    _build_view_layout(sub_element, fields, byte_order) for _ in root_element
+                ]
+            else:
+                raise TypeError(f"invalid list type found ({name})")
+        elif isinstance(root_element, OrderedDict):
+            accessors[name] = _build_view_layout(root_element, fields, byte_order)
+        else:
+            raise TypeError(f"invalid element type found ({name}: {type(root_element)})")
+
+    return ViewLayout(datatype, accessors)
+
+
+def view_layout(schema: CompiledSchema) -> ViewLayout:
+    """Returns the view layout of a compiled schema, deriving it on first use.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+
+    Returns:
+        ViewLayout: Field accessors of the dataclass.
+    """
+
+    if "view_layout" not in schema.derived:
+        schema.derived["view_layout"] = _build_view_layout(
+            schema.description, iter(data_layout(schema).values()), schema.byte_order
+        )
+    layout: ViewLayout = schema.derived["view_layout"]
+    return layout
+
+
+class LazyView(Generic[T]):
+    """A read-only view over a binary record of the class T that only decodes the fields which
+        are accessed. Nested dataclasses are returned as views as well, and materialize()
+        constructs the actual class T.
+
+    Args:
+        layout (ViewLayout): Field accessors of the dataclass.
+        buffer (Any): Bytes-like object containing the record.
+        offset (int): Position of the record in the buffer.
+        schema (CompiledSchema | None): Compiled schema of the record (None for nested views).
+    """
+
+    __slots__ = ("_layout", "_buffer", "_offset", "_schema")
+
+    def __init__(
+        self,
+        layout: ViewLayout,
+        buffer: Any,
+        offset: int = 0,
+        schema: CompiledSchema | None = None,
+    ) -> None:
+        self._layout = layout
+        self._buffer = buffer
+        self._offset = offset
+        self._schema = schema
+
+    @classmethod
+    def of(cls, schema: CompiledSchema, buffer: Any, offset: int = 0) -> LazyView[Any]:
+        """Creates a view over the record at offset in the buffer.
+
+        Args:
+            schema (CompiledSchema): Compiled schema of the record.
+            buffer (Any): Bytes-like object containing the record.
+            offset (int): Position of the record in the buffer.
+
+        Returns:
+            LazyView: View over the record.
+        """
+
+        return LazyView(view_layout(schema), buffer, offset, schema)
+
+    def __getattr__(self, name: str) -> Any:
+        # the slots are read directly, as they are unset while copy and pickle restore a view
+        layout: ViewLayout = object.__getattribute__(self, "_layout")
+        try:
+            accessor = layout.fields[name]
+        except KeyError as error:
+            raise AttributeError(
+                f"{layout.datatype.__name__} has no field named {name!r}"
+            ) from error
+        return self.__access(accessor)
+
+    def __access(self, accessor: ValueAccessor | ViewLayout | list[ViewLayout]) -> Any:
+        """Decodes a field, nested dataclasses are returned as views."""
+
+        if isinstance(accessor, ValueAccessor):
+            return accessor.decode(self._buffer, self._offset)
+        if isinstance(accessor, ViewLayout):
+            return LazyView(accessor, self._buffer, self._offset)
+        return [LazyView(layout, self._buffer, self._offset) for layout in accessor]
+
+    def materialize(self) -> T:
+        """Constructs the class T from the viewed record.
+
+        Returns:
+            T: Instantiated class T.
+        """
+
+        if self._schema is not None:
+            values = self._schema.struct.unpack_from(self._buffer, self._offset)
+            return self._schema.decoder(values)  # type: ignore[no-any-return]
+
+        cls_args: dict[str, Any] = {}
+        for name, accessor in self._layout.fields.items():
+            value = self.__access(accessor)
+            if isinstance(value, LazyView):
+                value = value.materialize()
+            elif isinstance(accessor, list):
+                value = [element.materialize() for element in value]
+            cls_args[name] = value
+        return self._layout.datatype(**cls_args)  # type: ignore[no-any-return]
+
+    def __copy__(self) -> LazyView[T]:
+        return LazyView(self._layout, self._buffer, self._offset, self._schema)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # layouts hold structs, which cannot be pickled: the record is pickled with its type
+        if self._schema is None:
+            raise TypeError(
+                f"nested views of {self._layout.datatype.__name__} cannot be pickled, pickle "
+                "the view of the whole record or the materialized object instead"
+            )
+        size = self._schema.struct.size
+        with memoryview(self._buffer) as view:
+            record = bytes(view[self._offset : self._offset + size])
+        return _restore_view, (self._schema.datatype, self._schema.byte_order, record)
+
+    def __repr__(self) -> str:
+        return f"LazyView[{self._layout.datatype.__name__}]"
+
+
+def _restore_view(datatype: type, byte_order: ByteOrder, record: bytes) -> LazyView[Any]:
+    """Unpickles a view over a copy of its record."""
+
+    return LazyView.of(get_schema(datatype, byte_order), record)
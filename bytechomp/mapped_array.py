@@ -0,0 +1,196 @@
+"""
+bytechomp.mapped_array
+"""
+
+from __future__ import annotations
+from typing import Any, Generic, TypeVar, Iterator, overload
+from dataclasses import is_dataclass
+from mmap import mmap, ACCESS_READ
+from os import PathLike
+from types import TracebackType
+import inspect
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import build_structure
+from bytechomp.decoder import Decoder
+from bytechomp.lazy_view import LazyView
+from bytechomp.schema import CompiledSchema, get_schema, require_fixed_size
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+ITER_CHUNK_RECORDS = 4096
+
+
+class MappedArray(Generic[T]):  # pylint: disable=too-many-instance-attributes
+    """A read-only, random access array of the fixed-size records of a binary file. The file is
+        memory mapped, so records are only decoded (and read from disk) when accessed.
+
+    Args:
+        Generic (T): The dataclass type that defines the binary protocol.
+        path (str | PathLike[str]): Path of the file of records.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        offset (int): Number of bytes to skip at the start of the file (e.g. a file header).
+        compiled (bool): Use a generated decoder specialized for T.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        byte_order: ByteOrder = ByteOrder.NATIVE,
+        offset: int = 0,
+        compiled: bool = True,
+    ) -> None:
+        self.__path = path
+        self.__byte_order = byte_order
+        self.__offset = offset
+        self.__compiled = compiled
+        self.__schema: CompiledSchema | None = None
+        self.__decoder: Decoder = self.__interpret
+        self.__map: mmap | None = None
+        self.__length = 0
+
+    def allocate(self) -> MappedArray[T]:
+        """Maps the file and allocates the array with the compiled schema of the type T.
+
+        Returns:
+            MappedArray: The allocated array.
+        """
+        # pylint: disable=no-member
+
+        datatype = self.__orig_class__.__args__[0]  # type: ignore
+
+        if not inspect.isclass(datatype) or not is_dataclass(datatype):
+            raise ValueError("generic datatype must be a dataclass")
+
+        self.__schema = require_fixed_size(get_schema(datatype, self.__byte_order))
+        self.__decoder = self.__schema.decoder if self.__compiled else self.__interpret
+
+        with open(self.__path, "rb") as file:
+            file.seek(0, 2)
+            file_size = file.tell()
+            if file_size > 0:
+                self.__map = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+        if self.__offset < 0 or self.__offset > file_size:
+            self.close()
+            raise ValueError(f"offset {self.__offset} is outside of the file ({file_size} bytes)")
+
+        # a trailing partial record is ignored, records without fields are not stored at all
+        size = self.__schema.struct.size
+        self.__length = (file_size - self.__offset) // size if size else 0
+        return self
+
+    def __interpret(self, values: Any) -> Any:
+        """Builds the class T by walking the type tree (used when the array is not compiled)."""
+
+        schema, _ = self.__mapped()
+        return build_structure(values, schema.description)
+
+    def __mapped(self) -> tuple[CompiledSchema, mmap | bytes]:
+        """Returns the schema and mapped file, making sure the array was allocated."""
+
+        if self.__schema is None:
+            raise RuntimeError("array must be allocated before use")
+        return self.__schema, self.__map if self.__map is not None else b""
+
+    def __len__(self) -> int:
+        """Returns the number of complete records in the file.
+
+        Returns:
+            int: Number of records.
+        """
+
+        return self.__length
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """Decodes the record(s) at the index or slice.
+
+        Args:
+            index (int | slice): Record index or slice of record indices.
+
+        Returns:
+            T | list[T]: Decoded record, or list of decoded records for a slice.
+        """
+
+        schema, buffer = self.__mapped()
+        struct = schema.struct
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.__length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.__decode_range(start, max(start, stop))
+
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("record index out of range")
+        return self.__decoder(  # type: ignore[no-any-return]
+            struct.unpack_from(buffer, self.__offset + index * struct.size)
+        )
+
+    def view(self, index: int) -> LazyView[T]:
+        """Returns a view over the record at the index that decodes fields only when accessed.
+            The view reads from the mapped file, so it must not outlive the array.
+
+        Args:
+            index (int): Record index.
+
+        Returns:
+            LazyView[T]: View over the record.
+        """
+
+        schema, buffer = self.__mapped()
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("record index out of range")
+        return LazyView.of(schema, buffer, self.__offset + index * schema.struct.size)
+
+    def __decode_range(self, start: int, stop: int) -> list[T]:
+        """Decodes the contiguous records [start, stop) in a single pass."""
+
+        schema, buffer = self.__mapped()
+        size = schema.struct.size
+        if stop <= start:
+            return []
+
+        decoder = self.__decoder
+        begin = self.__offset + start * size
+        with memoryview(buffer) as view, view[begin : begin + (stop - start) * size] as records:
+            return [decoder(values) for values in schema.struct.iter_unpack(records)]
+
+    def __iter__(self) -> Iterator[T]:
+        """Lazily decodes the records in order, a few thousand at a time.
+
+        Yields:
+            Iterator[T]: Decoded records.
+        """
+
+        for start in range(0, self.__length, ITER_CHUNK_RECORDS):
+            yield from self.__decode_range(start, min(start + ITER_CHUNK_RECORDS, self.__length))
+
+    def close(self) -> None:
+        """Unmaps the file."""
+
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__length = 0
+
+    def __enter__(self) -> MappedArray[T]:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,271 @@
+"""
+bytechomp.numpy_backend
+
+Optional NumPy support. NumPy is imported lazily so the core package keeps zero dependencies.
+"""
+
+from __future__ import annotations
+from typing import Any, Iterator
+from collections import OrderedDict
+from itertools import islice
+from types import ModuleType
+import importlib
+
+from bytechomp.basic_parsing_element import BasicParsingElement
+from bytechomp.byte_order import ByteOrder
+from bytechomp.checksum import fill_checksums
+from bytechomp.data_descriptor import TypeTree
+from bytechomp.layout import FieldLayout, data_layout
+from bytechomp.schema import CompiledSchema
+
+TAG_TO_DTYPE: dict[str, str] = {
+    "B": "u1",
+    "H": "u2",
+    "I": "u4",
+    "Q": "u8",
+    "b": "i1",
+    "h": "i2",
+    "i": "i4",
+    "q": "i8",
+    "e": "f2",
+    "f": "f4",
+    "d": "f8",
+}
+
+BYTE_ORDER_TO_DTYPE: dict[ByteOrder, str] = {
+    ByteOrder.NATIVE: "=",
+    ByteOrder.BIG: ">",
+    ByteOrder.LITTLE: "<",
+}
+
+
+def import_numpy() -> ModuleType:
+    """Imports NumPy, which is an optional dependency of bytechomp.
+
+    Returns:
+        ModuleType: The numpy module.
+    """
+
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as error:
+        raise ImportError("numpy must be installed to use the bytechomp numpy backend") from error
+
+
+def _element_format(element: BasicParsingElement, byte_order: ByteOrder) -> str:
+    """Returns the numpy format string of a basic element."""
+
+    if element.parsing_type is bytes:
+        return f"S{element.length}"
+    return BYTE_ORDER_TO_DTYPE[byte_order] + TAG_TO_DTYPE[element.parser_tag]
+
+
+def _elementary_field(
+    name: str, element: Any, fields: Iterator[FieldLayout], byte_order: ByteOrder, offset: int
+) -> tuple[Any, int | None, int]:
+    """Builds the numpy dtype format of an elementary or bytes field, or of an elementary list.
+
+    Returns:
+        tuple[Any, int | None, int]: (dtype format or None for pad bytes, start offset or None
+            for an empty list, end offset)
+    """
+
+    if isinstance(element, BasicParsingElement):
+        items = [next(fields)]
+    elif isinstance(element, list) and all(
+        isinstance(item, BasicParsingElement) for item in element
+    ):
+        if not element:
+            return None, None, offset
+        items = list(islice(fields, len(element)))
+    elif isinstance(element, list):
+        raise TypeError(f"invalid list type found ({name})")
+    else:
+        raise TypeError(f"invalid element type found ({name}: {type(element)})")
+
+    dtype_format: Any = None
+    # pad bytes are left as gaps in the dtype
+    if items[0].tag != "x":
+        dtype_format = _element_format(items[0].element, byte_order)
+        if isinstance(element, list):
+            dtype_format = (dtype_format, (len(items),))
+    return dtype_format, items[0].offset, items[-1].offset + items[-1].size
+
+
+def _structure_fields(
+    description: TypeTree, fields: Iterator[FieldLayout], byte_order: ByteOrder, offset: int
+) -> tuple[dict[str, list[Any]], int, int]:
+    """Builds the numpy dtype fields of a structure, taking the layout of its fields from the
+        field layouts of the record in pattern order. offset is the end of the preceding field.
+
+    Returns:
+        tuple[dict[str, list[Any]], int, int]: (dtype specification with absolute offsets, start
+            offset, end offset)
+    """
+
+    spec: dict[str, list[Any]] = {"names": [], "formats": [], "offsets": []}
+    start: int | None = None
+    end = offset
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        first: int | None
+        if isinstance(root_element, OrderedDict):
+            sub_spec, first, end = _structure_fields(root_element, fields, byte_order, end)
+            dtype_format = _relative_dtype(sub_spec, first, end - first)
+        elif (
+            isinstance(root_element, list)
+            and root_element
+            and isinstance(root_element[0], OrderedDict)
+        ):
+            sub_dtype, first, end = _list_dtype(name, root_element, fields, byte_order, end)
+            dtype_format = (sub_dtype, (len(root_element),))
+        else:
+            dtype_format, first, end = _elementary_field(
+                name, root_element, fields, byte_order, end
+            )
+
+        if first is None:
+            continue
+        if start is None:
+            start = first
+        if dtype_format is not None:
+            spec["names"].append(name)
+            spec["formats"].append(dtype_format)
+            spec["offsets"].append(first)
+
+    return spec, end if start is None else start, end
+
+
+def _relative_dtype(spec: dict[str, list[Any]], start: int, itemsize: int) -> Any:
+    """Builds a nested numpy dtype with offsets relative to the start of the structure."""
+
+    numpy = import_numpy()
+    return numpy.dtype(
+        {
+            "names": spec["names"],
+            "formats": spec["formats"],
+            "offsets": [offset - start for offset in spec["offsets"]],
+            "itemsize": itemsize,
+        }
+    )
+
+
+def _list_dtype(
+    name: str,
+    elements: list[TypeTree],
+    fields: Iterator[FieldLayout],
+    byte_order: ByteOrder,
+    offset: int,
+) -> tuple[Any, int, int]:
+    """Builds the numpy subarray element dtype of a list of structures.
+
+    Returns:
+        tuple[Any, int, int]: (element dtype, start offset, end offset)
+    """
+
+    specs: list[dict[str, list[Any]]] = []
+    starts: list[int] = []
+    end = offset
+    for element in elements:
+        spec, start, end = _structure_fields(element, fields, byte_order, end)
+        specs.append(spec)
+        starts.append(start)
+
+    strides = {second - first for first, second in zip(starts, starts[1:])}
+    if len(strides) > 1:
+        raise TypeError(f"list elements are not evenly spaced and cannot be a subarray ({name})")
+    stride = strides.pop() if strides else end - starts[0]
+
+    return _relative_dtype(specs[0], starts[0], stride), starts[0], end
+
+
+def build_numpy_dtype(
+    description: TypeTree, layout: dict[str, FieldLayout], byte_order: ByteOrder, itemsize: int
+) -> Any:
+    """Derives a numpy structured dtype matching the struct layout of the described dataclass.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        layout (dict[str, FieldLayout]): Field layout of the dataclass (see build_data_layout).
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        itemsize (int): Size of a record in bytes (the struct size).
+
+    Returns:
+        numpy.dtype: Structured dtype of a single record.
+    """
+
+    spec, _, _ = _structure_fields(description, iter(layout.values()), byte_order, 0)
+    return _relative_dtype(spec, 0, itemsize)
+
+
+def numpy_dtype(schema: CompiledSchema) -> Any:
+    """Returns the numpy structured dtype of a compiled schema, deriving it on first use.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+
+    Returns:
+        numpy.dtype: Structured dtype of a single record.
+    """
+
+    if "numpy_dtype" not in schema.derived:
+        schema.derived["numpy_dtype"] = build_numpy_dtype(
+            schema.description, data_layout(schema), schema.byte_order, schema.struct.size
+        )
+    return schema.derived["numpy_dtype"]
+
+
+def records_to_numpy(schema: CompiledSchema, buffer: Any) -> Any:
+    """Views the complete records in the buffer as a numpy structured array without copying.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+        buffer (Any): Bytes-like object of back to back records.
+
+    Returns:
+        numpy.ndarray: Structured array of the records (a trailing partial record is ignored).
+    """
+
+    numpy = import_numpy()
+    with memoryview(buffer) as view:
+        count = view.nbytes // schema.struct.size if schema.struct.size else 0
+    return numpy.frombuffer(buffer, dtype=numpy_dtype(schema), count=count)
+
+
+def numpy_to_records(schema: CompiledSchema, array: Any) -> bytes:
+    """Serializes a numpy structured array into back to back records.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+        array (numpy.ndarray): Structured array with the fields of the dataclass.
+
+    Returns:
+        bytes: Serialized records, with their checksum fields filled in.
+    """
+
+    numpy = import_numpy()
+    dtype = numpy_dtype(schema)
+    if array.dtype == dtype:
+        records = numpy.ascontiguousarray(array)
+    else:
+        unknown = set(array.dtype.names or ()) - set(dtype.names)
+        if array.dtype.names is None or unknown:
+            raise TypeError(f"array fields do not match the dataclass fields ({sorted(unknown)})")
+
+        # fields are copied by name, missing fields, pad bytes and alignment gaps are zero filled
+        records = numpy.zeros(array.shape, dtype=dtype)
+        for name in array.dtype.names:
+            records[name] = array[name]
+
+    if not schema.checksums:
+        return bytes(records.tobytes())
+
+    # checksum fields are computed from the serialized records, whatever the array holds
+    buffer = bytearray(records.tobytes())
+    size = schema.struct.size
+    for offset in range(0, len(buffer), size):
+        fill_checksums(schema.checksums, buffer, offset, (0, size))
+    return bytes(buffer)
@@ -0,0 +1,203 @@
+"""
+bytechomp.parallel
+"""
+
+from __future__ import annotations
+from typing import Any, Iterator, NamedTuple, TypeVar
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import is_dataclass
+from itertools import chain
+from mmap import mmap, ACCESS_READ
+from os import PathLike, cpu_count, fspath
+import inspect
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.columns import Columns, build_columns
+from bytechomp.data_descriptor import build_structure
+from bytechomp.schema import get_schema, require_fixed_size
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+# records decoded per task, large enough to amortize the mapping and pickling of a batch
+DEFAULT_BATCH_RECORDS = 64 * 1024
+# inputs smaller than this are decoded in-process, where starting workers would cost more
+DEFAULT_MIN_PARALLEL_BYTES = 16 * 1024 * 1024
+# batches in flight per worker, bounding the decoded results waiting to be consumed
+PREFETCH_PER_WORKER = 2
+
+
+class _Batch(NamedTuple):
+    """A contiguous range of records of a file, decoded by a single task."""
+
+    path: str
+    datatype: type
+    byte_order: ByteOrder
+    start: int
+    stop: int
+    compiled: bool
+    columnar: bool
+
+
+def _decode_batch(batch: _Batch) -> list[Any] | Columns:
+    """Maps the file and decodes the records of a batch (runs in the worker processes, where the
+        schema is fetched from the per-process schema cache).
+
+    Args:
+        batch (_Batch): Range of records to decode.
+
+    Returns:
+        list[Any] | Columns: Decoded records, or their columns for a columnar batch.
+    """
+
+    schema = get_schema(batch.datatype, batch.byte_order)
+    struct = schema.struct
+
+    with open(batch.path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+        with memoryview(mapped) as view, view[batch.start : batch.stop] as records:
+            if batch.columnar:
+                values = list(chain.from_iterable(struct.iter_unpack(records)))
+                return build_columns(schema, values)
+            if batch.compiled:
+                decoder = schema.decoder
+                return [decoder(values) for values in struct.iter_unpack(records)]
+            description = schema.description
+            return [build_structure(values, description) for values in struct.iter_unpack(records)]
+
+
+def _record_ranges(
+    path: str, datatype: type, byte_order: ByteOrder, offset: int, batch_records: int
+) -> list[tuple[int, int]]:
+    """Splits the records of a file on record boundaries into (start, stop) byte ranges."""
+
+    if not inspect.isclass(datatype) or not is_dataclass(datatype):
+        raise ValueError("datatype must be a dataclass")
+    if batch_records <= 0:
+        raise ValueError("batch_records must be positive")
+
+    size = require_fixed_size(get_schema(datatype, byte_order)).struct.size
+    with open(path, "rb") as file:
+        file.seek(0, 2)
+        file_size = file.tell()
+
+    if offset < 0 or offset > file_size:
+        raise ValueError(f"offset {offset} is outside of the file ({file_size} bytes)")
+
+    if size == 0:
+        # records without fields are not stored at all
+        return []
+
+    # a trailing partial record is ignored
+    end = offset + (file_size - offset) // size * size
+    step = batch_records * size
+    return [(start, min(start + step, end)) for start in range(offset, end, step)]
+
+
+def _run(batches: list[_Batch], workers: int | None, min_parallel_bytes: int) -> Iterator[Any]:
+    """Decodes the batches in order, in worker processes unless the input is small.
+
+    Yields:
+        Iterator[Any]: Decoded batches, in file order.
+    """
+
+    if workers is None:
+        workers = cpu_count() or 1
+    total = sum(batch.stop - batch.start for batch in batches)
+    if workers <= 1 or len(batches) <= 1 or total < min_parallel_bytes:
+        for batch in batches:
+            yield _decode_batch(batch)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: deque[Future[Any]] = deque()
+        for batch in batches:
+            pending.append(executor.submit(_decode_batch, batch))
+            if len(pending) >= workers * PREFETCH_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # also reached when the consumer stops iterating early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def decode_file(  # pylint: disable=too-many-arguments
+    path: str | PathLike[str],
+    datatype: type[T],
+    *,
+    workers: int | None = 1,
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    offset: int = 0,
+    compiled: bool = True,
+    batch_records: int = DEFAULT_BATCH_RECORDS,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> Iterator[T]:
+    """Decodes a file of back to back fixed-size records, memory mapped batch by batch, and
+        yields the records in file order. The file is decoded in-process by default: with
+        workers, every decoded record is pickled by a worker and unpickled by this process,
+        which costs more than decoding it, so worker processes only pay off for expensive
+        records and multi-core consumers should prefer decode_file_columns.
+
+    Args:
+        path (str | PathLike[str]): Path of the file of records.
+        datatype (type[T]): Dataclass type that defines the binary protocol. It must be
+            importable by the workers (defined at module level).
+        workers (int | None): Number of worker processes (the number of CPUs when None). The
+            file is decoded in-process with a single worker or when it is small.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        offset (int): Number of bytes to skip at the start of the file (e.g. a file header).
+        compiled (bool): Use a generated decoder specialized for T.
+        batch_records (int): Number of records decoded per batch.
+        min_parallel_bytes (int): Files with fewer bytes of records are decoded in-process.
+
+    Returns:
+        Iterator[T]: Decoded records, in file order.
+    """
+
+    path = fspath(path)
+    batches = [
+        _Batch(path, datatype, byte_order, start, stop, compiled, False)
+        for start, stop in _record_ranges(path, datatype, byte_order, offset, batch_records)
+    ]
+    return chain.from_iterable(_run(batches, workers, min_parallel_bytes))
+
+
+def decode_file_columns(  # pylint: disable=too-many-arguments
+    path: str | PathLike[str],
+    datatype: type,
+    *,
+    workers: int | None = None,
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    offset: int = 0,
+    batch_records: int = DEFAULT_BATCH_RECORDS,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> Iterator[Columns]:
+    """Decodes a file of back to back fixed-size records into columnar batches with a pool of
+        worker processes. The file is split into batches on record boundaries, every worker maps
+        the file and decodes its batches, and the batches are yielded in file order. Columns of
+        array.array are sent back from the workers as a few buffers, which makes this the
+        parallel path of bytechomp.parallel (see decode_file).
+
+    Args:
+        path (str | PathLike[str]): Path of the file of records.
+        datatype (type): Dataclass type that defines the binary protocol. It must be importable
+            by the workers (defined at module level).
+        workers (int | None): Number of worker processes (the number of CPUs when None). The
+            file is decoded in-process with a single worker or when it is small.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        offset (int): Number of bytes to skip at the start of the file (e.g. a file header).
+        batch_records (int): Number of records per batch.
+        min_parallel_bytes (int): Files with fewer bytes of records are decoded in-process.
+
+    Returns:
+        Iterator[Columns]: Field path to an array.array of the values of every record of a
+            batch (a list for bytes fields), batches in file order.
+    """
+
+    path = fspath(path)
+    batches = [
+        _Batch(path, datatype, byte_order, start, stop, True, True)
+        for start, stop in _record_ranges(path, datatype, byte_order, offset, batch_records)
+    ]
+    return _run(batches, workers, min_parallel_bytes)
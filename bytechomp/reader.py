@@ -3,37 +3,113 @@ bytechomp.reader
 """
 
 from __future__ import annotations
-from typing import Generic, TypeVar, Iterable, Iterator, cast
+from typing import Any, Generic, TypeVar, Iterable, Iterator, Sequence, cast
 from dataclasses import is_dataclass
-from collections import OrderedDict
 from struct import Struct
+from itertools import chain
 import inspect
 
 from bytechomp.byte_order import ByteOrder
-from bytechomp.data_descriptor import (
-    build_data_description,
-    build_data_pattern,
-    build_structure,
-    TypeTree,
+from bytechomp.data_descriptor import build_structure
+from bytechomp.checksum import ChecksumError, ChecksumField
+from bytechomp.decoder import Decoder
+from bytechomp.framing import Framing
+from bytechomp.lazy_view import LazyView
+from bytechomp.layout import FieldLayout, data_layout
+from bytechomp.columns import Columns, build_columns
+from bytechomp.numpy_backend import records_to_numpy
+from bytechomp.schema import (
+    CompiledSchema,
+    Schema,
+    get_schema,
+    require_fixed_size,
+    decoder_variant,
 )
+from bytechomp.representation import DEFAULT_REPRESENTATIONS, ListRepresentation, Representation
+from bytechomp.segments import SegmentScanner
+from bytechomp.stream_buffer import StreamBuffer
 
 T = TypeVar("T")  # pylint: disable=invalid-name
 
+_EMPTY_STRUCT = Struct("")
 
-class Reader(Generic[T]):
+
+class Reader(StreamBuffer, Generic[T]):  # pylint: disable=too-many-instance-attributes
     """A binary protocol reader.
 
     Args:
         Generic (T): The dataclass type that defines the binary protocol.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        compiled (bool): Use a generated decoder specialized for T. Setting this to False falls
+            back to walking the type tree on every build, which is slower but easier to debug.
+        framing (Framing | None): Framing strategy of the byte stream (e.g. LengthPrefixed(U32)),
+            None when messages are sent back to back.
+        skip_invalid (bool): Skip messages whose checksum fields do not match instead of raising
+            a ChecksumError (both are counted in invalid_checksums).
+        strict (bool): Check the type of every decoded value. The struct module can only
+            produce values of the declared types, which is proven when the schema is compiled,
+            so this never fails on received data. It is a debugging aid only.
+        representation (Representation): Type of the decoded messages and nested dataclasses:
+            T itself, or a slots dataclass variant, namedtuple or tuple using less memory
+            (requires a compiled reader).
+        lists (ListRepresentation): Type of the decoded list fields: list, tuple or array.array
+            (requires a compiled reader).
     """
 
-    def __init__(self, byte_order: ByteOrder = ByteOrder.NATIVE) -> None:
-        self.__datatype: type | None = None
+    # a reader is a cursor over a shared schema, without a per-instance __dict__
+    __slots__ = (
+        "__orig_class__",
+        "__byte_order",
+        "__compiled",
+        "__strict",
+        "__representation",
+        "__lists",
+        "__struct",
+        "__decoder",
+        "__schema",
+        "__scanner",
+        "__framing",
+        "__pending",
+        "__dropped_frames",
+        "__checksums",
+        "__record_starts",
+        "__skip_invalid",
+        "__invalid_checksums",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        byte_order: ByteOrder = ByteOrder.NATIVE,
+        compiled: bool = True,
+        *,
+        framing: Framing | None = None,
+        skip_invalid: bool = False,
+        strict: bool = False,
+        representation: Representation = Representation.DATACLASS,
+        lists: ListRepresentation = ListRepresentation.LIST,
+    ) -> None:
+        if not compiled and (representation, lists) != DEFAULT_REPRESENTATIONS:
+            raise ValueError("compact representations require a compiled reader")
+
+        super().__init__()
         self.__byte_order = byte_order
-        self.__data: bytes = b""
-        self.__data_description: TypeTree = OrderedDict()
-        self.__data_pattern: str = ""
-        self.__struct = Struct(self.__data_pattern)
+        self.__compiled = compiled
+        self.__strict = strict
+        self.__representation = representation
+        self.__lists = lists
+        self.__struct = _EMPTY_STRUCT
+        self.__decoder: Decoder = self.__interpret
+        self.__schema: CompiledSchema | None = None
+        # progress on the next message of a dataclass with variable length fields
+        self.__scanner: SegmentScanner | None = None
+        # decoded values and frame size of the next message of a framed stream
+        self.__framing = framing
+        self.__pending: tuple[Sequence[Any], int] | None = None
+        self.__dropped_frames = 0
+        self.__checksums: tuple[ChecksumField, ...] = ()
+        self.__record_starts: tuple[int, int] = (0, 0)
+        self.__skip_invalid = skip_invalid
+        self.__invalid_checksums = 0
 
     def allocate(self) -> Reader[T]:
         """Allocates the reader with a tokenized description of the protocol defined by the type T.
@@ -43,52 +119,131 @@ class Reader(Generic[T]):
         """
         # pylint: disable=no-member
 
-        self.__datatype = self.__orig_class__.__args__[0]  # type: ignore
+        datatype = self.__orig_class__.__args__[0]  # type: ignore
 
-        if (
-            not inspect.isclass(self.__datatype)
-            or not is_dataclass(self.__datatype)
-            or self.__datatype is None
-        ):
+        if not inspect.isclass(datatype) or not is_dataclass(datatype) or datatype is None:
             raise ValueError("generic datatype must be a dataclass")
 
-        # verify that the datatype contains only known types
-        self.__data_description = build_data_description(self.__datatype)
-        # print(self.__data_description)
+        # fetch (or build) the schema shared by every reader of this datatype and byte order
+        self.__bind(get_schema(datatype, self.__byte_order))
+        return self
+
+    @classmethod
+    def of(  # pylint: disable=too-many-arguments
+        cls,
+        schema: Schema[T],
+        compiled: bool = True,
+        *,
+        framing: Framing | None = None,
+        skip_invalid: bool = False,
+        strict: bool = False,
+        representation: Representation = Representation.DATACLASS,
+        lists: ListRepresentation = ListRepresentation.LIST,
+    ) -> Reader[T]:
+        """Creates an allocated reader over a shared schema, without repeating the reflection of
+            allocate(). The reader only owns its buffer, so one reader should be created per
+            thread or connection while the schema is shared.
+
+        Args:
+            schema (Schema[T]): Allocated schema of the dataclass T.
+            compiled (bool): Use a generated decoder specialized for T.
+            framing (Framing | None): Framing strategy of the byte stream.
+            skip_invalid (bool): Skip messages whose checksum fields do not match.
+            strict (bool): Check the type of every decoded value.
+            representation (Representation): Type of the decoded messages.
+            lists (ListRepresentation): Type of the decoded list fields.
+
+        Returns:
+            Reader[T]: The allocated binary protocol reader.
+        """
 
-        # build struct parsing pattern from the description
-        self.__data_pattern = self.__byte_order.to_pattern() + build_data_pattern(
-            self.__data_description
+        reader = cls(
+            schema.byte_order,
+            compiled,
+            framing=framing,
+            skip_invalid=skip_invalid,
+            strict=strict,
+            representation=representation,
+            lists=lists,
         )
-        # print(self.__data_pattern)
+        reader.__bind(schema.compiled)
+        return reader
+
+    def __bind(self, schema: CompiledSchema) -> None:
+        """Points the reader at a compiled schema."""
+
+        self.__schema = schema
+        self.__struct = schema.struct
+        if not self.__compiled:
+            self.__decoder = self.__interpret
+        else:
+            self.__decoder = decoder_variant(
+                schema, self.__strict, self.__representation, self.__lists
+            )
+        self.__scanner = SegmentScanner(schema.segments) if schema.segments is not None else None
+        self.__checksums = schema.checksums
+        self.__record_starts = (0, schema.struct.size)
 
-        # create struct from this pattern
-        self.__struct = Struct(self.__data_pattern)
-        # print(self.__struct.size)
+    def __interpret(self, values: Sequence[Any]) -> Any:
+        """Builds the class T by walking the type tree (used when the reader is not compiled)."""
 
-        return self
+        return build_structure(values, self.__allocated().description, self.__strict)
 
-    def feed(self, data: bytes) -> None:
-        """Add binary data to the internal buffer.
+    def __allocated(self) -> CompiledSchema:
+        """Returns the compiled schema, making sure the reader was allocated."""
 
-        Args:
-            data (bytes): Binary data.
+        if self.__schema is None:
+            raise RuntimeError("reader must be allocated before use")
+        return self.__schema
+
+    def __records(self) -> CompiledSchema:
+        """Returns the compiled schema, making sure the buffer holds back to back records of a
+        fixed size."""
+
+        if self.__framing is not None:
+            raise TypeError("the buffer of a framed reader does not hold back to back records")
+        return require_fixed_size(self.__allocated())
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes needed to construct the class T.
+
+        Returns:
+            int: Size of a single message in bytes.
         """
 
-        self.__data += data
+        if self.__schema is not None:
+            require_fixed_size(self.__schema)
+        return self.__struct.size
+
+    @property
+    def layout(self) -> dict[str, FieldLayout]:
+        """Returns the byte offset, size and struct code of every field of the class T, keyed by
+            field path (e.g. "header.length" or "points[2].x").
 
-    def __lshift__(self, data: bytes) -> Reader[T]:
-        """Alternative to the feed method.
+        Returns:
+            dict[str, FieldLayout]: Field path to layout, in pattern order.
+        """
+
+        return data_layout(require_fixed_size(self.__allocated()))
+
+    def peek(self, field_path: str) -> int | float | bytes | None:
+        """Decodes a single field of the next message in the internal buffer without consuming
+            or building anything (e.g. to dispatch on a message type).
 
         Args:
-            data (bytes): Binary data
+            field_path (str): Path of the field (see the layout property).
 
         Returns:
-            Reader[T]: Binary protocol reader.
+            Optional[int | float | bytes]: Value of the field if the internal buffer holds enough
+                data to contain it, otherwise None.
         """
 
-        self.feed(data)
-        return self
+        self.__records()
+        field = self.layout[field_path]
+        if len(self._data) - self._offset < field.offset + field.size:
+            return None
+        return field.read(self._data, self._offset)
 
     def is_complete(self) -> bool:
         """Tests if the internal buffer contains enough data to construct the class T.
@@ -97,7 +252,12 @@ class Reader(Generic[T]):
             bool: True if the internal buffer is sufficiently large.
         """
 
-        return len(self.__data) >= self.__struct.size
+        if self.__framing is not None:
+            return self.__next_frame()
+        if self.__scanner is not None:
+            # decodes the segments received so far, which build() then reuses
+            return self.__scanner.scan(self._data, self._offset, len(self._data) - self._offset)
+        return len(self._data) - self._offset >= self.__struct.size
 
     def __bool__(self) -> bool:
         """Alternative to the is_complete method.
@@ -108,14 +268,108 @@ class Reader(Generic[T]):
 
         return self.is_complete()
 
-    def __len__(self) -> int:
-        """Returns the size of the internal buffer.
+    @property
+    def dropped_frames(self) -> int:
+        """Returns the number of frames discarded because they did not hold exactly one message.
+
+        Returns:
+            int: Number of dropped frames.
+        """
+
+        return self.__dropped_frames
+
+    @property
+    def invalid_checksums(self) -> int:
+        """Returns the number of messages whose checksum fields did not match.
+
+        Returns:
+            int: Number of invalid messages.
+        """
+
+        return self.__invalid_checksums
+
+    def __next_frame(self) -> bool:
+        """Decodes the next valid frame of a framed stream ahead of build(). Bytes preceding the
+            frame and frames that do not hold exactly one message are discarded.
+
+        Returns:
+            bool: True if the next message is decoded.
+        """
+
+        if self.__pending is not None:
+            return True
+
+        framing = cast(Framing, self.__framing)
+        while True:
+            resync, frame = framing.find(self._data, self._offset, self.__byte_order)
+            if resync > self._offset:
+                self._consume(resync - self._offset)
+                continue
+            if frame is None:
+                return False
+
+            start, stop, end, _ = frame
+            available = frame.bound(len(self._data)) - start
+            starts: Sequence[int] = ()
+            if self.__scanner is not None:
+                complete = self.__scanner.scan(self._data, start, available)
+                values, size, starts = self.__scanner.take() if complete else ((), 0, ())
+            else:
+                size = self.__struct.size
+                complete = available >= size
+                values = self.__struct.unpack_from(self._data, start) if complete else ()
+
+            if stop is None:
+                if not complete:
+                    return False
+                end = start + size
+            elif not complete or start + size != stop:
+                # resynchronize on the next frame
+                if self.__scanner is not None:
+                    self.__scanner.reset()
+                self.__dropped_frames += 1
+                self._consume(cast(int, end) - self._offset)
+                continue
+
+            frame_size = cast(int, end) - self._offset
+            if self.__checksums and not self.__verified(
+                start, starts or (0, size), values, frame_size
+            ):
+                continue
+
+            self.__pending = (values, frame_size)
+            return True
+
+    def __verified(
+        self, base: int, starts: Sequence[int], values: Sequence[Any], size: int
+    ) -> bool:
+        """Verifies the checksum fields of a decoded message. An invalid message is consumed and
+            counted, then skipped or reported with a ChecksumError.
+
+        Args:
+            base (int): Position of the message in the internal buffer.
+            starts (Sequence[int]): Segment starts of the message, followed by its size.
+            values (Sequence[Any]): Flat values decoded from the message.
+            size (int): Number of bytes to consume for an invalid message.
 
         Returns:
-            int: Size of internal buffer.
+            bool: True if every checksum matches.
         """
 
-        return len(self.__data)
+        with memoryview(self._data) as view:
+            invalid = [
+                checksum.name
+                for checksum in self.__checksums
+                if not checksum.verify(view, base, starts, values)
+            ]
+        if not invalid:
+            return True
+
+        self.__invalid_checksums += 1
+        self._consume(size)
+        if not self.__skip_invalid:
+            raise ChecksumError(f"invalid checksum in field {invalid[0]}")
+        return False
 
     def build(self) -> T | None:
         """Constructs the class T from the binary data collected in the internal buffer.
@@ -124,48 +378,158 @@ class Reader(Generic[T]):
             Optional[T]: Instantiated class T if the internal buffer is sufficiently large,
                 otherwise None.
         """
+        values: Sequence[Any]
+        starts: Sequence[int]
+        if self.__framing is not None:
+            if not self.__next_frame():
+                return None
+            values, size = cast(tuple[Sequence[Any], int], self.__pending)
+            self.__pending = None
+            self._consume(size)
+            return cast(T, self.__decoder(values))
+
+        while self.is_complete():
+            if self.__scanner is not None:
+                values, size, starts = self.__scanner.take()
+            else:
+                values = self.__struct.unpack_from(self._data, self._offset)
+                size, starts = self.__struct.size, self.__record_starts
+            if self.__checksums and not self.__verified(self._offset, starts, values, size):
+                continue
+            self._consume(size)
+            return cast(T, self.__decoder(values))
+        return None
+
+    def view(self) -> LazyView[T] | None:
+        """Takes the next message from the internal buffer without decoding it. Fields of the
+            returned view are only decoded when accessed, and view.materialize() constructs the
+            class T.
+
+        Returns:
+            Optional[LazyView[T]]: View over the message if the internal buffer is sufficiently
+                large, otherwise None.
+        """
+
+        schema = self.__records()
         if self.is_complete():
-            struct_bytes = self.__data[: self.__struct.size]
-            self.__data = self.__data[self.__struct.size :]
-            # print(f"unpacked: {self.__struct.unpack(struct_bytes)}")
-            return cast(
-                T,
-                build_structure(list(self.__struct.unpack(struct_bytes)), self.__data_description),
-            )
+            size = schema.struct.size
+            record = bytes(self._data[self._offset : self._offset + size])
+            self._consume(size)
+            return LazyView.of(schema, record)
         return None
 
-    def iter(self, byte_iterator: Iterable[bytes]) -> Iterator[T]:
+    def build_many(self, max_count: int | None = None) -> list[T]:
+        """Constructs every complete class T available in the internal buffer in a single pass.
+            Any trailing partial message is left in the buffer.
+
+        Args:
+            max_count (int | None): Maximum number of messages to build (all when None).
+
+        Returns:
+            list[T]: Instantiated classes in the order they were received.
+        """
+
+        if self.__scanner is not None or self.__framing is not None or self.__checksums:
+            return self.__build_each(max_count)
+
+        size = self.__struct.size
+        if size == 0:
+            # a message without fields is always complete, a single one is built per call
+            return [self.__decoder(()) for _ in range(1 if max_count is None else max_count)]
+
+        count = (len(self._data) - self._offset) // size
+        if max_count is not None:
+            count = min(count, max_count)
+        if count <= 0:
+            return []
+
+        decoder = self.__decoder
+        end = self._offset + count * size
+        with memoryview(self._data) as view, view[self._offset : end] as records:
+            messages = [decoder(values) for values in self.__struct.iter_unpack(records)]
+        self._consume(count * size)
+        return messages
+
+    def build_columns(self, max_count: int | None = None) -> Columns:
+        """Decodes every complete message in the internal buffer into columns instead of
+            constructing the class T per message. Any trailing partial message is left in the
+            buffer.
+
+        Args:
+            max_count (int | None): Maximum number of messages to decode (all when None).
+
+        Returns:
+            Columns: Field path (e.g. "header.length" or "points[2].x") to an array.array of
+                the values of every message (a list for bytes fields).
+        """
+
+        schema = self.__records()
+
+        size = self.__struct.size
+        if size == 0:
+            # messages without fields have no columns
+            return build_columns(schema, [])
+
+        count = (len(self._data) - self._offset) // size
+        if max_count is not None:
+            count = max(min(count, max_count), 0)
+
+        end = self._offset + count * size
+        with memoryview(self._data) as view, view[self._offset : end] as records:
+            values = list(chain.from_iterable(self.__struct.iter_unpack(records)))
+        self._consume(count * size)
+        return build_columns(schema, values)
+
+    def __build_each(self, max_count: int | None) -> list[T]:
+        """Constructs the complete messages one after the other (used by build_many when messages
+        are framed, have variable length fields or checksums)."""
+
+        messages: list[T] = []
+        while max_count is None or len(messages) < max_count:
+            message = self.build()
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    def iter(self, byte_iterator: Iterable[bytes], flush: bool = False) -> Iterator[T]:
         """Allows the reader to use a stream of bytes to yield the constructed dataclasses as an
-            iterator.
+            iterator. Every complete message is yielded as soon as the chunk completing it arrives.
 
         Args:
             byte_iterator (Iterable[bytes]): Byte stream.
+            flush (bool): Once the byte stream is exhausted, also yield any complete messages
+                still in the internal buffer (e.g. data fed to the reader during iteration).
 
         Yields:
             Iterator[T]: Yielded dataclass iterator.
         """
 
         for chunk in byte_iterator:
-            self.__data += chunk
-            if self.is_complete():
-                struct_bytes = self.__data[: self.__struct.size]
-                self.__data = self.__data[self.__struct.size :]
-                yield build_structure(
-                    list(self.__struct.unpack(struct_bytes)), self.__data_description
-                )
+            self.feed(chunk)
+            yield from self.build_many()
 
-    def clear(self) -> None:
-        """Clears the data in the internal buffer."""
+        if flush:
+            yield from self.build_many()
 
-        self.__data = b""
+    def to_numpy(self, buffer: bytes | bytearray | memoryview) -> Any:
+        """Decodes the records in the buffer into a numpy structured array without copying. The
+            dtype mirrors T, with nested dataclasses as nested fields and lists as subarrays
+            (requires numpy to be installed).
 
-    def export(self) -> bytes:
-        """Exports the data from the internal buffer.
+        Args:
+            buffer (bytes | bytearray | memoryview): Back to back binary records of T.
 
         Returns:
-            bytes: All bytes contained in the internal buffer
+            numpy.ndarray: Structured array of the complete records in the buffer.
         """
 
-        data = self.__data
-        self.__data = b""
-        return data
+        return records_to_numpy(require_fixed_size(self.__allocated()), buffer)
+
+    def clear(self) -> None:
+        """Clears the data in the internal buffer."""
+
+        super().clear()
+        if self.__scanner is not None:
+            self.__scanner.reset()
+        self.__pending = None
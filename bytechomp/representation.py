@@ -0,0 +1,126 @@
+"""
+bytechomp.representation
+"""
+
+from __future__ import annotations
+from typing import Any
+from collections import namedtuple
+from dataclasses import field, fields, make_dataclass
+from enum import Enum
+from threading import Lock
+from weakref import WeakKeyDictionary, ref
+
+
+class Representation(Enum):
+    """Strict enumerations for the type of the decoded messages (nested dataclasses included)."""
+
+    DATACLASS = 1  # the dataclass itself
+    SLOTS = 2  # a slots=True variant of the dataclass, without a per-instance __dict__
+    NAMEDTUPLE = 3  # a namedtuple with the fields of the dataclass
+    TUPLE = 4  # a plain tuple of the field values
+
+
+class ListRepresentation(Enum):
+    """Strict enumerations for the type of the decoded list fields."""
+
+    LIST = 1
+    TUPLE = 2
+    ARRAY = 3  # array.array for lists of numbers, tuples for other lists
+
+
+# the dataclasses and lists themselves (compared as a tuple, enum member lookups are slow)
+DEFAULT_REPRESENTATIONS = (Representation.DATACLASS, ListRepresentation.LIST)
+
+_COMPACT_TYPES: WeakKeyDictionary[type, dict[Representation, type]] = WeakKeyDictionary()
+_COMPACT_TYPES_LOCK = Lock()
+
+
+def _rebuild(datatype: type, representation: Representation, values: dict[str, Any]) -> Any:
+    """Unpickles a message of a derived type, which is derived again from its dataclass."""
+
+    return compact_type(datatype, representation)(**values)
+
+
+def _namedtuple(name: str, names: list[str]) -> type:
+    """Creates a namedtuple with the fields of a dataclass."""
+
+    return namedtuple(name, names)
+
+
+def _slots_dataclass(datatype: type, name: str) -> type:
+    """Creates a slots=True copy of a dataclass."""
+
+    params = getattr(datatype, "__dataclass_params__")
+    return make_dataclass(
+        name,
+        [
+            (
+                item.name,
+                item.type,
+                field(
+                    default=item.default,
+                    default_factory=item.default_factory,
+                    init=item.init,
+                    repr=item.repr,
+                    compare=item.compare,
+                    kw_only=item.kw_only,
+                ),
+            )
+            for item in fields(datatype)
+        ],
+        eq=params.eq,
+        order=params.order,
+        frozen=params.frozen,
+        slots=True,
+    )
+
+
+def _derive(datatype: type, representation: Representation) -> type:
+    """Creates the slots dataclass or namedtuple variant of a dataclass, named after the
+    dataclass and the representation (e.g. Point_slots)."""
+
+    name = f"{datatype.__name__}_{representation.name.lower()}"
+    if representation is Representation.NAMEDTUPLE:
+        names = [item.name for item in fields(datatype)]
+        derived = _namedtuple(name, names)
+    else:
+        names = [item.name for item in fields(datatype) if item.init]
+        derived = _slots_dataclass(datatype, name)
+
+    # the derived type cannot be imported by pickle, messages are rebuilt from the dataclass
+    # (referenced weakly, as the derived types are cached for as long as the dataclass lives)
+    reference = ref(datatype)
+
+    def reduce(message: Any) -> tuple[Any, ...]:
+        values = {name: getattr(message, name) for name in names}
+        return _rebuild, (reference(), representation, values)
+
+    setattr(derived, "__reduce__", reduce)
+    derived.__doc__ = datatype.__doc__
+    return derived
+
+
+def compact_type(datatype: type, representation: Representation) -> type:
+    """Returns the type decoded messages of a dataclass are built with for a representation. The
+        derived types are created once per dataclass, so messages decoded by different readers
+        compare equal. They are named after the dataclass and the representation (e.g.
+        Point_slots or Point_namedtuple), and pickled messages are rebuilt from the dataclass.
+
+    Args:
+        datatype (type): Type object for the user-defined dataclass.
+        representation (Representation): Type of the decoded messages.
+
+    Returns:
+        type: The dataclass, its slots dataclass variant, its namedtuple variant or tuple.
+    """
+
+    if representation is Representation.DATACLASS:
+        return datatype
+    if representation is Representation.TUPLE:
+        return tuple
+
+    with _COMPACT_TYPES_LOCK:
+        variants = _COMPACT_TYPES.setdefault(datatype, {})
+        if representation not in variants:
+            variants[representation] = _derive(datatype, representation)
+        return variants[representation]
@@ -0,0 +1,344 @@
+"""
+bytechomp.schema
+"""
+
+from __future__ import annotations
+from typing import Any, Generic, NamedTuple, TypeVar, cast
+from dataclasses import dataclass, field, is_dataclass
+from collections import OrderedDict
+from struct import Struct
+from threading import Lock
+import inspect
+
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import (
+    build_data_description,
+    build_data_pattern,
+    has_variable_length,
+    prove_basic_types,
+    TypeTree,
+)
+from bytechomp.checksum import ChecksumField, build_checksums
+from bytechomp.decoder import Decoder, compile_decoder
+from bytechomp.encoder import Encoder, compile_encoder
+from bytechomp.layout import FieldLayout, data_layout
+from bytechomp.representation import DEFAULT_REPRESENTATIONS, ListRepresentation, Representation
+from bytechomp.segments import FixedSegment, Segment, build_segments
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+DEFAULT_SCHEMA_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    """Everything derived from a dataclass and byte order that is needed to parse or serialize
+    it. For dataclasses with variable length fields, the pattern and struct only cover the fixed
+    size fields preceding the first variable length field, and segments describes the message."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    datatype: type
+    byte_order: ByteOrder
+    description: TypeTree
+    pattern: str
+    struct: Struct
+    decoder: Decoder
+    encoder: Encoder
+    # encoder that also checks the type of every value (used by serialize())
+    checked_encoder: Encoder
+    segments: tuple[Segment, ...] | None = None
+    checksums: tuple[ChecksumField, ...] = ()
+    # artifacts derived lazily from the schema (e.g. optional backends), dropped with the schema
+    derived: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+
+class SchemaCacheInfo(NamedTuple):
+    """Statistics of the schema cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def compile_schema(datatype: type, byte_order: ByteOrder) -> CompiledSchema:
+    """Builds the schema of a dataclass without going through the cache.
+
+    Args:
+        datatype (type): Type object for the user-defined dataclass.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        CompiledSchema: Compiled schema of the dataclass.
+    """
+
+    description = build_data_description(datatype)
+    # decoders skip the type checks of the values, which only the struct module produces
+    prove_basic_types(description)
+
+    segments: tuple[Segment, ...] | None = None
+    if has_variable_length(description):
+        segments = build_segments(description, byte_order)
+        # the first field is always fixed, as the first length field must precede its field
+        struct = cast(FixedSegment, segments[0]).struct
+        pattern = struct.format
+    else:
+        pattern = byte_order.to_pattern() + build_data_pattern(description)
+        struct = Struct(pattern)
+
+    return CompiledSchema(
+        datatype=datatype,
+        byte_order=byte_order,
+        description=description,
+        pattern=pattern,
+        struct=struct,
+        decoder=compile_decoder(description),
+        encoder=compile_encoder(description),
+        checked_encoder=compile_encoder(description, validate=True),
+        segments=segments,
+        checksums=build_checksums(description, byte_order),
+    )
+
+
+def decoder_variant(
+    schema: CompiledSchema,
+    strict: bool = False,
+    representation: Representation = Representation.DATACLASS,
+    lists: ListRepresentation = ListRepresentation.LIST,
+) -> Decoder:
+    """Returns a decoder of a compiled schema that checks the type of every value or builds
+        compact messages, compiling it on first use.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+        strict (bool): Check the type of every value.
+        representation (Representation): Type of the decoded messages.
+        lists (ListRepresentation): Type of the decoded list fields.
+
+    Returns:
+        Decoder: Decoder of the dataclass.
+    """
+
+    if not strict and (representation, lists) == DEFAULT_REPRESENTATIONS:
+        return schema.decoder
+
+    key = f"decoder_{'strict_' if strict else ''}{representation.name}_{lists.name}".lower()
+    if key not in schema.derived:
+        schema.derived[key] = compile_decoder(schema.description, strict, representation, lists)
+    decoder: Decoder = schema.derived[key]
+    return decoder
+
+
+def require_fixed_size(schema: CompiledSchema) -> CompiledSchema:
+    """Makes sure every message of the schema has the same size (no variable length fields).
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+
+    Returns:
+        CompiledSchema: The same schema.
+    """
+
+    if schema.segments is not None:
+        raise TypeError(
+            f"{schema.datatype.__name__} has variable length fields and no fixed message size"
+        )
+    return schema
+
+
+class SchemaCache:
+    """A thread-safe, size-bounded LRU cache of compiled schemas.
+
+    Args:
+        maxsize (int): Maximum number of schemas kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SCHEMA_CACHE_SIZE) -> None:
+        self.__maxsize = maxsize
+        self.__schemas: OrderedDict[tuple[type, ByteOrder], CompiledSchema] = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, datatype: type, byte_order: ByteOrder) -> CompiledSchema:
+        """Returns the cached schema of the dataclass, compiling it on a miss.
+
+        Args:
+            datatype (type): Type object for the user-defined dataclass.
+            byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+        Returns:
+            CompiledSchema: Compiled schema of the dataclass.
+        """
+
+        key = (datatype, byte_order)
+        with self.__lock:
+            schema = self.__schemas.get(key)
+            if schema is not None:
+                self.__schemas.move_to_end(key)
+                self.__hits += 1
+                return schema
+            self.__misses += 1
+
+        # compile outside of the lock, concurrent misses on the same key produce equal schemas
+        schema = compile_schema(datatype, byte_order)
+
+        with self.__lock:
+            self.__schemas[key] = schema
+            self.__schemas.move_to_end(key)
+            while len(self.__schemas) > self.__maxsize:
+                self.__schemas.popitem(last=False)
+        return schema
+
+    def info(self) -> SchemaCacheInfo:
+        """Returns the hit/miss statistics and size of the cache.
+
+        Returns:
+            SchemaCacheInfo: Cache statistics.
+        """
+
+        with self.__lock:
+            return SchemaCacheInfo(self.__hits, self.__misses, self.__maxsize, len(self.__schemas))
+
+    def clear(self, datatype: type | None = None) -> None:
+        """Removes the schemas of one dataclass (for every byte order), or the whole cache.
+
+        Args:
+            datatype (type | None): Dataclass to invalidate, everything when None.
+        """
+
+        with self.__lock:
+            if datatype is None:
+                self.__schemas.clear()
+                self.__hits = 0
+                self.__misses = 0
+                return
+            for key in [key for key in self.__schemas if key[0] is datatype]:
+                del self.__schemas[key]
+
+
+_SCHEMA_CACHE = SchemaCache()
+
+
+def get_schema(datatype: type, byte_order: ByteOrder = ByteOrder.NATIVE) -> CompiledSchema:
+    """Returns the compiled schema of a dataclass from the process-wide cache.
+
+    Args:
+        datatype (type): Type object for the user-defined dataclass.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        CompiledSchema: Compiled schema of the dataclass.
+    """
+
+    return _SCHEMA_CACHE.get(datatype, byte_order)
+
+
+def schema_cache_info() -> SchemaCacheInfo:
+    """Returns the statistics of the process-wide schema cache.
+
+    Returns:
+        SchemaCacheInfo: Cache statistics.
+    """
+
+    return _SCHEMA_CACHE.info()
+
+
+def schema_cache_clear(datatype: type | None = None) -> None:
+    """Invalidates the process-wide schema cache (e.g. after redefining a dataclass at runtime).
+
+    Args:
+        datatype (type | None): Dataclass to invalidate, everything when None.
+    """
+
+    _SCHEMA_CACHE.clear(datatype)
+
+
+class Schema(Generic[T]):
+    """The immutable compiled schema of the dataclass T, allocated once and shared by any number of
+        readers (e.g. one per thread or connection, see Reader.of) so that new readers skip the
+        reflection done by allocate().
+
+    A schema is safe to share between threads: once allocated, none of its fields are modified.
+    Artifacts derived on first use (decoder variants, layouts, numpy dtypes) are cached on the
+    compiled schema and computed identically by concurrent first users. Readers are not thread
+    safe, as they hold the buffer and cursor of a single stream.
+
+    Args:
+        Generic (T): The dataclass type that defines the binary protocol.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+    """
+
+    def __init__(self, byte_order: ByteOrder = ByteOrder.NATIVE) -> None:
+        self.__byte_order = byte_order
+        self.__compiled: CompiledSchema | None = None
+
+    def allocate(self) -> Schema[T]:
+        """Allocates the schema with a tokenized description of the protocol defined by the type T.
+
+        Returns:
+            Schema: The allocated schema.
+        """
+        # pylint: disable=no-member
+
+        datatype = self.__orig_class__.__args__[0]  # type: ignore
+
+        if not inspect.isclass(datatype) or not is_dataclass(datatype):
+            raise ValueError("generic datatype must be a dataclass")
+
+        self.__compiled = get_schema(datatype, self.__byte_order)
+        return self
+
+    @property
+    def compiled(self) -> CompiledSchema:
+        """Returns the compiled schema shared with the readers of this schema.
+
+        Returns:
+            CompiledSchema: Compiled schema of the dataclass.
+        """
+
+        if self.__compiled is None:
+            raise RuntimeError("schema must be allocated before use")
+        return self.__compiled
+
+    @property
+    def datatype(self) -> type:
+        """Returns the dataclass type T.
+
+        Returns:
+            type: Type object for the user-defined dataclass.
+        """
+
+        return self.compiled.datatype
+
+    @property
+    def byte_order(self) -> ByteOrder:
+        """Returns the byte ordering of the binary protocol.
+
+        Returns:
+            ByteOrder: Byte ordering of the binary protocol.
+        """
+
+        return self.__byte_order
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes of a single message of T.
+
+        Returns:
+            int: Size of a single message in bytes.
+        """
+
+        return require_fixed_size(self.compiled).struct.size
+
+    @property
+    def layout(self) -> dict[str, FieldLayout]:
+        """Returns the byte offset, size and struct code of every field of the class T, keyed by
+            field path (e.g. "header.length" or "points[2].x").
+
+        Returns:
+            dict[str, FieldLayout]: Field path to layout, in pattern order.
+        """
+
+        return data_layout(require_fixed_size(self.compiled))
@@ -0,0 +1,262 @@
+"""
+bytechomp.segments
+
+Dataclasses with variable length fields are split into segments: runs of fixed-size fields that
+are decoded with a single unpack_from call, and the variable length fields between them.
+"""
+
+from __future__ import annotations
+from typing import Any, Sequence, Union, cast
+from collections import OrderedDict
+from dataclasses import dataclass
+from struct import Struct, calcsize, pack, unpack_from
+
+from bytechomp.basic_parsing_element import BasicParsingElement, VariableParsingElement
+from bytechomp.byte_order import ByteOrder
+from bytechomp.data_descriptor import TypeTree, build_data_pattern, count_values
+from bytechomp.decoder import Decoder, compile_decoder
+from bytechomp.encoder import Encoder, compile_encoder
+
+
+@dataclass(frozen=True, slots=True)
+class FixedSegment:
+    """A run of fixed-size fields decoded with a single unpack_from call."""
+
+    struct: Struct
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class VariableSegment:  # pylint: disable=too-many-instance-attributes
+    """A bytes or list field whose number of elements is a previously decoded value. Elements
+    are stored back to back directly after the preceding segment."""
+
+    name: str
+    length_index: int
+    order: str
+    tag: str
+    element_size: int
+    element_struct: Struct | None = None
+    element_decoder: Decoder | None = None
+    element_encoder: Encoder | None = None
+
+    def size(self, length: int) -> int:
+        """Returns the number of bytes taken by length elements.
+
+        Args:
+            length (int): Number of elements (bytes for a bytes field).
+
+        Returns:
+            int: Size of the field in bytes.
+        """
+
+        if length < 0:
+            raise ValueError(f"negative length {length} for the {self.name} field")
+        return self.element_size * length
+
+    def decode(self, buffer: Any, offset: int, length: int) -> Any:
+        """Decodes the field from the buffer.
+
+        Args:
+            buffer (Any): Bytes-like object containing the message.
+            offset (int): Position of the field in the buffer.
+            length (int): Number of elements (bytes for a bytes field).
+
+        Returns:
+            Any: Decoded bytes or list.
+        """
+
+        if self.element_struct is None:
+            values = unpack_from(f"{self.order}{length}{self.tag}", buffer, offset)
+            return values[0] if self.tag == "s" else list(values)
+
+        decoder = cast(Decoder, self.element_decoder)
+        end = offset + self.element_size * length
+        with memoryview(buffer) as view, view[offset:end] as records:
+            return [decoder(values) for values in self.element_struct.iter_unpack(records)]
+
+    def encode(self, value: Any) -> bytes:
+        """Packs the bytes or list value of the field.
+
+        Args:
+            value (Any): Bytes or list value.
+
+        Returns:
+            bytes: Packed field.
+        """
+
+        if self.element_struct is None:
+            if self.tag == "s":
+                return bytes(value)
+            return pack(f"{self.order}{len(value)}{self.tag}", *value)
+
+        encoder = cast(Encoder, self.element_encoder)
+        element_pack = self.element_struct.pack
+        return b"".join([element_pack(*encoder(element)) for element in value])
+
+
+Segment = Union[FixedSegment, VariableSegment]
+
+
+def _value_index(description: TypeTree, path: str) -> int:
+    """Returns the position of the value of the field path in the flat values of the structure."""
+
+    head, _, rest = path.partition(".")
+    index = 0
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+        if name == head:
+            if rest and isinstance(root_element, OrderedDict):
+                return index + _value_index(root_element, rest)
+            return index
+        index += count_values(OrderedDict([(name, root_element)]))
+    raise LookupError(f"unable to find length field {path} in description")
+
+
+def build_segments(description: TypeTree, byte_order: ByteOrder) -> tuple[Segment, ...]:
+    """Splits the described dataclass into fixed-size runs of fields and variable length fields.
+
+    Args:
+        description (TypeTree): Type tree of BasicParsingElement nodes.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        tuple[Segment, ...]: Segments in the order they appear in a message.
+    """
+
+    order = byte_order.to_pattern()
+    segments: list[Segment] = []
+    run: TypeTree = OrderedDict([("__struct_type__", description["__struct_type__"])])
+
+    def close_run() -> None:
+        if len(run) > 1:
+            segments.append(
+                FixedSegment(Struct(order + build_data_pattern(run)), count_values(run))
+            )
+            for name in [name for name in run if name != "__struct_type__"]:
+                del run[name]
+
+    for name, root_element in description.items():
+        if name == "__struct_type__":
+            continue
+
+        if not isinstance(root_element, VariableParsingElement):
+            run[name] = root_element
+            continue
+
+        close_run()
+        length_index = _value_index(description, root_element.length_field)
+        element = root_element.element
+        if isinstance(element, BasicParsingElement):
+            tag = element.parser_tag
+            segments.append(VariableSegment(name, length_index, order, tag, calcsize(order + tag)))
+        else:
+            element_struct = Struct(order + build_data_pattern(element))
+            segments.append(
+                VariableSegment(
+                    name,
+                    length_index,
+                    order,
+                    "",
+                    element_struct.size,
+                    element_struct,
+                    compile_decoder(element),
+                    compile_encoder(element),
+                )
+            )
+
+    close_run()
+    return tuple(segments)
+
+
+def pack_segments(segments: Sequence[Segment], values: Sequence[Any]) -> list[bytes]:
+    """Packs the gathered values of a dataclass (see compile_encoder) segment by segment.
+
+    Args:
+        segments (Sequence[Segment]): Segments of the dataclass.
+        values (Sequence[Any]): Flat values, with a single value per variable length field.
+
+    Returns:
+        list[bytes]: Packed segments, the message is their concatenation.
+    """
+
+    parts: list[bytes] = []
+    index = 0
+    for segment in segments:
+        if isinstance(segment, FixedSegment):
+            parts.append(segment.struct.pack(*values[index : index + segment.count]))
+            index += segment.count
+        else:
+            parts.append(segment.encode(values[index]))
+            index += 1
+    return parts
+
+
+class SegmentScanner:
+    """Incrementally decodes the segments of the next message in a growing buffer. Progress is
+        kept between calls, so every segment is decoded exactly once however the message is fed.
+
+    Args:
+        segments (Sequence[Segment]): Segments of the dataclass.
+    """
+
+    def __init__(self, segments: Sequence[Segment]) -> None:
+        self.__segments = segments
+        self.__values: list[Any] = []
+        self.__starts: list[int] = []
+        self.__index = 0
+        self.__size = 0
+
+    def scan(self, buffer: Any, offset: int, available: int) -> bool:
+        """Decodes as many segments of the message starting at offset as the buffer allows.
+
+        Args:
+            buffer (Any): Bytes-like object containing the message.
+            offset (int): Position of the message in the buffer.
+            available (int): Number of bytes of the buffer from offset onwards.
+
+        Returns:
+            bool: True once the whole message has been decoded.
+        """
+
+        segments = self.__segments
+        while self.__index < len(segments):
+            segment = segments[self.__index]
+            if len(self.__starts) == self.__index:
+                self.__starts.append(self.__size)
+            if isinstance(segment, FixedSegment):
+                size = segment.struct.size
+                if available - self.__size < size:
+                    return False
+                self.__values.extend(segment.struct.unpack_from(buffer, offset + self.__size))
+            else:
+                length = self.__values[segment.length_index]
+                size = segment.size(length)
+                if available - self.__size < size:
+                    return False
+                self.__values.append(segment.decode(buffer, offset + self.__size, length))
+            self.__size += size
+            self.__index += 1
+        return True
+
+    def take(self) -> tuple[list[Any], int, list[int]]:
+        """Returns the values and size of the decoded message, and starts over with the next one.
+
+        Returns:
+            tuple[list[Any], int, list[int]]: (flat values, size of the message in bytes, start
+                of every segment in the message followed by the size)
+        """
+
+        values, size, starts = self.__values, self.__size, self.__starts
+        starts.append(size)
+        self.reset()
+        return values, size, starts
+
+    def reset(self) -> None:
+        """Discards the progress on the current message."""
+
+        self.__values = []
+        self.__starts = []
+        self.__index = 0
+        self.__size = 0
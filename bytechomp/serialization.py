@@ -2,16 +2,48 @@
 bytechomp.serialization
 """
 
-import struct
-from typing import Annotated, get_origin, get_args, cast
+from __future__ import annotations
+from typing import (
+    Any,
+    Annotated,
+    Generic,
+    NamedTuple,
+    TypeVar,
+    Iterable,
+    Iterator,
+    Sequence,
+    get_origin,
+    get_args,
+    cast,
+    overload,
+)
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import is_dataclass, fields
-
+from itertools import accumulate, islice
+from mmap import mmap
+from multiprocessing.shared_memory import SharedMemory
+from operator import attrgetter
+from os import PathLike, cpu_count, fspath
+import inspect
+
+from bytechomp.datatypes.declarations import PAD, LengthFrom, Checksum
 from bytechomp.datatypes.lookups import (
     ELEMENTARY_TYPE_LIST,
     TYPE_TO_TAG,
     TYPE_TO_PYTYPE,
 )
 from bytechomp.byte_order import ByteOrder
+from bytechomp.numpy_backend import numpy_to_records
+from bytechomp.parallel import DEFAULT_BATCH_RECORDS, DEFAULT_MIN_PARALLEL_BYTES
+from bytechomp.schema import CompiledSchema, get_schema, require_fixed_size
+from bytechomp.segments import pack_segments
+from bytechomp.checksum import fill_checksums
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+WritableBuffer = bytearray | memoryview | mmap
+
+DEFAULT_CHUNK_RECORDS = 1024
 
 
 def flatten_dataclass(data_object: type) -> tuple[str, list[int | float | bytes]]:
@@ -46,7 +78,9 @@ def flatten_dataclass(data_object: type) -> tuple[str, list[int | float | bytes]
                 )
 
             pattern += TYPE_TO_TAG[field.type]
-            values.append(cast(int | float | bytes, val))
+            # pad bytes do not consume a value in the struct module
+            if field.type is not PAD:
+                values.append(cast(int | float | bytes, val))
         elif is_dataclass(field.type):
             if not isinstance(val, val_t):
                 raise TypeError(
@@ -67,6 +101,20 @@ def flatten_dataclass(data_object: type) -> tuple[str, list[int | float | bytes]
             arg_type = args[0]
             length = args[1]
 
+            # checksum values are filled in once the message is packed
+            if isinstance(length, Checksum):
+                if not isinstance(val, int):
+                    raise TypeError(
+                        f"{field.name} field contains {val_t} type but requires {arg_type}"
+                    )
+                pattern += TYPE_TO_TAG[arg_type]
+                values.append(val)
+                continue
+
+            # variable lengths are read from the length field of the object
+            if isinstance(length, LengthFrom):
+                length = attrgetter(length.field)(data_object)
+
             if not isinstance(length, int):
                 raise TypeError("second annotated argument must be an integer to denote length")
 
@@ -127,7 +175,8 @@ def flatten_dataclass(data_object: type) -> tuple[str, list[int | float | bytes]
                             )
 
                     pattern += TYPE_TO_TAG[list_type] * length
-                    values.extend(val)
+                    if list_type is not PAD:
+                        values.extend(val)
                 elif is_dataclass(list_type):
                     element_type = list_type
                     for field_element in val:
@@ -154,6 +203,33 @@ def flatten_dataclass(data_object: type) -> tuple[str, list[int | float | bytes]
     return pattern, values
 
 
+def _pack_message(schema: CompiledSchema, values: Sequence[Any]) -> bytes:
+    """Packs the flat values of a single message and fills in its checksum fields.
+
+    Args:
+        schema (CompiledSchema): Compiled schema of the dataclass.
+        values (Sequence[Any]): Values gathered by the encoder of the schema.
+
+    Returns:
+        bytes: Serialized message.
+    """
+
+    if schema.segments is None:
+        if not schema.checksums:
+            return schema.struct.pack(*values)
+        message = bytearray(schema.struct.pack(*values))
+        starts: Sequence[int] = (0, len(message))
+    else:
+        parts = pack_segments(schema.segments, values)
+        if not schema.checksums:
+            return b"".join(parts)
+        message = bytearray(b"".join(parts))
+        starts = list(accumulate((len(part) for part in parts), initial=0))
+
+    fill_checksums(schema.checksums, message, 0, starts)
+    return bytes(message)
+
+
 def serialize(data_object: type, byte_order: ByteOrder = ByteOrder.NATIVE) -> bytes:
     """Serializes a completely populated dataclass into a byte string according to the bytechomp
         serialization rules.
@@ -168,7 +244,461 @@ def serialize(data_object: type, byte_order: ByteOrder = ByteOrder.NATIVE) -> by
     if not is_dataclass(data_object):
         raise TypeError("provided object must be a valid dataclass")
 
-    pattern, values = flatten_dataclass(data_object)
-    pattern = byte_order.to_pattern() + pattern
-    # print(f"\nPattern to use '{pattern}' for values to serialize: ", values)
-    return struct.pack(pattern, *values)
+    schema = get_schema(type(data_object), byte_order)
+    return _pack_message(schema, schema.checked_encoder(data_object))
+
+
+def serialize_into(
+    data_object: type,
+    buffer: WritableBuffer,
+    offset: int = 0,
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+) -> int:
+    """Serializes a completely populated dataclass directly into a caller-owned writable buffer
+        according to the bytechomp serialization rules.
+
+    Args:
+        data_object (type): Dataclass object.
+        buffer (WritableBuffer): Writable buffer (e.g. bytearray, memoryview or mmap).
+        offset (int): Position in the buffer to write the object at.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        int: Offset in the buffer directly after the written object.
+    """
+
+    if not is_dataclass(data_object):
+        raise TypeError("provided object must be a valid dataclass")
+
+    schema = require_fixed_size(get_schema(type(data_object), byte_order))
+    schema.struct.pack_into(buffer, offset, *schema.checked_encoder(data_object))
+    if schema.checksums:
+        fill_checksums(schema.checksums, buffer, offset, (0, schema.struct.size))
+    return offset + schema.struct.size
+
+
+def serialize_many_into(
+    data_objects: Iterable[type],
+    buffer: WritableBuffer,
+    offset: int = 0,
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+) -> int:
+    """Serializes a sequence of dataclasses back to back into a caller-owned writable buffer.
+
+    Args:
+        data_objects (Iterable[type]): Dataclass objects.
+        buffer (WritableBuffer): Writable buffer (e.g. bytearray, memoryview or mmap).
+        offset (int): Position in the buffer to write the first object at.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+
+    Returns:
+        int: Offset in the buffer directly after the last written object.
+    """
+
+    for data_object in data_objects:
+        offset = serialize_into(data_object, buffer, offset, byte_order)
+    return offset
+
+
+def _pack_records(
+    schema: CompiledSchema,
+    data_objects: Iterable[type],
+    buffer: WritableBuffer,
+    trusted: bool,
+) -> None:
+    """Packs a homogeneous sequence of dataclasses back to back into the buffer.
+
+    Args:
+        schema (CompiledSchema): Compiled schema shared by every object.
+        data_objects (Iterable[type]): Dataclass objects.
+        buffer (WritableBuffer): Writable buffer large enough for every object.
+        trusted (bool): Skip the per-object field validation.
+    """
+
+    pack_into = schema.struct.pack_into
+    size = schema.struct.size
+    offset = 0
+
+    if trusted:
+        encoder = schema.encoder
+        for data_object in data_objects:
+            pack_into(buffer, offset, *encoder(data_object))
+            offset += size
+    else:
+        encoder = schema.checked_encoder
+        for data_object in data_objects:
+            # an exact check: a subclass may add fields that the packed layout does not have
+            if type(data_object) is not schema.datatype:  # pylint: disable=unidiomatic-typecheck
+                raise TypeError(
+                    f"objects must share a single dataclass type ({type(data_object)} is not "
+                    f"{schema.datatype})"
+                )
+            pack_into(buffer, offset, *encoder(data_object))
+            offset += size
+
+    if schema.checksums:
+        for base in range(0, offset, size):
+            fill_checksums(schema.checksums, buffer, base, (0, size))
+
+
+class _PackTarget(NamedTuple):
+    """Output the worker processes attach to: a file or a shared memory block."""
+
+    path: str | None
+    shared_memory: str | None
+
+
+class _PackBatch(NamedTuple):
+    """A contiguous range of objects packed by a worker process into its region of the output."""
+
+    records: list[Any]
+    byte_order: ByteOrder
+    target: _PackTarget
+    start: int
+    stop: int
+
+
+def _shared_buffer(block: SharedMemory) -> memoryview:
+    """Returns the buffer of a shared memory block (which is None once the block is closed)."""
+
+    if block.buf is None:
+        raise ValueError(f"shared memory block {block.name} is closed")
+    return block.buf
+
+
+def _pack_batch(batch: _PackBatch) -> None:
+    """Attaches to the output (a file or a shared memory block) and packs the objects of a batch
+        into their region (runs in the worker processes).
+
+    Args:
+        batch (_PackBatch): Objects to pack and their region of the output.
+    """
+
+    schema = get_schema(type(batch.records[0]), batch.byte_order)
+    if batch.target.path is not None:
+        with open(batch.target.path, "r+b") as file, mmap(file.fileno(), 0) as mapped:
+            with memoryview(mapped) as view, view[batch.start : batch.stop] as region:
+                _pack_records(schema, batch.records, region, False)
+            mapped.flush()
+    else:
+        block = SharedMemory(name=batch.target.shared_memory)
+        try:
+            with _shared_buffer(block)[batch.start : batch.stop] as region:
+                _pack_records(schema, batch.records, region, False)
+        finally:
+            block.close()
+
+
+def _pack_parallel(
+    schema: CompiledSchema, records: list[Any], workers: int, target: _PackTarget
+) -> None:
+    """Packs the objects with a pool of worker processes, every worker validating a batch of
+    objects and writing it directly into its region of the output (the offsets follow from the
+    fixed record size)."""
+
+    size = schema.struct.size
+    step = min(-(-len(records) // workers), DEFAULT_BATCH_RECORDS)
+    batches = [
+        _PackBatch(
+            records[start : start + step],
+            schema.byte_order,
+            target,
+            start * size,
+            min(start + step, len(records)) * size,
+        )
+        for start in range(0, len(records), step)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(_pack_batch, batches):
+            pass
+
+
+def _serialize_to_bytes(
+    schema: CompiledSchema, records: list[Any], trusted: bool, workers: int
+) -> bytes:
+    """Packs the objects into a byte string, through a temporary shared memory block with
+    several workers."""
+
+    total = len(records) * schema.struct.size
+    if workers <= 1:
+        buffer = bytearray(total)
+        _pack_records(schema, records, buffer, trusted)
+        return bytes(buffer)
+
+    block = SharedMemory(create=True, size=total)
+    try:
+        _pack_parallel(schema, records, workers, _PackTarget(None, block.name))
+        with _shared_buffer(block)[:total] as region:
+            return bytes(region)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _serialize_to_shared_memory(
+    schema: CompiledSchema, records: list[Any], trusted: bool, workers: int, block: SharedMemory
+) -> None:
+    """Packs the objects from the start of a shared memory block large enough to hold them."""
+
+    if workers > 1:
+        _pack_parallel(schema, records, workers, _PackTarget(None, block.name))
+        return
+    with _shared_buffer(block)[: len(records) * schema.struct.size] as region:
+        _pack_records(schema, records, region, trusted)
+
+
+def _serialize_to_file(
+    schema: CompiledSchema, records: list[Any], trusted: bool, workers: int, path: str
+) -> None:
+    """Packs the objects into a file, created or truncated to the size of the serialization."""
+
+    with open(path, "w+b") as file:
+        file.truncate(len(records) * schema.struct.size)
+        if workers <= 1:
+            with mmap(file.fileno(), 0) as mapped:
+                _pack_records(schema, records, mapped, trusted)
+    if workers > 1:
+        _pack_parallel(schema, records, workers, _PackTarget(path, None))
+
+
+@overload
+def serialize_many(  # pylint: disable=too-many-arguments
+    data_objects: Iterable[type],
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    trusted: bool = False,
+    *,
+    workers: int | None = 1,
+    out: None = None,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> bytes: ...
+
+
+@overload
+def serialize_many(  # pylint: disable=too-many-arguments
+    data_objects: Iterable[type],
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    trusted: bool = False,
+    *,
+    workers: int | None = 1,
+    out: str | PathLike[str] | SharedMemory,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> int: ...
+
+
+def serialize_many(  # pylint: disable=too-many-arguments
+    data_objects: Iterable[type],
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    trusted: bool = False,
+    *,
+    workers: int | None = 1,
+    out: str | PathLike[str] | SharedMemory | None = None,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> bytes | int:
+    """Serializes a homogeneous sequence of dataclasses into one byte string. The schema is
+        resolved once and every object is packed into a single preallocated buffer.
+
+    With several workers, the objects are split into batches sent to a pool of worker processes
+    (so the dataclass must be defined at module level), and every worker validates its batch and
+    packs it directly into its region of the output. Small inputs are packed in-process. Trusted
+    inputs are always packed in-process, as sending an object to a worker costs more than
+    packing it without validation, so asking for both is a ValueError.
+
+    Args:
+        data_objects (Iterable[type]): Dataclass objects of a single type.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        trusted (bool): Skip the per-object field validation of serialize() (the lengths of
+            bytes and list fields are still checked). Trusted inputs take a single worker.
+        workers (int | None): Number of worker processes (the number of CPUs when None).
+        out (str | PathLike[str] | SharedMemory | None): Output written in place of returning
+            the serialization: a file (created or truncated to the size of the serialization)
+            or a shared memory block large enough to hold it, written from its start.
+        min_parallel_bytes (int): Serializations smaller than this are packed in-process.
+
+    Returns:
+        bytes | int: Concatenated serialization of the dataclass objects, or the number of bytes
+            written to out.
+    """
+
+    if trusted and workers != 1:
+        raise ValueError("trusted inputs are packed in-process, workers must be 1")
+
+    records = list(data_objects)
+    if not records:
+        if out is not None and not isinstance(out, SharedMemory):
+            with open(fspath(out), "wb"):
+                pass
+        return b"" if out is None else 0
+    if not is_dataclass(records[0]):
+        raise TypeError("provided object must be a valid dataclass")
+
+    schema = require_fixed_size(get_schema(type(records[0]), byte_order))
+    total = len(records) * schema.struct.size
+    if isinstance(out, SharedMemory) and out.size < total:
+        raise ValueError(f"shared memory block of {out.size} bytes is smaller than {total} bytes")
+
+    if workers is None:
+        workers = cpu_count() or 1
+    if len(records) <= 1 or total < min_parallel_bytes:
+        workers = 1
+
+    if out is None:
+        return _serialize_to_bytes(schema, records, trusted, workers)
+    if isinstance(out, SharedMemory):
+        _serialize_to_shared_memory(schema, records, trusted, workers, out)
+    else:
+        _serialize_to_file(schema, records, trusted, workers, fspath(out))
+    return total
+
+
+def serialize_chunks(
+    data_objects: Iterable[type],
+    byte_order: ByteOrder = ByteOrder.NATIVE,
+    chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    trusted: bool = False,
+) -> Iterator[bytes]:
+    """Serializes a homogeneous stream of dataclasses, yielding byte strings of chunk_records
+        serialized objects each (the last chunk may be shorter).
+
+    Args:
+        data_objects (Iterable[type]): Dataclass objects of a single type.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+        chunk_records (int): Number of objects serialized into each chunk.
+        trusted (bool): Skip the per-object field validation of serialize().
+
+    Yields:
+        Iterator[bytes]: Serialized chunks.
+    """
+
+    if chunk_records < 1:
+        raise ValueError("chunk_records must be a positive integer")
+
+    iterator = iter(data_objects)
+    schema: CompiledSchema | None = None
+    buffer = bytearray()
+
+    while records := list(islice(iterator, chunk_records)):
+        if schema is None:
+            if not is_dataclass(records[0]):
+                raise TypeError("provided object must be a valid dataclass")
+            schema = require_fixed_size(get_schema(type(records[0]), byte_order))
+            buffer = bytearray(chunk_records * schema.struct.size)
+
+        _pack_records(schema, records, buffer, trusted)
+        yield bytes(memoryview(buffer)[: len(records) * schema.struct.size])
+
+
+class Serializer(Generic[T]):
+    """A binary protocol serializer with a precompiled schema for the type T. Bytes and list field
+        lengths are checked, while element types are left to the struct module (use serialize()
+        for the full field validation).
+
+    Args:
+        Generic (T): The dataclass type that defines the binary protocol.
+        byte_order (ByteOrder): Byte ordering of the binary protocol.
+    """
+
+    def __init__(self, byte_order: ByteOrder = ByteOrder.NATIVE) -> None:
+        self.__byte_order = byte_order
+        self.__schema: CompiledSchema | None = None
+
+    def allocate(self) -> Serializer[T]:
+        """Allocates the serializer with the compiled schema of the protocol defined by the type T.
+
+        Returns:
+            Serializer: The allocated binary protocol serializer.
+        """
+        # pylint: disable=no-member
+
+        datatype = self.__orig_class__.__args__[0]  # type: ignore
+
+        if not inspect.isclass(datatype) or not is_dataclass(datatype):
+            raise ValueError("generic datatype must be a dataclass")
+
+        self.__schema = get_schema(datatype, self.__byte_order)
+        return self
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes in a serialized class T.
+
+        Returns:
+            int: Size of a single message in bytes.
+        """
+
+        return require_fixed_size(self.__allocated()).struct.size
+
+    def __allocated(self) -> CompiledSchema:
+        """Returns the compiled schema, making sure the serializer was allocated."""
+
+        if self.__schema is None:
+            raise RuntimeError("serializer must be allocated before use")
+        return self.__schema
+
+    def serialize(self, data_object: T) -> bytes:
+        """Serializes a completely populated instance of T into a byte string.
+
+        Args:
+            data_object (T): Dataclass object.
+
+        Returns:
+            bytes: Serialization of the dataclass object.
+        """
+
+        schema = self.__allocated()
+        return _pack_message(schema, schema.encoder(data_object))
+
+    def from_numpy(self, array: Any) -> bytes:
+        """Serializes a numpy structured array with the fields of T (see Reader.to_numpy) into
+            back to back records (requires numpy to be installed).
+
+        Args:
+            array (numpy.ndarray): Structured array of records.
+
+        Returns:
+            bytes: Serialized records.
+        """
+
+        return numpy_to_records(require_fixed_size(self.__allocated()), array)
+
+    def serialize_into(self, data_object: T, buffer: WritableBuffer, offset: int = 0) -> int:
+        """Serializes a completely populated instance of T directly into a writable buffer.
+
+        Args:
+            data_object (T): Dataclass object.
+            buffer (WritableBuffer): Writable buffer (e.g. bytearray, memoryview or mmap).
+            offset (int): Position in the buffer to write the object at.
+
+        Returns:
+            int: Offset in the buffer directly after the written object.
+        """
+
+        schema = require_fixed_size(self.__allocated())
+        schema.struct.pack_into(buffer, offset, *schema.encoder(data_object))
+        if schema.checksums:
+            fill_checksums(schema.checksums, buffer, offset, (0, schema.struct.size))
+        return offset + schema.struct.size
+
+    def serialize_many_into(
+        self, data_objects: Iterable[T], buffer: WritableBuffer, offset: int = 0
+    ) -> int:
+        """Serializes a sequence of instances of T back to back into a writable buffer.
+
+        Args:
+            data_objects (Iterable[T]): Dataclass objects.
+            buffer (WritableBuffer): Writable buffer (e.g. bytearray, memoryview or mmap).
+            offset (int): Position in the buffer to write the first object at.
+
+        Returns:
+            int: Offset in the buffer directly after the last written object.
+        """
+
+        schema = require_fixed_size(self.__allocated())
+        pack_into = schema.struct.pack_into
+        encoder = schema.encoder
+        size = schema.struct.size
+        for data_object in data_objects:
+            pack_into(buffer, offset, *encoder(data_object))
+            if schema.checksums:
+                fill_checksums(schema.checksums, buffer, offset, (0, size))
+            offset += size
+        return offset
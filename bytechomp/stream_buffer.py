@@ -0,0 +1,86 @@
+"""
+bytechomp.stream_buffer
+"""
+
+from __future__ import annotations
+from typing import TypeVar
+
+B = TypeVar("B", bound="StreamBuffer")  # pylint: disable=invalid-name
+
+# consumed bytes are only discarded from the front of the buffer past this many bytes
+COMPACT_THRESHOLD = 64 * 1024
+
+
+class StreamBuffer:
+    """Internal buffer of the stream readers: a bytearray of the received data and a read cursor
+    past the consumed messages, so that consuming a message does not shift the rest of the data.
+    """
+
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._offset: int = 0
+
+    def feed(self, data: bytes) -> None:
+        """Add binary data to the internal buffer.
+
+        Args:
+            data (bytes): Binary data.
+        """
+
+        self._data += data
+
+    def __lshift__(self: B, data: bytes) -> B:
+        """Alternative to the feed method.
+
+        Args:
+            data (bytes): Binary data
+
+        Returns:
+            B: Binary protocol reader.
+        """
+
+        self.feed(data)
+        return self
+
+    def _consume(self, size: int) -> None:
+        """Advances the read cursor, compacting the buffer once the consumed prefix is large.
+
+        Args:
+            size (int): Number of bytes consumed from the head of the buffer.
+        """
+
+        self._offset += size
+        if self._offset == len(self._data):
+            del self._data[:]
+            self._offset = 0
+        elif self._offset >= COMPACT_THRESHOLD and self._offset * 2 >= len(self._data):
+            del self._data[: self._offset]
+            self._offset = 0
+
+    def __len__(self) -> int:
+        """Returns the size of the internal buffer.
+
+        Returns:
+            int: Size of internal buffer.
+        """
+
+        return len(self._data) - self._offset
+
+    def clear(self) -> None:
+        """Clears the data in the internal buffer."""
+
+        self._data = bytearray()
+        self._offset = 0
+
+    def export(self) -> bytes:
+        """Exports the data from the internal buffer.
+
+        Returns:
+            bytes: All bytes contained in the internal buffer
+        """
+
+        data = bytes(self._data[self._offset :])
+        self.clear()
+        return data
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from bytechomp import dataclass, Annotated, ByteOrder, serialize_many
+from bytechomp.datatypes import U32, F64
+
+
+# defined at module level so that worker processes can import it
+@dataclass
+class Record:
+    identity: U32
+    value: F64
+    tag: Annotated[bytes, 4]
+
+
+def write_records(path: Path, count: int, header: bytes = b"", trailer: bytes = b"") -> list[Record]:
+    records = [Record(i, i * 0.5, b"%04d" % (i % 10_000)) for i in range(count)]
+    path.write_bytes(header + serialize_many(records, ByteOrder.LITTLE) + trailer)
+    return records
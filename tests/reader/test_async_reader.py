@@ -0,0 +1,62 @@
+import asyncio
+import struct
+from typing import AsyncIterator
+
+from bytechomp import AsyncReader, dataclass, Annotated, ByteOrder, serialize
+
+
+@dataclass
+class PingMessage:
+    request_id: int
+    data: Annotated[bytes, 4]
+
+
+def build_stream(data: bytes) -> asyncio.StreamReader:
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+async def collect(reader: AsyncReader[PingMessage], stream, **kwargs) -> list[PingMessage]:
+    return [message async for message in reader.iter_stream(stream, **kwargs)]
+
+
+def test_async_stream_batched() -> None:
+    data = b"".join(serialize(PingMessage(i, b"PING")) for i in range(100))
+
+    async def run() -> list[PingMessage]:
+        reader = AsyncReader[PingMessage]().allocate()
+        return await collect(reader, build_stream(data + b"\x01\x02"), read_size=50)
+
+    messages = asyncio.run(run())
+    assert [message.request_id for message in messages] == list(range(100))
+    assert all(message.data == b"PING" for message in messages)
+
+
+def test_async_stream_exact() -> None:
+    data = b"".join(serialize(PingMessage(i, b"PONG"), ByteOrder.BIG) for i in range(10))
+
+    async def run() -> tuple[list[PingMessage], bytes]:
+        reader = AsyncReader[PingMessage](ByteOrder.BIG).allocate()
+        messages = await collect(reader, build_stream(data + b"\x01\x02"), exact=True)
+        return messages, reader.reader.export()
+
+    messages, remaining = asyncio.run(run())
+    assert [message.request_id for message in messages] == list(range(10))
+    assert remaining == b"\x01\x02"
+
+
+def test_async_byte_iterator() -> None:
+    data = struct.pack("@Q4s", 15, b"DATA") * 3
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for i in range(len(data)):
+            yield data[i : i + 1]
+
+    async def run() -> list[PingMessage]:
+        reader = AsyncReader[PingMessage]().allocate()
+        return await collect(reader, chunks())
+
+    messages = asyncio.run(run())
+    assert messages == [PingMessage(15, b"DATA")] * 3
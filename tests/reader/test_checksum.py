@@ -0,0 +1,128 @@
+import struct
+import zlib
+from functools import reduce
+
+import pytest
+
+from bytechomp import (
+    Reader,
+    Serializer,
+    ByteOrder,
+    ChecksumError,
+    LengthPrefixed,
+    dataclass,
+    Annotated,
+    serialize,
+    serialize_many,
+)
+from bytechomp.datatypes import U8, U16, U32, F32, Checksum, LengthFrom
+
+
+def xor(data: memoryview) -> int:
+    return reduce(lambda checksum, byte: checksum ^ byte, data, 0)
+
+
+@dataclass
+class Header:
+    kind: U8
+    length: U16
+
+
+@dataclass
+class Reading:
+    header: Header
+    value: F32
+    crc: Annotated[U32, Checksum(zlib.crc32)]
+
+
+@dataclass
+class Packet:
+    header: Header
+    payload: Annotated[bytes, LengthFrom("header.length")]
+    header_check: Annotated[U8, Checksum(xor, over=("header",))]
+    crc: Annotated[U32, Checksum(zlib.crc32, over=("header", "header_check"))]
+
+
+READINGS = [Reading(Header(1, 4), 0.5, 0), Reading(Header(2, 4), 1.5, 0)]
+PACKETS = [Packet(Header(1, 3), b"abc", 0, 0), Packet(Header(2, 0), b"", 0, 0)]
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_checksum_filled_by_serialize(byte_order: ByteOrder) -> None:
+    data = serialize(READINGS[0], byte_order)
+    prefix = struct.pack(byte_order.to_pattern() + "BHf", 1, 4, 0.5)
+    assert data[: len(prefix)] == prefix
+    assert data[-4:] == struct.pack(byte_order.to_pattern() + "I", zlib.crc32(prefix))
+
+    serializer = Serializer[Reading](byte_order).allocate()
+    assert serializer.serialize(READINGS[0]) == data
+    buffer = bytearray(serializer.size * 2)
+    serializer.serialize_many_into(READINGS, buffer)
+    assert bytes(buffer) == serialize_many(READINGS, byte_order)
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_checksum_verified_on_build(byte_order: ByteOrder) -> None:
+    data = serialize_many(READINGS, byte_order)
+
+    reader = Reader[Reading](byte_order).allocate()
+    reader << data
+    messages = reader.build_many()
+    assert [message.value for message in messages] == [0.5, 1.5]
+    assert messages[0].crc == zlib.crc32(data[: reader.size - 4])
+    assert reader.invalid_checksums == 0
+
+
+def test_invalid_checksum_raises_or_skips() -> None:
+    data = bytearray(serialize_many(READINGS))
+    data[3] ^= 0xFF
+
+    reader = Reader[Reading]().allocate()
+    reader << bytes(data)
+    with pytest.raises(ChecksumError, match="crc"):
+        reader.build()
+    assert reader.build().value == 1.5  # type: ignore[union-attr]
+    assert reader.invalid_checksums == 1
+
+    reader = Reader[Reading](skip_invalid=True).allocate()
+    reader << bytes(data)
+    assert [message.value for message in reader.build_many()] == [1.5]
+    assert reader.invalid_checksums == 1
+
+
+def test_checksum_over_variable_length_fields() -> None:
+    framing = LengthPrefixed(U16)
+    data = b"".join(framing.wrap(serialize(packet)) for packet in PACKETS)
+
+    reader = Reader[Packet](framing=framing, skip_invalid=True).allocate()
+    reader << data
+    messages = reader.build_many()
+    assert [message.payload for message in messages] == [b"abc", b""]
+    assert messages[0].header_check == xor(memoryview(serialize(Header(1, 3))))
+
+    corrupt = bytearray(data)
+    corrupt[-12] ^= 0xFF  # kind of the second header
+    reader << bytes(corrupt)
+    assert [message.payload for message in reader.build_many()] == [b"abc"]
+    assert reader.invalid_checksums == 1
+
+
+def test_checksum_declaration_errors() -> None:
+    @dataclass
+    class FloatChecksum:
+        value: F32
+        crc: Annotated[F32, Checksum(zlib.crc32)]
+
+    @dataclass
+    class CoversItself:
+        value: F32
+        crc: Annotated[U32, Checksum(zlib.crc32, over=("value", "crc"))]
+
+    @dataclass
+    class UnknownField:
+        value: F32
+        crc: Annotated[U32, Checksum(zlib.crc32, over=("missing",))]
+
+    for datatype in (FloatChecksum, CoversItself, UnknownField):
+        with pytest.raises((TypeError, LookupError)):
+            Reader[datatype]().allocate()  # type: ignore[valid-type]
@@ -0,0 +1,118 @@
+import zlib
+
+import pytest
+
+from bytechomp import DispatchReader, ChecksumError, ByteOrder, dataclass, Annotated, serialize
+from bytechomp.datatypes import U8, U16, U32, F64, Checksum
+
+
+@dataclass
+class Header:
+    kind: U8
+    sequence: U32
+
+
+@dataclass
+class Trade:
+    price: F64
+    quantity: U32
+
+
+@dataclass
+class Quote:
+    bid: F64
+    ask: F64
+    venue: Annotated[bytes, 4]
+
+
+@dataclass
+class Heartbeat:
+    pass
+
+
+def encode(kind: int, sequence: int, body: object, byte_order: ByteOrder) -> bytes:
+    return serialize(Header(kind, sequence), byte_order) + serialize(body, byte_order)
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_dispatch_reader(byte_order: ByteOrder) -> None:
+    reader = DispatchReader(Header, "kind", {1: Trade, 2: Quote, 3: Heartbeat}, byte_order)
+    messages = [
+        (Header(1, 0), Trade(10.5, 100)),
+        (Header(2, 1), Quote(10.0, 11.0, b"XNAS")),
+        (Header(3, 2), Heartbeat()),
+        (Header(1, 3), Trade(11.5, 200)),
+    ]
+    data = b"".join(encode(h.kind, h.sequence, body, byte_order) for h, body in messages)
+
+    # partial buffers, byte by byte
+    received = []
+    for i in range(len(data)):
+        reader << data[i : i + 1]
+        if reader.is_complete():
+            received.append(reader.build())
+            assert not reader.is_complete()
+    assert received == messages
+    assert len(reader) == 0
+
+    # whole buffers
+    reader << data + data[:3]
+    assert reader.build_many(max_count=1) == messages[:1]
+    assert reader.build_many() == messages[1:]
+    assert reader.build() is None
+    assert reader.export() == data[:3]
+
+    # iterator api
+    assert list(reader.iter([data[:10], data[10:], b""])) == messages
+
+
+def test_dispatch_reader_errors() -> None:
+    with pytest.raises(LookupError):
+        DispatchReader(Header, "missing", {1: Trade})
+
+    with pytest.raises(ValueError):
+        DispatchReader(Header, "kind", {1: int})
+
+    reader = DispatchReader(Header, "kind", {1: Trade}, ByteOrder.LITTLE)
+    reader << encode(9, 0, Trade(1.0, 1), ByteOrder.LITTLE)
+    with pytest.raises(LookupError) as e:
+        reader.build()
+    assert str(e.value) == "unknown message type: 9"
+
+
+def test_dispatch_reader_resumes_after_unknown_type() -> None:
+    reader = DispatchReader(Header, "kind", {1: Trade}, ByteOrder.LITTLE)
+    trade = encode(1, 2, Trade(1.5, 3), ByteOrder.LITTLE)
+
+    # the header of the unknown message is dropped, decoding resumes directly after it
+    reader << encode(7, 1, Heartbeat(), ByteOrder.LITTLE) + trade
+    assert reader.is_complete()
+    with pytest.raises(LookupError):
+        reader.build()
+    assert reader.build() == (Header(1, 2), Trade(1.5, 3))
+    assert len(reader) == 0
+
+    reader << encode(7, 1, Heartbeat(), ByteOrder.LITTLE) + trade
+    with pytest.raises(LookupError):
+        reader.build_many()
+    assert reader.build_many() == [(Header(1, 2), Trade(1.5, 3))]
+
+
+@dataclass
+class SignedTrade:
+    price: F64
+    quantity: U32
+    crc: Annotated[U32, Checksum(zlib.crc32)]
+
+
+def test_dispatch_reader_checksums() -> None:
+    reader = DispatchReader(Header, "kind", {1: SignedTrade}, ByteOrder.LITTLE)
+    message = encode(1, 0, SignedTrade(10.5, 100, 0), ByteOrder.LITTLE)
+    corrupted = message[:-5] + b"\xff" + message[-4:]
+
+    reader << message + corrupted + message
+    assert reader.build() == (Header(1, 0), SignedTrade(10.5, 100, zlib.crc32(message[5:-4])))
+    with pytest.raises(ChecksumError):
+        reader.build()
+    assert reader.build() is not None
+    assert len(reader) == 0
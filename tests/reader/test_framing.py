@@ -0,0 +1,158 @@
+import pytest
+
+from bytechomp import (
+    Reader,
+    ByteOrder,
+    LengthPrefixed,
+    SyncWord,
+    Delimiter,
+    dataclass,
+    Annotated,
+    serialize,
+)
+from bytechomp.datatypes import U8, U16, U32, F32, LengthFrom
+
+
+@dataclass
+class Sample:
+    channel: U8
+    value: F32
+
+
+@dataclass
+class Packet:
+    length: U16
+    payload: Annotated[bytes, LengthFrom("length")]
+
+
+SAMPLES = [Sample(1, 0.5), Sample(2, 1.5), Sample(3, 2.5)]
+PACKETS = [Packet(3, b"abc"), Packet(0, b""), Packet(5, b"hello")]
+
+FRAMINGS = [
+    LengthPrefixed(U32),
+    LengthPrefixed(U16, includes_prefix=True),
+    SyncWord(b"\xaa\x55"),
+    Delimiter(b"\r\n\r\n"),
+]
+
+
+def stream(framing, messages, byte_order):  # type: ignore[no-untyped-def]
+    return b"".join(
+        framing.wrap(serialize(message, byte_order), byte_order) for message in messages
+    )
+
+
+@pytest.mark.parametrize("framing", FRAMINGS)
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_framing_round_trip(framing, byte_order: ByteOrder) -> None:  # type: ignore[no-untyped-def]
+    data = stream(framing, SAMPLES, byte_order)
+
+    reader = Reader[Sample](byte_order, framing=framing).allocate()
+    reader << data
+    assert reader.build_many() == SAMPLES
+    assert len(reader) == 0
+    assert reader.dropped_frames == 0
+
+
+@pytest.mark.parametrize("framing", FRAMINGS)
+def test_framing_byte_by_byte(framing) -> None:  # type: ignore[no-untyped-def]
+    data = stream(framing, PACKETS, ByteOrder.BIG)
+
+    reader = Reader[Packet](ByteOrder.BIG, framing=framing).allocate()
+    chunks = [data[index : index + 1] for index in range(len(data))]
+    assert list(reader.iter(chunks)) == PACKETS
+
+
+def test_length_prefixed_drops_invalid_frames() -> None:
+    framing = LengthPrefixed(U16)
+    data = (
+        framing.wrap(serialize(SAMPLES[0]))
+        + framing.wrap(b"\x00" * 3)
+        + framing.wrap(serialize(SAMPLES[1]) + b"\x00")
+        + framing.wrap(serialize(SAMPLES[2]))
+    )
+
+    reader = Reader[Sample](framing=framing).allocate()
+    reader << data
+    assert reader.build_many() == [SAMPLES[0], SAMPLES[2]]
+    assert reader.dropped_frames == 2
+
+
+@pytest.mark.parametrize("garbage", [b"\xff\xff\xff\xff", b"junk"])
+def test_length_prefixed_resynchronizes_after_garbage(garbage: bytes) -> None:
+    framing = LengthPrefixed(U16, max_length=32)
+    data = garbage + stream(framing, SAMPLES, ByteOrder.BIG)
+
+    reader = Reader[Sample](ByteOrder.BIG, framing=framing).allocate()
+    reader << data
+    assert reader.build_many() == SAMPLES
+    assert len(reader) == 0
+
+    # without a maximum length the garbage prefix waits for its announced size
+    reader = Reader[Sample](ByteOrder.BIG, framing=LengthPrefixed(U16)).allocate()
+    reader << data
+    assert reader.build_many() == []
+
+
+def test_sync_word_resynchronizes() -> None:
+    framing = SyncWord(b"\xaa\x55")
+    data = b"garbage" + stream(framing, SAMPLES[:2], ByteOrder.LITTLE)
+
+    reader = Reader[Sample](ByteOrder.LITTLE, framing=framing).allocate()
+    reader << data[:-3]
+    assert reader.build_many() == SAMPLES[:1]
+
+    # the partial message waits for the rest of its bytes
+    reader << data[-3:] + b"\xaa"
+    assert reader.build_many() == SAMPLES[1:2]
+    assert len(reader) == 1
+
+
+@dataclass
+class Pair:
+    a: U8
+    b: U8
+
+
+def test_sync_word_drops_truncated_frames() -> None:
+    framing = SyncWord(b"\xaa\x55")
+    data = framing.wrap(b"\x01") + framing.wrap(serialize(Pair(2, 3)))
+
+    reader = Reader[Pair](framing=framing).allocate()
+    reader << data[:4]
+    # the tail may be the beginning of the next marker, the message waits for more bytes
+    assert reader.build() is None
+    reader << data[4:]
+    assert reader.build_many() == [Pair(2, 3)]
+    assert reader.dropped_frames == 1
+
+    # the same stream received at once
+    reader << data
+    assert list(reader.iter([b""])) == [Pair(2, 3)]
+    assert reader.dropped_frames == 2
+
+
+def test_delimiter_drops_invalid_frames() -> None:
+    framing = Delimiter(b"\n\n")
+    data = b"corrupt\n\n" + stream(framing, SAMPLES, ByteOrder.BIG)
+
+    reader = Reader[Sample](ByteOrder.BIG, framing=framing).allocate()
+    reader << data
+    assert reader.is_complete()
+    assert reader.build_many() == SAMPLES
+    assert reader.dropped_frames == 1
+
+
+def test_framing_declaration_errors() -> None:
+    with pytest.raises(TypeError):
+        LengthPrefixed(F32)
+    with pytest.raises(ValueError):
+        LengthPrefixed(U16, max_length=-1)
+    with pytest.raises(ValueError):
+        SyncWord(b"")
+    with pytest.raises(ValueError):
+        Delimiter(b"")
+
+    reader = Reader[Sample](framing=Delimiter(b"\n")).allocate()
+    with pytest.raises(TypeError, match="framed"):
+        reader.build_columns()
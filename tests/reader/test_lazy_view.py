@@ -0,0 +1,94 @@
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+from bytechomp import Reader, MappedArray, ByteOrder, LazyView, dataclass, Annotated, serialize
+from bytechomp.datatypes import PAD, U8, U16, U32, F64
+
+
+@dataclass
+class Address:
+    host: U32
+    port: U16
+
+
+@dataclass
+class Route:
+    kind: U8
+    destination: Address
+    hops: Annotated[list[Address], 2]
+    weights: Annotated[list[F64], 3]
+    padding: Annotated[list[PAD], 2]
+    label: Annotated[bytes, 3]
+    tail: PAD = 0
+
+
+def build_route(i: int) -> Route:
+    return Route(
+        kind=i,
+        destination=Address(0x7F000001, 8000 + i),
+        hops=[Address(1, 2), Address(3, 4)],
+        weights=[0.5, 1.5, 2.5],
+        padding=[0, 0],
+        label=b"abc",
+    )
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_reader_view(byte_order: ByteOrder) -> None:
+    reader = Reader[Route](byte_order).allocate()
+    assert reader.view() is None
+
+    reader << serialize(build_route(1), byte_order) + serialize(build_route(2), byte_order)
+
+    view = reader.view()
+    assert isinstance(view, LazyView)
+    assert len(reader) == reader.size
+
+    assert view.kind == 1
+    assert isinstance(view.destination, LazyView)
+    assert view.destination.port == 8001
+    assert [hop.host for hop in view.hops] == [1, 3]
+    assert view.weights == [0.5, 1.5, 2.5]
+    assert view.padding == [0, 0]
+    assert view.label == b"abc"
+    assert view.tail == 0
+    assert view.materialize() == build_route(1)
+    assert view.destination.materialize() == Address(0x7F000001, 8001)
+    assert view.hops[1].materialize() == Address(3, 4)
+
+    with pytest.raises(AttributeError):
+        view.missing
+
+    # views do not depend on the reader buffer
+    reader.clear()
+    assert view.materialize() == build_route(1)
+
+
+def test_mapped_array_view(tmp_path: Path) -> None:
+    path = tmp_path / "routes.dat"
+    path.write_bytes(b"".join(serialize(build_route(i), ByteOrder.BIG) for i in range(5)))
+
+    with MappedArray[Route](path, ByteOrder.BIG).allocate() as array:
+        assert array.view(3).destination.port == 8003
+        assert array.view(-1).materialize() == build_route(4)
+        with pytest.raises(IndexError):
+            array.view(5)
+
+
+def test_view_copy() -> None:
+    reader = Reader[Route](ByteOrder.BIG).allocate()
+    reader << serialize(build_route(5), ByteOrder.BIG)
+    view = reader.view()
+    assert view is not None
+
+    for duplicate in (copy.copy(view), copy.deepcopy(view), pickle.loads(pickle.dumps(view))):
+        assert duplicate.kind == 5
+        assert duplicate.destination.port == 8005
+        assert duplicate.materialize() == build_route(5)
+    assert copy.copy(view.destination).port == 8005
+
+    with pytest.raises(TypeError):
+        pickle.dumps(view.destination)
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from bytechomp import MappedArray, ByteOrder, dataclass
+
+from tests.reader.records import Record, write_records
+
+
+def test_mapped_array_random_access(tmp_path: Path) -> None:
+    path = tmp_path / "records.dat"
+    records = write_records(path, 100, trailer=b"\x01\x02\x03")
+
+    with MappedArray[Record](path, ByteOrder.LITTLE).allocate() as array:
+        # the trailing partial record is ignored
+        assert len(array) == 100
+        assert array[0] == records[0]
+        assert array[42] == records[42]
+        assert array[-1] == records[-1]
+        assert array[10:20] == records[10:20]
+        assert array[::-25] == records[::-25]
+        assert array[200:] == []
+
+        with pytest.raises(IndexError):
+            array[100]
+
+
+def test_mapped_array_iteration(tmp_path: Path) -> None:
+    path = tmp_path / "records.dat"
+    records = write_records(path, 10000, header=b"HEADER")
+
+    array = MappedArray[Record](path, ByteOrder.LITTLE, offset=6, compiled=False).allocate()
+    assert list(array) == records
+    array.close()
+    assert len(array) == 0
+
+
+def test_mapped_array_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.dat"
+    path.write_bytes(b"")
+
+    with MappedArray[Record](path).allocate() as array:
+        assert len(array) == 0
+        assert list(array) == []
+        assert array[:] == []
+
+    with pytest.raises(ValueError):
+        MappedArray[Record](path, offset=1).allocate()
+
+
+@dataclass
+class Empty:
+    pass
+
+
+def test_mapped_array_empty_records(tmp_path: Path) -> None:
+    path = tmp_path / "empty.dat"
+    path.write_bytes(b"\x00" * 8)
+
+    with MappedArray[Empty](path).allocate() as array:
+        assert len(array) == 0
+        assert list(array) == []
@@ -0,0 +1,131 @@
+from dataclasses import make_dataclass
+import struct
+import zlib
+
+import pytest
+
+from bytechomp import Reader, Serializer, ByteOrder, dataclass, Annotated, serialize_many
+from bytechomp.datatypes import PAD, U8, U16, U32, I64, F32, Checksum
+
+np = pytest.importorskip("numpy")
+
+
+@dataclass
+class Point:
+    x: U8
+    y: U32
+
+
+@dataclass
+class Telemetry:
+    kind: U8
+    padding: Annotated[list[PAD], 3]
+    origin: Point
+    samples: Annotated[list[F32], 4]
+    path: Annotated[list[Point], 3]
+    name: Annotated[bytes, 5]
+    counter: I64
+    flags: U16
+
+
+def build_records(count: int) -> list[Telemetry]:
+    return [
+        Telemetry(
+            kind=i % 256,
+            padding=[0, 0, 0],
+            origin=Point(i % 3, i * 10),
+            samples=[0.5 * i, 1.0, 2.0, 3.0],
+            path=[Point(1, i), Point(2, i + 1), Point(3, i + 2)],
+            name=b"probe",
+            counter=-i,
+            flags=7,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_to_numpy(byte_order: ByteOrder) -> None:
+    records = build_records(20)
+    data = serialize_many(records, byte_order) + b"\x01"
+
+    reader = Reader[Telemetry](byte_order).allocate()
+    array = reader.to_numpy(data)
+
+    assert array.dtype.itemsize == reader.size
+    assert len(array) == 20
+    assert array["kind"].tolist() == [record.kind for record in records]
+    assert array["origin"]["y"].tolist() == [record.origin.y for record in records]
+    assert array["samples"][4].tolist() == records[4].samples
+    assert array["path"]["y"][5].tolist() == [point.y for point in records[5].path]
+    assert array["name"][0] == b"probe"
+    assert array["counter"].tolist() == [record.counter for record in records]
+    assert array["flags"].tolist() == [7] * 20
+    assert "padding" not in array.dtype.names
+
+    # the array is a view over the original data
+    assert not array.flags.owndata
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+def test_from_numpy(byte_order: ByteOrder) -> None:
+    records = build_records(10)
+    data = serialize_many(records, byte_order)
+
+    reader = Reader[Telemetry](byte_order).allocate()
+    serializer = Serializer[Telemetry](byte_order).allocate()
+
+    array = reader.to_numpy(data)
+    assert serializer.from_numpy(array) == data
+
+    # arrays with another layout are converted field by field
+    unpadded = np.zeros(len(array), dtype=[("kind", "u2"), ("counter", "i8")])
+    unpadded["kind"] = array["kind"]
+    unpadded["counter"] = array["counter"]
+    converted = reader.to_numpy(serializer.from_numpy(unpadded))
+    assert converted["kind"].tolist() == array["kind"].tolist()
+    assert converted["counter"].tolist() == array["counter"].tolist()
+
+
+@dataclass
+class Signed:
+    identity: U32
+    value: F32
+    crc: Annotated[U32, Checksum(zlib.crc32)]
+
+
+def test_from_numpy_fills_checksums() -> None:
+    records = [Signed(i, i / 2, 0) for i in range(5)]
+    data = serialize_many(records, ByteOrder.BIG)
+
+    reader = Reader[Signed](ByteOrder.BIG).allocate()
+    serializer = Serializer[Signed](ByteOrder.BIG).allocate()
+    array = reader.to_numpy(data).copy()
+    array["crc"] = 0
+    array["value"][1] = 8.0
+
+    records[1].value = 8.0
+    assert serializer.from_numpy(array) == serialize_many(records, ByteOrder.BIG)
+
+
+def test_deeply_nested_dtype() -> None:
+    # the offsets of the nested structures come from a single walk over the record layout
+    datatype: type = Point
+    for depth in range(40):
+        datatype = dataclass(make_dataclass(f"Level{depth}", [("inner", datatype), ("depth", U8)]))
+
+    reader = Reader[datatype](ByteOrder.LITTLE).allocate()
+    array = reader.to_numpy(bytes(range(45)))
+    assert array.dtype.itemsize == 45
+    assert array["depth"][0] == 44
+    assert array["inner"]["depth"][0] == 43
+
+
+@dataclass
+class Empty:
+    pass
+
+
+def test_empty_records() -> None:
+    reader = Reader[Empty]().allocate()
+    assert len(reader.to_numpy(b"\x00" * 8)) == 0
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from bytechomp import ByteOrder
+from bytechomp.parallel import decode_file, decode_file_columns
+
+from tests.reader.records import Record, write_records
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_decode_file_in_order(tmp_path: Path, workers: int) -> None:
+    path = tmp_path / "records.bin"
+    records = write_records(path, 2500, header=b"HDR", trailer=b"\x01\x02")
+
+    decoded = decode_file(
+        path,
+        Record,
+        workers=workers,
+        byte_order=ByteOrder.LITTLE,
+        offset=3,
+        batch_records=256,
+        min_parallel_bytes=0,
+    )
+    assert list(decoded) == records
+
+
+def test_decode_file_small_input_in_process(tmp_path: Path) -> None:
+    path = tmp_path / "records.bin"
+    records = write_records(path, 10)
+    assert list(decode_file(path, Record, workers=4, byte_order=ByteOrder.LITTLE)) == records
+    assert list(decode_file(path, Record, byte_order=ByteOrder.LITTLE, compiled=False)) == records
+
+
+def test_decode_file_columns(tmp_path: Path) -> None:
+    path = tmp_path / "records.bin"
+    write_records(path, 1000)
+
+    batches = list(
+        decode_file_columns(
+            path,
+            Record,
+            workers=2,
+            byte_order=ByteOrder.LITTLE,
+            batch_records=300,
+            min_parallel_bytes=0,
+        )
+    )
+    assert [len(batch["identity"]) for batch in batches] == [300, 300, 300, 100]
+    assert [i for batch in batches for i in batch["identity"]] == list(range(1000))
+    assert batches[-1]["value"][-1] == 999 * 0.5
+    assert batches[0]["tag"][:2] == [b"0000", b"0001"]
+
+
+def test_decode_file_errors(tmp_path: Path) -> None:
+    path = tmp_path / "records.bin"
+    write_records(path, 4)
+
+    with pytest.raises(ValueError):
+        decode_file(path, Record, offset=1000)
+    with pytest.raises(ValueError):
+        decode_file(path, int)
+    with pytest.raises(ValueError):
+        decode_file(path, Record, batch_records=0)
+
+    (tmp_path / "empty.bin").write_bytes(b"")
+    assert not list(decode_file(tmp_path / "empty.bin", Record, workers=2, min_parallel_bytes=0))
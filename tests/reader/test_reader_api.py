@@ -2,6 +2,7 @@ import struct
 from random import randbytes, randint
 
 from bytechomp import Reader, dataclass, Annotated, ByteOrder
+from bytechomp.stream_buffer import COMPACT_THRESHOLD
 from bytechomp.datatypes import (
     U8,
     U16,
@@ -570,3 +571,113 @@ def test_reader_len() -> None:
 
     reader.clear()
     assert len(reader) == 0
+
+
+def test_reader_large_buffer_drain() -> None:
+    reader = Reader[BasicMessage]().allocate()
+
+    pattern = ByteOrder.NATIVE.to_pattern() + "BHIQbhiqefdQd"
+    count = 2 * COMPACT_THRESHOLD // struct.calcsize(pattern) + 1
+    data = b"".join(
+        struct.pack(pattern, i % 256, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, 11.0, i, 13.0)
+        for i in range(count)
+    )
+
+    # leave a partial message at the end of the buffer
+    reader << data + data[:5]
+    assert len(reader) == len(data) + 5
+
+    for i in range(count):
+        msg = reader.build()
+        assert isinstance(msg, BasicMessage)
+        assert msg.int_native == i
+        assert len(reader) == len(data) + 5 - (i + 1) * struct.calcsize(pattern)
+
+    assert not reader.is_complete()
+    assert reader.build() is None
+    assert reader.export() == data[:5]
+    assert len(reader) == 0
+
+
+def test_build_many_api() -> None:
+    reader = Reader[BasicMessage]().allocate()
+    assert reader.build_many() == []
+
+    pattern = ByteOrder.NATIVE.to_pattern() + "BHIQbhiqefdQd"
+    data = b"".join(
+        struct.pack(pattern, 1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, 11.0, i, 13.0) for i in range(10)
+    )
+
+    reader << data + data[:7]
+
+    # limit the number of messages built
+    messages = reader.build_many(max_count=3)
+    assert [msg.int_native for msg in messages] == [0, 1, 2]
+    assert len(reader) == len(data) + 7 - 3 * struct.calcsize(pattern)
+
+    # build all remaining complete messages
+    messages = reader.build_many()
+    assert all(isinstance(msg, BasicMessage) for msg in messages)
+    assert [msg.int_native for msg in messages] == list(range(3, 10))
+    assert len(reader) == 7
+    assert not reader.is_complete()
+
+    # complete the trailing partial message
+    reader << data[7 : struct.calcsize(pattern)]
+    messages = reader.build_many()
+    assert len(messages) == 1
+    assert messages[0].int_native == 0
+    assert len(reader) == 0
+
+
+@dataclass
+class EmptyMessage:
+    pass
+
+
+def test_empty_message() -> None:
+    reader = Reader[EmptyMessage]().allocate()
+
+    # a message without fields is always complete, a single one is built per call
+    assert list(reader.iter([b"x", b"y"])) == [EmptyMessage(), EmptyMessage()]
+    assert reader.build_many() == [EmptyMessage()]
+    assert reader.build_many(max_count=3) == [EmptyMessage()] * 3
+    assert reader.build_columns() == {}
+    assert len(reader) == 2
+
+
+def test_iterator_drains_every_chunk() -> None:
+    reader = Reader[BasicMessage]().allocate()
+
+    pattern = ByteOrder.NATIVE.to_pattern() + "BHIQbhiqefdQd"
+    size = struct.calcsize(pattern)
+    data = b"".join(
+        struct.pack(pattern, 1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, 11.0, i, 13.0) for i in range(5000)
+    )
+    chunks = [data[i : i + 4096] for i in range(0, len(data), 4096)]
+
+    received = []
+    for msg in reader.iter(chunks):
+        # the buffer never holds more than one partial message
+        assert len(reader) < size
+        received.append(msg.int_native)
+
+    assert received == list(range(5000))
+    assert len(reader) == 0
+
+
+def test_iterator_flush() -> None:
+    reader = Reader[BasicMessage]().allocate()
+
+    pattern = ByteOrder.NATIVE.to_pattern() + "BHIQbhiqefdQd"
+    data = struct.pack(pattern, 1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, 11.0, 12, 13.0)
+
+    # data already buffered is not built without a new chunk unless flushed
+    reader << data
+    assert list(reader.iter([])) == []
+    assert len(reader) == len(data)
+
+    messages = list(reader.iter([], flush=True))
+    assert len(messages) == 1
+    assert messages[0].int_native == 12
+    assert len(reader) == 0
@@ -1,9 +1,11 @@
+from array import array
 import struct
 
 import pytest
 
 from bytechomp import Reader, dataclass, Annotated, ByteOrder
 from bytechomp.datatypes import (
+    PAD,
     U8,
     U16,
     U32,
@@ -17,6 +19,8 @@ from bytechomp.datatypes import (
     F64,
 )
 from bytechomp.datatypes.lookups import TYPE_TO_TAG
+from bytechomp.data_descriptor import build_data_description, build_structure, prove_basic_types
+from bytechomp.decoder import compile_decoder, generate_decoder_source
 
 
 @dataclass
@@ -382,3 +386,224 @@ def test_read_nested_list_data() -> None:
     with pytest.raises(Exception) as e:
         reader = Reader[NestedListMessage]().allocate()
     assert str(e.value).startswith("unsupported list type")
+
+
+@dataclass
+class PaddedMessage:
+    first: U8
+    padding: Annotated[list[PAD], 3]
+    nested: NestedStructuredListMessage
+    values: Annotated[list[F32], 4]
+    tail: PAD = 0
+
+
+def test_compiled_matches_interpreted() -> None:
+    compiled = Reader[PaddedMessage]().allocate()
+    interpreted = Reader[PaddedMessage](compiled=False).allocate()
+
+    pattern = f"{ByteOrder.NATIVE.to_pattern()}Bxxx{TYPE_TO_TAG[int] * 8}ffffx"
+    data = struct.pack(pattern, 7, *range(8), 1.0, 2.0, 3.0, 4.0)
+
+    compiled << data
+    interpreted << data
+
+    compiled_msg = compiled.build()
+    interpreted_msg = interpreted.build()
+    assert isinstance(compiled_msg, PaddedMessage)
+    assert compiled_msg == interpreted_msg
+    assert compiled_msg.first == 7
+    assert compiled_msg.padding == [0, 0, 0]
+    assert compiled_msg.nested.data[1].data_inner_beta.data_beta == 7
+    assert compiled_msg.values == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_interpreted_structure_does_not_consume_values() -> None:
+    description = build_data_description(PaddedMessage)
+    values = (7, *range(8), 1.0, 2.0, 3.0, 4.0)
+
+    message = build_structure(values, description)
+    assert message == build_structure(list(values), description)
+    assert message.padding == [0, 0, 0]
+    assert message.nested.data[1].data_inner_beta.data_alpha == 6
+    assert message.values == [1.0, 2.0, 3.0, 4.0]
+
+
+@dataclass
+class LargeListMessage:
+    header: U16
+    samples: Annotated[list[U32], 50_000]
+
+
+def test_interpreted_large_list() -> None:
+    reader = Reader[LargeListMessage](ByteOrder.LITTLE, compiled=False).allocate()
+    reader.feed(struct.pack("<H50000I", 3, *range(50_000)))
+    message = reader.build()
+    assert message.header == 3
+    assert message.samples == list(range(50_000))
+
+
+def test_prove_basic_types() -> None:
+    description = build_data_description(PaddedMessage)
+    prove_basic_types(description)
+
+    description["first"].python_type = float
+    with pytest.raises(TypeError):
+        prove_basic_types(description)
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_strict_reader_matches(compiled: bool) -> None:
+    reader = Reader[PaddedMessage](compiled=compiled, strict=True).allocate()
+    reader << struct.pack(f"@Bxxx{TYPE_TO_TAG[int] * 8}ffffx", 7, *range(8), 1.0, 2.0, 3.0, 4.0)
+    message = reader.build()
+    assert message is not None
+    assert message.values == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_strict_decoding_checks_values() -> None:
+    description = build_data_description(PaddedMessage)
+    values = (7, *range(8), 1.0, 2.0, "3.0", 4.0)
+
+    # without strict mode, values are trusted to come from the struct module
+    assert build_structure(values, description).values[2] == "3.0"
+    assert compile_decoder(description)(values).values[2] == "3.0"
+
+    with pytest.raises(TypeError):
+        build_structure(values, description, strict=True)
+    with pytest.raises(TypeError):
+        compile_decoder(description, strict=True)(values)
+    with pytest.raises(TypeError):
+        compile_decoder(description, strict=True)((7.5, *values[1:]))
+
+
+@dataclass(kw_only=True)
+class KeywordMessage:
+    first: U8
+    second: U16
+
+
+def test_decoder_arguments() -> None:
+    # fields in constructor order are passed positionally
+    source, _ = generate_decoder_source(build_data_description(PaddedMessage))
+    assert "first=" not in source
+
+    source, _ = generate_decoder_source(build_data_description(KeywordMessage))
+    assert "first=v[0], second=v[1]" in source
+
+    reader = Reader[KeywordMessage](ByteOrder.LITTLE).allocate()
+    reader << struct.pack("<BH", 1, 2)
+    assert reader.build() == KeywordMessage(first=1, second=2)
+
+
+def test_generated_decoder_source() -> None:
+    source, namespace = generate_decoder_source(build_data_description(StructuredListMessage))
+    assert "def decode(v):" in source
+    assert "range(0, 4, 2)" in source
+    assert StructuredListMessage in namespace.values()
+    assert InnerMessage in namespace.values()
+
+
+@dataclass
+class Sample:
+    channel: U8
+    value: F32
+
+
+@dataclass
+class ColumnMessage:
+    identity: U32
+    header: InnerMessage
+    readings: Annotated[list[F16], 2]
+    samples: Annotated[list[Sample], 2]
+    label: Annotated[bytes, 3]
+    padding: PAD = 0
+
+
+def test_build_columns() -> None:
+    reader = Reader[ColumnMessage](ByteOrder.LITTLE).allocate()
+
+    pattern = "<IQQeeBfBf3sx"
+    for i in range(5):
+        reader << struct.pack(pattern, i, 10 * i, 20 * i, 0.5, 1.5, 1, 1.0 * i, 2, 2.0 * i, b"abc")
+    reader << b"\x00\x01"
+
+    columns = reader.build_columns(max_count=4)
+    assert list(columns) == [
+        "identity",
+        "header.data_alpha",
+        "header.data_beta",
+        "readings[0]",
+        "readings[1]",
+        "samples[0].channel",
+        "samples[0].value",
+        "samples[1].channel",
+        "samples[1].value",
+        "label",
+    ]
+    assert isinstance(columns["identity"], array)
+    assert columns["identity"].typecode == "I"
+    assert columns["identity"].tolist() == [0, 1, 2, 3]
+    assert columns["header.data_beta"].tolist() == [0, 20, 40, 60]
+    assert columns["readings[1]"].tolist() == [1.5] * 4
+    assert columns["samples[1].value"].tolist() == [0.0, 2.0, 4.0, 6.0]
+    assert columns["label"] == [b"abc"] * 4
+
+    # the remaining complete message, the partial message stays buffered
+    columns = reader.build_columns()
+    assert columns["identity"].tolist() == [4]
+    assert len(reader) == 2
+
+    columns = reader.build_columns()
+    assert columns["identity"].tolist() == []
+    assert len(reader) == 2
+
+
+@dataclass
+class RoutedHeader:
+    message_type: U8
+    length: U32
+
+
+@dataclass
+class RoutedMessage:
+    header: RoutedHeader
+    payload: Annotated[list[U16], 2]
+    padding: PAD = 0
+
+
+def test_layout_table() -> None:
+    native = Reader[RoutedMessage]().allocate().layout
+    assert list(native) == ["header.message_type", "header.length", "payload[0]", "payload[1]", "padding"]
+    assert [(field.offset, field.size, field.tag) for field in native.values()] == [
+        (0, 1, "B"),
+        (struct.calcsize("@BI") - 4, 4, "I"),
+        (struct.calcsize("@BIH") - 2, 2, "H"),
+        (struct.calcsize("@BIHH") - 2, 2, "H"),
+        (struct.calcsize("@BIHH"), 1, "x"),
+    ]
+
+    little = Reader[RoutedMessage](ByteOrder.LITTLE).allocate().layout
+    assert [(field.offset, field.size) for field in little.values()] == [
+        (0, 1), (1, 4), (5, 2), (7, 2), (9, 1)
+    ]
+
+
+def test_peek() -> None:
+    reader = Reader[RoutedMessage](ByteOrder.BIG).allocate()
+    assert reader.peek("header.message_type") is None
+
+    data = struct.pack(">BIHHx", 7, 1000, 1, 2)
+    reader << data[:1]
+    assert reader.peek("header.message_type") == 7
+    assert reader.peek("header.length") is None
+
+    reader << data[1:]
+    assert reader.peek("header.length") == 1000
+    assert reader.peek("payload[1]") == 2
+    assert reader.peek("padding") == 0
+    assert len(reader) == len(data)
+
+    with pytest.raises(KeyError):
+        reader.peek("header")
+
+    assert reader.build() == RoutedMessage(RoutedHeader(7, 1000), [1, 2])
@@ -0,0 +1,154 @@
+import asyncio
+import pickle
+from array import array
+from dataclasses import fields, is_dataclass
+
+import pytest
+
+from bytechomp import (
+    AsyncReader,
+    Reader,
+    Schema,
+    Representation,
+    ListRepresentation,
+    dataclass,
+    Annotated,
+    ByteOrder,
+    serialize,
+)
+from bytechomp.datatypes import U8, U16, F32, PAD, LengthFrom
+from bytechomp.representation import compact_type
+
+
+@dataclass
+class Point:
+    x: F32
+    y: F32
+
+
+@dataclass
+class Trace:
+    channel: U16
+    samples: Annotated[list[U16], 3]
+    points: Annotated[list[Point], 2]
+    origin: Point
+    padding: Annotated[list[PAD], 2]
+
+
+TRACE = Trace(4, [1, 2, 3], [Point(1.0, 2.0), Point(3.0, 4.0)], Point(0.5, 0.25), [0, 0])
+DATA = serialize(TRACE, ByteOrder.LITTLE)
+
+
+def decode(data: bytes, **kwargs) -> Trace:
+    reader = Reader[Trace](ByteOrder.LITTLE, **kwargs).allocate()
+    reader.feed(data)
+    message = reader.build()
+    assert message is not None
+    return message
+
+
+def test_slots_representation() -> None:
+    message = decode(DATA, representation=Representation.SLOTS)
+    assert type(message) is compact_type(Trace, Representation.SLOTS)
+    assert type(message).__name__ == "Trace_slots"
+    assert repr(message).startswith("Trace_slots(channel=4,")
+    assert message != TRACE
+    assert is_dataclass(message) and not hasattr(message, "__dict__")
+    assert [field.name for field in fields(message)] == [field.name for field in fields(Trace)]
+    assert type(message.origin) is compact_type(Point, Representation.SLOTS)
+    assert message == decode(DATA, representation=Representation.SLOTS)
+    assert message.samples == [1, 2, 3]
+
+
+def test_namedtuple_representation() -> None:
+    message = decode(DATA, representation=Representation.NAMEDTUPLE)
+    assert message.channel == 4
+    assert message.points[1].y == 4.0
+    assert message._fields == ("channel", "samples", "points", "origin", "padding")
+    assert tuple(message.origin) == (0.5, 0.25)
+    assert type(message.origin).__name__ == "Point_namedtuple"
+
+
+@pytest.mark.parametrize("representation", [Representation.SLOTS, Representation.NAMEDTUPLE])
+def test_pickle_representation(representation: Representation) -> None:
+    message = decode(DATA, representation=representation)
+    copy = pickle.loads(pickle.dumps(message))
+    assert copy == message
+    assert type(copy) is type(message) and type(copy.origin) is type(message.origin)
+
+
+def test_tuple_representation() -> None:
+    message = decode(DATA, representation=Representation.TUPLE, lists=ListRepresentation.TUPLE)
+    assert message == (4, (1, 2, 3), ((1.0, 2.0), (3.0, 4.0)), (0.5, 0.25), (0, 0))
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_list_representations(strict: bool) -> None:
+    message = decode(DATA, lists=ListRepresentation.TUPLE, strict=strict)
+    assert isinstance(message, Trace)
+    assert message.samples == (1, 2, 3)
+    assert message.points == (Point(1.0, 2.0), Point(3.0, 4.0))
+
+    message = decode(DATA, lists=ListRepresentation.ARRAY, strict=strict)
+    assert message.samples == array("H", [1, 2, 3])
+    assert message.points == (Point(1.0, 2.0), Point(3.0, 4.0))
+    assert message.padding == (0, 0)
+
+
+@dataclass
+class Blob:
+    length: U8
+    values: Annotated[list[F32], LengthFrom("length")]
+    name: Annotated[bytes, LengthFrom("length")]
+
+
+def test_variable_length_representations() -> None:
+    data = serialize(Blob(2, [1.0, 2.0], b"ab"), ByteOrder.LITTLE)
+    reader = Reader[Blob](
+        ByteOrder.LITTLE, representation=Representation.TUPLE, lists=ListRepresentation.ARRAY
+    ).allocate()
+    reader.feed(data)
+    assert reader.build() == (2, array("f", [1.0, 2.0]), b"ab")
+
+
+def test_shared_schema_representation() -> None:
+    schema = Schema[Trace](ByteOrder.LITTLE).allocate()
+    reader = Reader.of(schema, representation=Representation.NAMEDTUPLE)
+    default = Reader.of(schema)
+    reader.feed(DATA * 2)
+    default.feed(DATA)
+
+    assert [message.channel for message in reader.build_many()] == [4, 4]
+    assert default.build() == TRACE
+
+
+@dataclass
+class Path:
+    count: U8
+    points: Annotated[list[Point], LengthFrom("count")]
+
+
+def test_async_representation() -> None:
+    schema = Schema[Trace](ByteOrder.LITTLE).allocate()
+
+    async def run(reader: AsyncReader[Trace]) -> list[Trace]:
+        stream = asyncio.StreamReader()
+        stream.feed_data(DATA * 2)
+        stream.feed_eof()
+        return [message async for message in reader.iter_stream(stream)]
+
+    allocated = AsyncReader[Trace](ByteOrder.LITTLE, representation=Representation.NAMEDTUPLE)
+    shared = AsyncReader.of(
+        schema, representation=Representation.TUPLE, lists=ListRepresentation.TUPLE
+    )
+    assert [message.channel for message in asyncio.run(run(allocated.allocate()))] == [4, 4]
+    assert asyncio.run(run(shared))[1][1] == (1, 2, 3)
+
+
+def test_representation_errors() -> None:
+    with pytest.raises(ValueError):
+        Reader[Trace](compiled=False, representation=Representation.SLOTS)
+    with pytest.raises(TypeError):
+        Reader[Path](representation=Representation.TUPLE).allocate()
+    with pytest.raises(TypeError):
+        Reader[Trace](ByteOrder.LITTLE, True, None)  # options are keyword-only
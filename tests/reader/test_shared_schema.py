@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bytechomp import (
+    Reader,
+    AsyncReader,
+    Schema,
+    dataclass,
+    Annotated,
+    ByteOrder,
+    LengthPrefixed,
+    serialize,
+)
+from bytechomp.datatypes import U16, U32, F32
+from bytechomp.schema import get_schema
+
+
+@dataclass
+class Sample:
+    channel: U16
+    sequence: U32
+    values: Annotated[list[F32], 3]
+
+
+def test_schema_properties() -> None:
+    schema = Schema[Sample](ByteOrder.BIG).allocate()
+    assert schema.datatype is Sample
+    assert schema.byte_order is ByteOrder.BIG
+    assert schema.size == 2 + 4 + 3 * 4
+    assert schema.compiled is get_schema(Sample, ByteOrder.BIG)
+    assert list(schema.layout) == ["channel", "sequence", "values[0]", "values[1]", "values[2]"]
+
+
+def test_schema_errors() -> None:
+    with pytest.raises(RuntimeError):
+        Schema[Sample]().datatype  # pylint: disable=expression-not-assigned
+    with pytest.raises(ValueError):
+        Schema[int]().allocate()
+
+
+def test_readers_share_schema() -> None:
+    schema = Schema[Sample](ByteOrder.LITTLE).allocate()
+    data = serialize(Sample(1, 2, [1.0, 2.0, 3.0]), ByteOrder.LITTLE)
+
+    first = Reader.of(schema)
+    second = Reader.of(schema, compiled=False)
+    first.feed(data + data[:5])
+    second.feed(data)
+
+    assert first.build() == second.build() == Sample(1, 2, [1.0, 2.0, 3.0])
+    assert len(first) == 5 and len(second) == 0
+    assert first.size == second.size == schema.size
+
+
+def test_reader_of_framed() -> None:
+    schema = Schema[Sample](ByteOrder.LITTLE).allocate()
+    framing = LengthPrefixed(U16)
+    data = framing.wrap(serialize(Sample(4, 5, [0.0] * 3), ByteOrder.LITTLE), ByteOrder.LITTLE)
+
+    reader = Reader.of(schema, framing=framing)
+    reader.feed(data)
+    assert reader.build() == Sample(4, 5, [0.0] * 3)
+
+
+def test_readers_per_thread() -> None:
+    schema = Schema[Sample](ByteOrder.LITTLE).allocate()
+
+    def ingest(channel: int) -> list[Sample]:
+        reader = Reader.of(schema)
+        chunks = [
+            serialize(Sample(channel, sequence, [float(sequence)] * 3), ByteOrder.LITTLE)
+            for sequence in range(500)
+        ]
+        return list(reader.iter(chunks))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(ingest, range(16)))
+
+    for channel, messages in enumerate(results):
+        assert [message.sequence for message in messages] == list(range(500))
+        assert all(message.channel == channel for message in messages)
+
+
+def test_async_reader_of() -> None:
+    schema = Schema[Sample]().allocate()
+    data = serialize(Sample(7, 8, [1.0, 1.0, 1.0])) * 3
+
+    async def run() -> list[Sample]:
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        reader = AsyncReader.of(schema)
+        return [message async for message in reader.iter_stream(stream)]
+
+    assert asyncio.run(run()) == [Sample(7, 8, [1.0, 1.0, 1.0])] * 3
@@ -0,0 +1,137 @@
+import struct
+
+import pytest
+
+from bytechomp import Reader, Serializer, ByteOrder, dataclass, Annotated, serialize
+from bytechomp.datatypes import U8, U16, U32, I8, F32, LengthFrom
+
+
+@dataclass
+class Point:
+    x: U16
+    y: U16
+
+
+@dataclass
+class Header:
+    kind: U8
+    length: U16
+
+
+@dataclass
+class Frame:
+    header: Header
+    payload: Annotated[bytes, LengthFrom("header.length")]
+    count: U8
+    samples: Annotated[list[F32], LengthFrom("count")]
+    points: Annotated[list[Point], LengthFrom("count")]
+    trailer: U32
+
+
+@dataclass
+class Packet:
+    length: U16
+    payload: Annotated[bytes, LengthFrom("length")]
+
+
+FRAMES = [
+    Frame(Header(1, 3), b"abc", 2, [1.5, 2.5], [Point(1, 2), Point(3, 4)], 7),
+    Frame(Header(2, 0), b"", 0, [], [], 8),
+    Frame(Header(3, 5), b"hello", 1, [0.25], [Point(5, 6)], 9),
+]
+
+
+def test_variable_length_wire_format() -> None:
+    data = serialize(Packet(3, b"abc"), ByteOrder.BIG)
+    assert data == struct.pack(">H3s", 3, b"abc")
+
+
+@pytest.mark.parametrize("byte_order", list(ByteOrder))
+@pytest.mark.parametrize("compiled", [True, False])
+def test_variable_length_round_trip(byte_order: ByteOrder, compiled: bool) -> None:
+    data = b"".join(serialize(frame, byte_order) for frame in FRAMES)
+
+    reader = Reader[Frame](byte_order, compiled=compiled).allocate()
+    reader.feed(data)
+    assert reader.build_many() == FRAMES
+    assert len(reader) == 0
+
+
+def test_variable_length_byte_by_byte() -> None:
+    data = b"".join(serialize(frame) for frame in FRAMES)
+
+    reader = Reader[Frame]().allocate()
+    messages = []
+    for index in range(len(data)):
+        reader << data[index : index + 1]
+        if reader.is_complete():
+            messages.append(reader.build())
+    assert messages == FRAMES
+    assert reader.build() is None
+
+
+def test_variable_length_iter_and_serializer() -> None:
+    serializer = Serializer[Frame]().allocate()
+    data = b"".join(serializer.serialize(frame) for frame in FRAMES)
+    assert data == b"".join(serialize(frame) for frame in FRAMES)
+
+    reader = Reader[Frame]().allocate()
+    chunks = [data[index : index + 5] for index in range(0, len(data), 5)]
+    assert list(reader.iter(chunks)) == FRAMES
+
+
+def test_variable_length_clear_resets_progress() -> None:
+    reader = Reader[Packet]().allocate()
+    reader << serialize(Packet(4, b"abcd"))[:3]
+    assert not reader.is_complete()
+    reader.clear()
+
+    reader << serialize(Packet(2, b"xy"))
+    assert reader.build() == Packet(2, b"xy")
+
+
+def test_variable_length_validation() -> None:
+    with pytest.raises(TypeError, match="requires a length of 2"):
+        serialize(Packet(2, b"abc"))
+    with pytest.raises(TypeError, match="requires a length of 2"):
+        Serializer[Packet]().allocate().serialize(Packet(2, b"abc"))
+
+    @dataclass
+    class Negative:
+        length: I8
+        payload: Annotated[bytes, LengthFrom("length")]
+
+    reader = Reader[Negative]().allocate()
+    reader << b"\xff"
+    with pytest.raises(ValueError, match="negative length"):
+        reader.build()
+
+
+def test_variable_length_declaration_errors() -> None:
+    @dataclass
+    class AfterField:
+        payload: Annotated[bytes, LengthFrom("length")]
+        length: U8
+
+    @dataclass
+    class FloatLength:
+        length: F32
+        payload: Annotated[bytes, LengthFrom("length")]
+
+    @dataclass
+    class Nested:
+        packet: Packet
+
+    for datatype in (AfterField, FloatLength, Nested):
+        with pytest.raises(TypeError):
+            Reader[datatype]().allocate()  # type: ignore[valid-type]
+
+
+def test_variable_length_fixed_size_apis() -> None:
+    reader = Reader[Packet]().allocate()
+    with pytest.raises(TypeError, match="no fixed message size"):
+        reader.size
+    with pytest.raises(TypeError, match="no fixed message size"):
+        reader.build_columns()
+    with pytest.raises(TypeError, match="no fixed message size"):
+        Serializer[Packet]().allocate().size
@@ -0,0 +1,72 @@
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+import zlib
+
+import pytest
+
+from bytechomp import dataclass, Annotated, ByteOrder, serialize, serialize_many
+from bytechomp.datatypes import U16, U32, F32, Checksum
+
+
+@dataclass
+class Row:
+    identity: U32
+    weight: F32
+    kind: U16
+    crc: Annotated[U32, Checksum(zlib.crc32)]
+
+
+ROWS = [Row(i, i / 4, i % 7, 0) for i in range(1000)]
+EXPECTED = b"".join(serialize(row, ByteOrder.BIG) for row in ROWS)
+
+
+def test_parallel_bytes() -> None:
+    data = serialize_many(ROWS, ByteOrder.BIG, workers=3, min_parallel_bytes=0)
+    assert data == EXPECTED
+    assert serialize_many(ROWS, ByteOrder.BIG, trusted=True) == EXPECTED
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_file(tmp_path: Path, workers: int) -> None:
+    path = tmp_path / "rows.bin"
+    path.write_bytes(b"stale data" * 10_000)
+
+    written = serialize_many(ROWS, ByteOrder.BIG, workers=workers, out=path, min_parallel_bytes=0)
+    assert written == len(EXPECTED)
+    assert path.read_bytes() == EXPECTED
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_shared_memory(workers: int) -> None:
+    block = SharedMemory(create=True, size=len(EXPECTED) + 8)
+    try:
+        written = serialize_many(
+            ROWS, ByteOrder.BIG, workers=workers, out=block, min_parallel_bytes=0
+        )
+        assert written == len(EXPECTED)
+        assert bytes(block.buf[:written]) == EXPECTED
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_parallel_errors(tmp_path: Path) -> None:
+    block = SharedMemory(create=True, size=16)
+    try:
+        with pytest.raises(ValueError):
+            serialize_many(ROWS, out=block)
+    finally:
+        block.close()
+        block.unlink()
+
+    with pytest.raises(TypeError):
+        serialize_many([*ROWS[:10], 5], workers=2, min_parallel_bytes=0)
+
+    # trusted inputs are packed in-process
+    with pytest.raises(ValueError):
+        serialize_many(ROWS, trusted=True, workers=2)
+    with pytest.raises(ValueError):
+        serialize_many(ROWS, trusted=True, workers=None, out=tmp_path / "rows.bin")
+
+    assert serialize_many([], out=tmp_path / "empty.bin") == 0
+    assert (tmp_path / "empty.bin").read_bytes() == b""
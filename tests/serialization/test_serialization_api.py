@@ -1,6 +1,18 @@
 import struct
 
-from bytechomp import dataclass, ByteOrder, serialize
+import pytest
+
+from bytechomp import (
+    dataclass,
+    Annotated,
+    ByteOrder,
+    serialize,
+    serialize_into,
+    serialize_many,
+    serialize_many_into,
+    serialize_chunks,
+    Serializer,
+)
 from bytechomp.datatypes import (
     U8,
     U16,
@@ -13,6 +25,7 @@ from bytechomp.datatypes import (
     F16,
     F32,
     F64,
+    LengthFrom,
 )
 from bytechomp.datatypes.lookups import TYPE_TO_TAG
 
@@ -173,3 +186,103 @@ def test_byte_order_little_big() -> None:
     obj = BasicMessage(*values)
 
     assert serialize(obj, ByteOrder.LITTLE) != data
+
+
+def test_serialize_into() -> None:
+    messages = [BasicMessage(1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, float(i), 12, 13.0) for i in range(4)]
+    size = len(serialize(messages[0], ByteOrder.LITTLE))
+
+    buffer = bytearray(2 + 4 * size)
+    offset = serialize_into(messages[0], buffer, 2, ByteOrder.LITTLE)
+    assert offset == 2 + size
+    assert buffer[:2] == b"\x00\x00"
+    assert buffer[2:offset] == serialize(messages[0], ByteOrder.LITTLE)
+
+    # write the rest through a memoryview of the buffer
+    offset = serialize_many_into(messages[1:], memoryview(buffer), offset, ByteOrder.LITTLE)
+    assert offset == len(buffer)
+    assert buffer[2:] == b"".join(serialize(msg, ByteOrder.LITTLE) for msg in messages)
+
+    with pytest.raises(struct.error):
+        serialize_into(messages[0], buffer, len(buffer) - 1)
+
+
+def test_serializer_into() -> None:
+    serializer = Serializer[BasicMessage](ByteOrder.BIG).allocate()
+    messages = [BasicMessage(1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, float(i), 12, 13.0) for i in range(4)]
+
+    buffer = bytearray(4 * serializer.size)
+    assert serializer.serialize_into(messages[0], buffer) == serializer.size
+    assert serializer.serialize_many_into(messages[1:], buffer, serializer.size) == len(buffer)
+    assert bytes(buffer) == b"".join(serialize(msg, ByteOrder.BIG) for msg in messages)
+
+
+@dataclass
+class OtherMessage:
+    value: U8
+
+
+def test_serialize_many() -> None:
+    messages = [BasicMessage(1, 2, 3, 4, 5, 6, 7, 8, 9.0, 10.0, float(i), 12, 13.0) for i in range(10)]
+    expected = b"".join(serialize(msg, ByteOrder.BIG) for msg in messages)
+
+    assert serialize_many(messages, ByteOrder.BIG) == expected
+    assert serialize_many(iter(messages), ByteOrder.BIG, trusted=True) == expected
+    assert serialize_many([]) == b""
+
+    # per-object validation keeps the serialize() error messages
+    messages[3].uint8 = 1.0
+    with pytest.raises(TypeError) as e:
+        serialize_many(messages)
+    assert str(e.value).startswith("uint8 field contains")
+
+    with pytest.raises(TypeError) as e:
+        serialize_many([OtherMessage(1), messages[0]])
+    assert str(e.value).startswith("objects must share a single dataclass type")
+
+
+@dataclass
+class Point:
+    x: F32
+    y: F32
+
+
+@dataclass
+class Polygon:
+    count: U8
+    points: Annotated[list[Point], LengthFrom("count")]
+
+
+@dataclass
+class MovedPoint(Point):
+    pass
+
+
+def test_serialize_validation() -> None:
+    assert serialize(Polygon(1, [Point(1.0, 2.0)]), ByteOrder.BIG) == struct.pack(">Bff", 1, 1, 2)
+
+    # elements of variable length lists of dataclasses are validated as well
+    with pytest.raises(TypeError) as e:
+        serialize(Polygon(1, [Point(1, 2.0)]))
+    assert str(e.value).startswith("x field contains")
+
+    # nested dataclasses must have their declared type
+    with pytest.raises(TypeError) as e:
+        serialize(Polygon(1, [MovedPoint(1.0, 2.0)]))
+    assert str(e.value).startswith("points field contains")
+    with pytest.raises(TypeError):
+        serialize(Polygon(1, (Point(1.0, 2.0),)))
+
+
+def test_serialize_chunks() -> None:
+    messages = [OtherMessage(i) for i in range(10)]
+
+    chunks = list(serialize_chunks(messages, chunk_records=4))
+    assert chunks == [bytes([0, 1, 2, 3]), bytes([4, 5, 6, 7]), bytes([8, 9])]
+
+    chunks = list(serialize_chunks(iter(messages), chunk_records=5, trusted=True))
+    assert chunks == [bytes([0, 1, 2, 3, 4]), bytes([5, 6, 7, 8, 9])]
+
+    assert list(serialize_chunks([])) == []
+    with pytest.raises(ValueError):
+        list(serialize_chunks(messages, chunk_records=0))
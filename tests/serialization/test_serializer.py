@@ -0,0 +1,76 @@
+import struct
+
+import pytest
+
+from bytechomp import Reader, Serializer, dataclass, Annotated, ByteOrder, serialize
+from bytechomp.datatypes import PAD, U8, U16, F32
+
+
+@dataclass
+class Point:
+    x: U16
+    y: U16
+
+
+@dataclass
+class Shape:
+    kind: U8
+    padding: Annotated[list[PAD], 3]
+    origin: Point
+    vertices: Annotated[list[Point], 3]
+    weights: Annotated[list[F32], 2]
+    name: Annotated[bytes, 4]
+    tail: PAD = 0
+
+
+def build_shape() -> Shape:
+    return Shape(
+        kind=3,
+        padding=[0, 0, 0],
+        origin=Point(1, 2),
+        vertices=[Point(3, 4), Point(5, 6), Point(7, 8)],
+        weights=[0.5, 1.5],
+        name=b"tri\x00",
+    )
+
+
+def test_serializer_matches_serialize() -> None:
+    for byte_order in ByteOrder:
+        serializer = Serializer[Shape](byte_order).allocate()
+        data = serializer.serialize(build_shape())
+        assert data == serialize(build_shape(), byte_order)
+        assert len(data) == serializer.size
+        assert data == struct.pack(
+            byte_order.to_pattern() + "BxxxHHHHHHHHff4sx", 3, 1, 2, 3, 4, 5, 6, 7, 8, 0.5, 1.5, b"tri\x00"
+        )
+
+
+def test_serializer_round_trip() -> None:
+    serializer = Serializer[Shape](ByteOrder.BIG).allocate()
+    reader = Reader[Shape](ByteOrder.BIG).allocate()
+    reader << serializer.serialize(build_shape())
+    assert reader.build() == build_shape()
+
+
+def test_serializer_length_validation() -> None:
+    serializer = Serializer[Shape]().allocate()
+
+    shape = build_shape()
+    shape.name = b"triangle"
+    with pytest.raises(TypeError) as e:
+        serializer.serialize(shape)
+    assert str(e.value) == "name bytes field has a length of 8 but requires a length of 4"
+
+    shape = build_shape()
+    shape.vertices = shape.vertices[:2]
+    with pytest.raises(TypeError) as e:
+        serializer.serialize(shape)
+    assert str(e.value) == "vertices list field has a length of 2 but requires a length of 3"
+
+
+def test_serializer_requires_allocation() -> None:
+    with pytest.raises(RuntimeError):
+        Serializer[Shape]().serialize(build_shape())
+
+    with pytest.raises(ValueError):
+        Serializer[int]().allocate()
@@ -0,0 +1,81 @@
+import struct
+from threading import Thread
+
+from bytechomp import Reader, ByteOrder, dataclass, serialize, schema_cache_info, schema_cache_clear
+from bytechomp.datatypes import U16, F32
+from bytechomp.schema import SchemaCache, get_schema
+
+
+@dataclass
+class CachedMessage:
+    identity: U16
+    value: F32
+
+
+def test_schema_cache_reuse() -> None:
+    schema_cache_clear()
+    assert schema_cache_info().currsize == 0
+
+    first = Reader[CachedMessage]().allocate()
+    second = Reader[CachedMessage]().allocate()
+    serialize(CachedMessage(1, 2.0))
+
+    info = schema_cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert info.currsize == 1
+    assert first.size == second.size == struct.calcsize("@Hf")
+
+    # byte order is part of the key
+    assert get_schema(CachedMessage, ByteOrder.BIG).pattern == ">Hf"
+    assert schema_cache_info().currsize == 2
+
+
+def test_schema_cache_invalidation() -> None:
+    schema_cache_clear()
+    schema = get_schema(CachedMessage)
+    get_schema(CachedMessage, ByteOrder.LITTLE)
+    assert get_schema(CachedMessage) is schema
+
+    schema_cache_clear(CachedMessage)
+    assert schema_cache_info().currsize == 0
+    assert get_schema(CachedMessage) is not schema
+
+
+def test_schema_cache_lru_bound() -> None:
+    cache = SchemaCache(maxsize=2)
+    cache.get(CachedMessage, ByteOrder.NATIVE)
+    cache.get(CachedMessage, ByteOrder.BIG)
+    cache.get(CachedMessage, ByteOrder.NATIVE)
+    cache.get(CachedMessage, ByteOrder.LITTLE)
+
+    info = cache.info()
+    assert info.currsize == 2
+    assert info.maxsize == 2
+    assert info.hits == 1
+    assert info.misses == 3
+
+    # the least recently used entry (big endian) was evicted
+    cache.get(CachedMessage, ByteOrder.NATIVE)
+    assert cache.info().hits == 2
+    cache.get(CachedMessage, ByteOrder.BIG)
+    assert cache.info().misses == 4
+
+
+def test_schema_cache_threads() -> None:
+    cache = SchemaCache()
+    results = []
+
+    def worker() -> None:
+        for _ in range(100):
+            results.append(cache.get(CachedMessage, ByteOrder.NATIVE).struct.size)
+
+    threads = [Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [struct.calcsize("@Hf")] * 800
+    assert cache.info().currsize == 1
+    assert cache.info().hits + cache.info().misses == 800